@@ -0,0 +1,88 @@
+"""
+JWTのバックエンドごとのトークン生成・検証の速度を計測するベンチマーク
+
+実行方法:
+    python -m benchmarks.jwt_codecs --number 20000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from src.utils.token import TOKEN_CODECS, TokenKeySet, create_token_codec
+
+
+def create_key_sets() -> list[TokenKeySet]:
+    """
+    ベンチマークに使用する鍵をメモリ上に生成する
+
+    Returns:
+        list[TokenKeySet]: アルゴリズムごとの署名鍵と検証鍵
+    """
+
+    secret_key = b"benchmark-secret-key-for-hs256-tokens"
+    es256_key = ec.generate_private_key(ec.SECP256R1())
+    eddsa_key = ed25519.Ed25519PrivateKey.generate()
+
+    return [
+        TokenKeySet("HS256", secret_key, {"k1": secret_key}, "k1"),
+        TokenKeySet("ES256", es256_key, {"k1": es256_key.public_key()}, "k1"),
+        TokenKeySet("EdDSA", eddsa_key, {"k1": eddsa_key.public_key()}, "k1"),
+    ]
+
+
+def measure(fn: Callable[[], Any], number: int) -> float:
+    """
+    関数をnumber回実行して1秒あたりの実行回数を返す
+
+    Args:
+        fn (Callable[[], Any]): 計測する関数
+        number (int): 実行回数
+
+    Returns:
+        float: 1秒あたりの実行回数
+    """
+
+    start_time = time.perf_counter()
+    for _ in range(number):
+        fn()
+    elapsed = time.perf_counter() - start_time
+
+    return number / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JWTバックエンドのベンチマーク")
+    parser.add_argument("--number", type=int, default=20000, help="計測する回数")
+    args = parser.parse_args()
+
+    claims = {
+        "sub": "1",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+    }
+
+    print(f"{'backend':<8} {'algorithm':<10} {'encode ops/s':>14} {'decode ops/s':>14}")
+
+    for key_set in create_key_sets():
+        for backend in TOKEN_CODECS:
+            try:
+                codec = create_token_codec(backend, key_set)
+            except ValueError:
+                # 対応していないアルゴリズムはスキップ
+                continue
+
+            token = codec.encode(claims)
+            encode_ops = measure(lambda: codec.encode(claims), args.number)
+            decode_ops = measure(lambda: codec.decode(token), args.number)
+
+            print(
+                f"{backend:<8} {key_set.algorithm:<10} "
+                f"{encode_ops:>14,.0f} {decode_ops:>14,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,514 @@
+"""
+APIの負荷試験を行い、ルートごとのスループットとレイテンシをJSONに出力するベンチマーク
+
+シナリオごとに環境変数を変えてuvicornを起動し、ユーザー・認証APIにリクエストを送信する
+DBは.envの接続先(docker-compose.ymlのPostgreSQLなど)を使用する
+
+実行方法:
+    python -m benchmarks.load --duration 30 --concurrency 50 --output load.json
+    python -m benchmarks.load --scenario default --scenario no-log-middleware
+    python -m benchmarks.load --base-url http://localhost:8099  # 起動済みのサーバー
+    python -m benchmarks.load --compare baseline.json --output load.json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+import httpx
+import orjson
+
+# シナリオ名とサーバーに設定する環境変数
+SCENARIOS: dict[str, dict[str, str]] = {
+    "default": {},
+    "no-log-middleware": {"LOG_MIDDLEWARE_ENABLED": "false"},
+    "async-db": {"DB_ASYNC": "true"},
+    "async-db-no-log-middleware": {
+        "DB_ASYNC": "true",
+        "LOG_MIDDLEWARE_ENABLED": "false",
+    },
+}
+
+PASSWORD = "benchmark-password"
+
+
+class LoadContext:
+    """
+    負荷試験中に共有する状態(認証ヘッダー・作成したユーザーのID)
+    """
+
+    def __init__(self, client: httpx.AsyncClient, headers: dict[str, str]):
+        self.client = client
+        self.headers = headers
+        self.user_ids: list[int] = []
+        self.login_emails: list[str] = []
+
+
+Operation = Callable[[LoadContext], Awaitable[httpx.Response]]
+
+
+def create_access_token(user_id: int) -> str:
+    """
+    サーバーと同じ設定(.env)でアクセストークンを生成する
+
+    ログインAPIが使用できない環境でも認証が必要なAPIを計測できるようにする
+
+    Args:
+        user_id (int): ユーザーID
+
+    Returns:
+        str: アクセストークン
+    """
+
+    from src.utils.token import token_codec
+
+    return token_codec.encode(
+        {
+            "sub": str(user_id),
+            "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+        }
+    )
+
+
+def new_user() -> dict[str, str]:
+    suffix = uuid.uuid4().hex[:12]
+
+    return {
+        "name": f"bench-{suffix}",
+        "email": f"bench-{suffix}@example.com",
+        "password": PASSWORD,
+    }
+
+
+async def login(ctx: LoadContext) -> httpx.Response:
+    email = random.choice(ctx.login_emails) if ctx.login_emails else "none@example.com"
+
+    return await ctx.client.post(
+        "/api/auth/login", json={"email": email, "password": PASSWORD}
+    )
+
+
+async def list_users(ctx: LoadContext) -> httpx.Response:
+    return await ctx.client.get("/api/users", headers=ctx.headers)
+
+
+async def list_users_offset(ctx: LoadContext) -> httpx.Response:
+    return await ctx.client.get(
+        "/api/users",
+        params={"offset": random.randint(0, 1000), "limit": 20},
+        headers=ctx.headers,
+    )
+
+
+async def list_users_cursor(ctx: LoadContext) -> httpx.Response:
+    response = await ctx.client.get(
+        "/api/users", params={"limit": 20}, headers=ctx.headers
+    )
+    cursor = response.headers.get("X-Next-Cursor")
+
+    if cursor is None:
+        return response
+
+    return await ctx.client.get(
+        "/api/users", params={"limit": 20, "after": cursor}, headers=ctx.headers
+    )
+
+
+async def show_user(ctx: LoadContext) -> httpx.Response:
+    user_id = random.choice(ctx.user_ids) if ctx.user_ids else 1
+
+    return await ctx.client.get(f"/api/users/{user_id}", headers=ctx.headers)
+
+
+async def me(ctx: LoadContext) -> httpx.Response:
+    return await ctx.client.get("/api/users/me", headers=ctx.headers)
+
+
+async def create_update_delete_user(ctx: LoadContext) -> httpx.Response:
+    user = new_user()
+    response = await ctx.client.post("/api/users/", json=user, headers=ctx.headers)
+
+    if response.status_code != 200:
+        return response
+
+    user_id = response.json()["id"]
+    await ctx.client.put(
+        f"/api/users/{user_id}", json={"name": user["name"] + "-2"}, headers=ctx.headers
+    )
+
+    return await ctx.client.delete(f"/api/users/{user_id}", headers=ctx.headers)
+
+
+# 計測するルート名・重み・処理
+OPERATIONS: list[tuple[str, int, Operation]] = [
+    ("POST /api/auth/login", 1, login),
+    ("GET /api/users", 4, list_users),
+    ("GET /api/users?offset", 2, list_users_offset),
+    ("GET /api/users?after", 2, list_users_cursor),
+    ("GET /api/users/{user_id}", 8, show_user),
+    ("GET /api/users/me", 4, me),
+    ("POST+PUT+DELETE /api/users", 1, create_update_delete_user),
+]
+
+
+def percentile(sorted_values: list[float], ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * ratio))
+
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """
+    レイテンシ(秒)の一覧を集計する
+
+    Args:
+        latencies (list[float]): レイテンシ
+        errors (int): エラー(ステータスコード400以上・通信エラー)の件数
+        elapsed (float): 計測した秒数
+
+    Returns:
+        dict: 件数・エラー数・req/s・平均とパーセンタイル(ミリ秒)
+    """
+
+    values = sorted(latencies)
+
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+    }
+
+
+async def prepare(ctx: LoadContext, users: int, login_users: int) -> None:
+    """
+    計測前に一覧・詳細で参照するユーザーとログインするユーザーを作成する
+
+    Args:
+        ctx (LoadContext): 負荷試験の状態
+        users (int): 作成するユーザー数
+        login_users (int): ログイン用に登録するユーザー数
+    """
+
+    for start in range(0, users, 1000):
+        items = [new_user() for _ in range(min(1000, users - start))]
+        response = await ctx.client.post(
+            "/api/users/bulk", json=items, headers=ctx.headers
+        )
+        response.raise_for_status()
+        ctx.user_ids.extend(
+            item["id"] for item in response.json() if item["status"] == "created"
+        )
+
+    if ctx.user_ids:
+        ctx.headers = {
+            "Authorization": f"Bearer {create_access_token(ctx.user_ids[0])}"
+        }
+
+    for _ in range(login_users):
+        user = new_user()
+        try:
+            response = await ctx.client.post("/api/auth/register", json=user)
+        except httpx.HTTPError:
+            continue
+
+        if response.status_code == 200:
+            ctx.login_emails.append(user["email"])
+
+    if login_users and not ctx.login_emails:
+        print("  warning: register failed, login is measured as failed requests")
+
+
+async def run_load(
+    base_url: str,
+    duration: float,
+    concurrency: int,
+    users: int,
+    login_users: int,
+    warmup: float,
+) -> dict:
+    """
+    起動済みのサーバーに負荷をかけてルートごとに集計する
+
+    Args:
+        base_url (str): サーバーのURL
+        duration (float): 計測する秒数
+        concurrency (int): 同時に実行するクライアント数
+        users (int): 事前に作成するユーザー数
+        login_users (int): ログイン用に登録するユーザー数
+        warmup (float): 計測前に負荷をかける秒数(集計しない)
+
+    Returns:
+        dict: ルートごとと全体の集計結果
+    """
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        ctx = LoadContext(client, {"Authorization": f"Bearer {create_access_token(1)}"})
+        await prepare(ctx, users, login_users)
+
+        names = [name for name, _, _ in OPERATIONS]
+        weights = [weight for _, weight, _ in OPERATIONS]
+        operations = {name: operation for name, _, operation in OPERATIONS}
+
+        latencies: dict[str, list[float]] = {name: [] for name in names}
+        errors: dict[str, int] = {name: 0 for name in names}
+        statuses: dict[str, dict[str, int]] = {name: {} for name in names}
+
+        async def worker(deadline: float, record: bool) -> None:
+            while time.perf_counter() < deadline:
+                name = random.choices(names, weights)[0]
+                start_time = time.perf_counter()
+
+                try:
+                    response = await operations[name](ctx)
+                    status = str(response.status_code)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                    failed = True
+
+                if not record:
+                    continue
+
+                latencies[name].append(time.perf_counter() - start_time)
+                statuses[name][status] = statuses[name].get(status, 0) + 1
+                if failed:
+                    errors[name] += 1
+
+        if warmup > 0:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(worker(deadline, False) for _ in range(concurrency)))
+
+        start_time = time.perf_counter()
+        deadline = start_time + duration
+        await asyncio.gather(*(worker(deadline, True) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start_time
+
+    routes = {
+        name: {
+            **summarize(latencies[name], errors[name], elapsed),
+            "statuses": statuses[name],
+        }
+        for name in names
+        if latencies[name]
+    }
+
+    return {
+        "routes": routes,
+        "total": summarize(
+            [value for values in latencies.values() for value in values],
+            sum(errors.values()),
+            elapsed,
+        ),
+    }
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(env: dict[str, str], port: int, workers: int) -> subprocess.Popen:
+    """
+    シナリオの環境変数を設定してuvicornを起動し、リクエストを受け付けるまで待機する
+
+    Args:
+        env (dict[str, str]): 追加する環境変数
+        port (int): ポート番号
+        workers (int): ワーカープロセス数
+
+    Returns:
+        subprocess.Popen: サーバーのプロセス
+
+    Raises:
+        RuntimeError: 起動に失敗した場合
+    """
+
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env={**os.environ, **env},
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+
+    stop_server(process)
+    raise RuntimeError("Server did not start within 30 seconds")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def print_result(name: str, result: dict, baseline: dict | None) -> None:
+    """
+    シナリオの結果を表形式で出力する(ベースラインがある場合は差分も出力する)
+
+    Args:
+        name (str): シナリオ名
+        result (dict): シナリオの集計結果
+        baseline (dict | None): ベースラインの同じシナリオの集計結果
+    """
+
+    print(f"\n[{name}]")
+    print(
+        f"{'route':<30} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'errors':>7} {'Δreq/s':>8} {'Δp95':>8}"
+    )
+
+    rows = [*result["routes"].items(), ("total", result["total"])]
+    baseline_rows = {}
+    if baseline:
+        baseline_rows = {**baseline.get("routes", {}), "total": baseline["total"]}
+
+    for route, stats in rows:
+        diff = ""
+        base = baseline_rows.get(route)
+        if base and base["rps"] and base["p95_ms"]:
+            diff = (
+                f" {(stats['rps'] / base['rps'] - 1) * 100:>+7.1f}%"
+                f" {(stats['p95_ms'] / base['p95_ms'] - 1) * 100:>+7.1f}%"
+            )
+
+        print(
+            f"{route:<30} {stats['rps']:>10,.1f} {stats['p50_ms']:>9.2f} "
+            f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+            f"{stats['errors']:>7}{diff}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="APIの負荷試験")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="実行するシナリオ(複数指定可能、未指定の場合は全て)",
+    )
+    parser.add_argument("--base-url", help="起動済みのサーバーのURL(シナリオは無視)")
+    parser.add_argument("--duration", type=float, default=30, help="計測する秒数")
+    parser.add_argument("--warmup", type=float, default=3, help="ウォームアップの秒数")
+    parser.add_argument("--concurrency", type=int, default=50, help="同時実行数")
+    parser.add_argument("--workers", type=int, default=1, help="uvicornのワーカー数")
+    parser.add_argument("--users", type=int, default=2000, help="事前に作成する件数")
+    parser.add_argument(
+        "--login-users", type=int, default=20, help="ログイン用に登録する件数"
+    )
+    parser.add_argument("--output", default="load.json", help="結果を出力するファイル")
+    parser.add_argument("--compare", help="比較するベースラインの結果ファイル")
+    args = parser.parse_args()
+
+    baseline: dict = {}
+    if args.compare:
+        with open(args.compare, "rb") as f:
+            baseline = orjson.loads(f.read())
+
+    if args.base_url:
+        targets = [("external", args.base_url, None)]
+    else:
+        targets = [(name, None, SCENARIOS[name]) for name in args.scenario or SCENARIOS]
+
+    results = {}
+    for name, base_url, env in targets:
+        process = None
+
+        if env is not None:
+            port = get_free_port()
+            process = start_server(env, port, args.workers)
+            base_url = f"http://127.0.0.1:{port}"
+
+        try:
+            results[name] = asyncio.run(
+                run_load(
+                    base_url,
+                    args.duration,
+                    args.concurrency,
+                    args.users,
+                    args.login_users,
+                    args.warmup,
+                )
+            )
+        finally:
+            if process is not None:
+                stop_server(process)
+
+        print_result(name, results[name], baseline.get("scenarios", {}).get(name))
+
+    report = {
+        "commit": get_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "users": args.users,
+        },
+        "scenarios": results,
+    }
+
+    with open(args.output, "wb") as f:
+        f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+
+    print(f"\nSaved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
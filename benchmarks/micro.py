@@ -0,0 +1,277 @@
+"""
+リクエストごとに実行される処理単位の速度とメモリ割り当てを計測するベンチマーク
+
+1秒あたりの実行回数と1回あたりのメモリ割り当てのピーク(tracemalloc)を出力し、
+保存したベースラインと比較して悪化している項目を報告する
+
+実行方法:
+    python -m benchmarks.micro --save-baseline micro-baseline.json
+    python -m benchmarks.micro --baseline micro-baseline.json --threshold 0.1
+    python -m benchmarks.micro --filter bcrypt
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable
+
+import orjson
+from passlib.context import CryptContext
+
+from src.middlewares.authenticate import verify_token
+from src.middlewares.log import BodyCapture
+from src.models.user import User, UserPublic
+from src.services.auth import AuthService
+from src.services.user import USER_LIST_ADAPTER
+from src.settings.app import LOG_MAX_BODY_BYTES
+from src.utils.hash import HashUtil
+from src.utils.token import token_codec
+
+# ASGIサーバーがレスポンスボディを分割して送信する場合のチャンクサイズ
+BODY_CHUNK_SIZE = 64 * 1024
+
+
+def measure_ops(fn: Callable[[], Any], min_time: float) -> float:
+    """
+    min_time秒以上になるまで実行回数を増やしながら関数を実行し、1秒あたりの実行回数を返す
+
+    Args:
+        fn (Callable[[], Any]): 計測する関数
+        min_time (float): 計測する最小の秒数
+
+    Returns:
+        float: 1秒あたりの実行回数
+    """
+
+    number = 1
+
+    while True:
+        start_time = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start_time
+
+        if elapsed >= min_time:
+            return number / elapsed
+
+        # 残りの時間で実行できる回数を見積もる
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)) + 1)
+
+
+def measure_peak_memory(fn: Callable[[], Any]) -> int:
+    """
+    関数を1回実行した間のメモリ割り当てのピーク(実行前からの増分)を返す
+
+    Args:
+        fn (Callable[[], Any]): 計測する関数
+
+    Returns:
+        int: バイト数
+    """
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return max(0, peak - before)
+
+
+def create_bcrypt_benchmarks() -> dict[str, Callable[[], Any]]:
+    password = "benchmark-password"
+    benchmarks: dict[str, Callable[[], Any]] = {}
+
+    # ログイン・サインアップのレイテンシはラウンド数でほぼ決まる
+    for rounds in (4, 10, 12):
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        hashed = context.hash(password)
+
+        benchmarks[f"bcrypt.hash[rounds={rounds}]"] = (
+            lambda context=context: context.hash(password)
+        )
+        benchmarks[f"bcrypt.verify[rounds={rounds}]"] = (
+            lambda context=context, hashed=hashed: context.verify(password, hashed)
+        )
+
+    hashed = HashUtil.get_password_hash(password)
+    benchmarks["HashUtil.get_password_hash"] = lambda: HashUtil.get_password_hash(
+        password
+    )
+    benchmarks["HashUtil.verify_password"] = lambda: HashUtil.verify_password(
+        password, hashed
+    )
+
+    return benchmarks
+
+
+def create_token_benchmarks() -> dict[str, Callable[[], Any]]:
+    # Dependsのデフォルト値が残らないようセッション・HTTPクライアントを明示的に渡す
+    auth_service = AuthService(None, None, None)
+    token = auth_service.create_access_token({"sub": "1"})
+
+    return {
+        "AuthService.create_access_token": lambda: auth_service.create_access_token(
+            {"sub": "1"}
+        ),
+        # 認証ミドルウェアでキャッシュにない場合の検証
+        f"token_codec.decode[{token_codec.name}]": lambda: token_codec.decode(token),
+        # 認証ミドルウェアでキャッシュにある場合の検証
+        "authenticate.verify_token[cached]": lambda: verify_token(token),
+    }
+
+
+def create_serialization_benchmarks() -> dict[str, Callable[[], Any]]:
+    now = datetime.now()
+    # ユーザー一覧APIの1ページ分(limitの上限)のORMの行
+    users = [
+        User(id=i, name=f"user-{i}", email=f"user-{i}@example.com", created_at=now)
+        for i in range(1, 101)
+    ]
+    public_users = [UserPublic.model_validate(user) for user in users]
+
+    return {
+        "UserPublic.model_validate[100 rows]": lambda: [
+            UserPublic.model_validate(user) for user in users
+        ],
+        "USER_LIST_ADAPTER.dump_json[100 rows]": lambda: USER_LIST_ADAPTER.dump_json(
+            public_users
+        ),
+    }
+
+
+def capture_body(body: bytes) -> str:
+    capture = BodyCapture(LOG_MAX_BODY_BYTES)
+
+    for start in range(0, len(body), BODY_CHUNK_SIZE):
+        capture.append(body[start : start + BODY_CHUNK_SIZE])
+
+    return capture.get_body()
+
+
+def create_log_benchmarks() -> dict[str, Callable[[], Any]]:
+    benchmarks: dict[str, Callable[[], Any]] = {}
+
+    for label, size in (("1KB", 1024), ("100KB", 100 * 1024), ("10MB", 10 * 1024**2)):
+        body = b"x" * size
+        benchmarks[f"LogMiddleware.BodyCapture[{label}]"] = (
+            lambda body=body: capture_body(body)
+        )
+
+    return benchmarks
+
+
+def create_benchmarks() -> dict[str, Callable[[], Any]]:
+    return {
+        **create_bcrypt_benchmarks(),
+        **create_token_benchmarks(),
+        **create_serialization_benchmarks(),
+        **create_log_benchmarks(),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """
+    ベースラインと比較して悪化している項目を返す
+
+    Args:
+        results (dict[str, dict[str, float]]): 計測結果
+        baseline (dict[str, dict[str, float]]): ベースラインの計測結果
+        threshold (float): 悪化とみなす割合(0.1の場合は10%)
+
+    Returns:
+        list[str]: 悪化している項目の説明
+    """
+
+    regressions = []
+
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: ops/s {base['ops_per_sec']:,.1f} -> "
+                f"{result['ops_per_sec']:,.1f}"
+            )
+
+        # 数百バイトの揺らぎは無視する
+        if result["peak_bytes"] > max(
+            base["peak_bytes"] * (1 + threshold), base["peak_bytes"] + 1024
+        ):
+            regressions.append(
+                f"{name}: peak {base['peak_bytes']:,} B -> {result['peak_bytes']:,} B"
+            )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="処理単位のベンチマーク")
+    parser.add_argument("--min-time", type=float, default=1.0, help="計測する秒数")
+    parser.add_argument("--filter", default="", help="名前に含まれる項目のみ計測する")
+    parser.add_argument("--baseline", help="比較するベースラインのファイル")
+    parser.add_argument("--save-baseline", help="計測結果を保存するファイル")
+    parser.add_argument("--threshold", type=float, default=0.1, help="悪化とみなす割合")
+    args = parser.parse_args()
+
+    baseline: dict[str, dict[str, float]] = {}
+    if args.baseline:
+        with open(args.baseline, "rb") as f:
+            baseline = orjson.loads(f.read())["results"]
+
+    print(f"{'name':<42} {'ops/s':>14} {'peak alloc':>12} {'Δops/s':>8}")
+
+    results: dict[str, dict[str, float]] = {}
+    for name, fn in create_benchmarks().items():
+        if args.filter not in name:
+            continue
+
+        # 初回の遅延初期化を計測に含めない
+        fn()
+
+        results[name] = {
+            "ops_per_sec": round(measure_ops(fn, args.min_time), 2),
+            "peak_bytes": measure_peak_memory(fn),
+        }
+
+        diff = ""
+        base = baseline.get(name)
+        if base and base["ops_per_sec"]:
+            diff = f" {(results[name]['ops_per_sec'] / base['ops_per_sec'] - 1):>+8.1%}"
+
+        print(
+            f"{name:<42} {results[name]['ops_per_sec']:>14,.1f} "
+            f"{results[name]['peak_bytes']:>10,} B{diff}"
+        )
+
+    if args.save_baseline:
+        with open(args.save_baseline, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {"created_at": datetime.now().isoformat(), "results": results},
+                    option=orjson.OPT_INDENT_2,
+                )
+            )
+
+    regressions = compare(results, baseline, args.threshold)
+
+    if regressions:
+        print(f"\nRegressions (threshold {args.threshold:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
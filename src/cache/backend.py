@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+
+
+class CacheBackend(ABC):
+    """
+    キャッシュの保存先の基底クラス
+    値はシリアライズ済みのbytesで受け渡し、有効期限は保存先で管理する
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        値を取得する
+
+        Args:
+            key (str): キー
+
+        Returns:
+            bytes | None: 値 | 存在しないか有効期限切れの場合はNone
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        値を設定する
+
+        Args:
+            key (str): キー
+            value (bytes): 値
+            ttl (float): 有効期限の秒数
+        """
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        値を削除する
+
+        Args:
+            *keys (str): キー
+        """
+
+    async def close(self) -> None:
+        """接続を閉じる(接続を持たない保存先では何もしない)"""
+
+    def stats(self) -> dict[str, int]:
+        return {}
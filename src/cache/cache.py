@@ -0,0 +1,185 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+import orjson
+from pydantic import TypeAdapter
+
+from src.cache.backend import CacheBackend
+from src.settings.logger import logger
+
+T = TypeVar("T")
+
+
+class Cache:
+    """
+    保存先(CacheBackend)の上でキャッシュの読み込みを制御するクラス
+
+    - 同じキーの同時の取得は保存先の参照と読み込みを1回にまとめる(シングルフライト)
+    - 有効期限にジッターを加え、同時に作成されたエントリが同時に期限切れにならないようにする
+    - 有効期限のsoft_ttl_ratioの時点を過ぎたエントリは古い値を返しつつバックグラウンドで再読み込みする
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_jitter: float = 0.1,
+        soft_ttl_ratio: float = 0.8,
+    ):
+        self.backend = backend
+        self.ttl_jitter = ttl_jitter
+        self.soft_ttl_ratio = soft_ttl_ratio
+        self.loads = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: float,
+        adapter: TypeAdapter[T],
+    ) -> T:
+        """
+        キャッシュから値を取得し、無い場合は読み込んでキャッシュする
+
+        loaderはリクエストのセッションに依存しない処理にする
+        (まとめた他のリクエストやバックグラウンドの再読み込みからも呼ばれるため)
+
+        Args:
+            key (str): キー
+            loader (Callable[[], Awaitable[T]]): 値を読み込む関数
+            ttl (float): 有効期限の秒数(0以下の場合はキャッシュせずに読み込む)
+            adapter (TypeAdapter[T]): 値のシリアライズに使用するTypeAdapter
+
+        Returns:
+            T: 値
+
+        Raises:
+            Exception: loaderで発生した例外(キャッシュしない)
+        """
+
+        if ttl <= 0:
+            return await loader()
+
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = self._start(
+                self._inflight, key, self._get_or_load(key, loader, ttl, adapter)
+            )
+        else:
+            self.coalesced += 1
+
+        # 待機中のリクエストがキャンセルされても取得は継続する
+        return adapter.validate_python(await asyncio.shield(task))
+
+    async def delete(self, *keys: str) -> None:
+        """
+        キャッシュを削除する
+        実行中の読み込みの結果もキャッシュしないようにする
+        保存先のエラーはログに出力し、呼び出し元(更新処理)には送出しない
+
+        Args:
+            *keys (str): キー
+        """
+
+        for key in keys:
+            self._inflight.pop(key, None)
+            self._refreshing.pop(key, None)
+
+        try:
+            await self.backend.delete(*keys)
+        except Exception as e:
+            # 保存先に接続できない場合も更新処理は成功させる(エントリは有効期限で消える)
+            logger.warning(f"Cache delete failed. keys: {keys} {e}")
+
+    async def _get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: float,
+        adapter: TypeAdapter[T],
+    ) -> Any:
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            # 保存先に接続できない場合はキャッシュせずに読み込む
+            logger.warning(f"Cache get failed. key: {key} {e}")
+            cached = None
+
+        if cached is None:
+            return await self._load(self._inflight, key, loader, ttl, adapter)
+
+        envelope = orjson.loads(cached)
+
+        # ソフト期限切れの場合は古い値を返し、バックグラウンドで再読み込みする
+        if envelope["s"] <= time.time() and key not in self._refreshing:
+            self.refreshes += 1
+            self._start(
+                self._refreshing,
+                key,
+                self._load(self._refreshing, key, loader, ttl, adapter),
+            )
+
+        return envelope["v"]
+
+    async def _load(
+        self,
+        tasks: dict[str, asyncio.Task],
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: float,
+        adapter: TypeAdapter[T],
+    ) -> Any:
+        self.loads += 1
+        # キャッシュから取得した場合と同じJSON互換の値にそろえる
+        data = adapter.dump_python(await loader(), mode="json")
+
+        # 読み込み中に削除された場合はキャッシュしない
+        if tasks.get(key) is not asyncio.current_task():
+            return data
+
+        jittered_ttl = ttl * (1 - random.uniform(0, self.ttl_jitter))
+        envelope = {"s": time.time() + jittered_ttl * self.soft_ttl_ratio, "v": data}
+
+        try:
+            await self.backend.set(key, orjson.dumps(envelope), jittered_ttl)
+        except Exception as e:
+            logger.warning(f"Cache set failed. key: {key} {e}")
+
+        return data
+
+    def _start(
+        self, tasks: dict[str, asyncio.Task], key: str, coroutine: Awaitable[Any]
+    ) -> asyncio.Task:
+        task = asyncio.ensure_future(coroutine)
+        tasks[key] = task
+
+        def _on_done(done_task: asyncio.Task) -> None:
+            if tasks.get(key) is done_task:
+                del tasks[key]
+
+            if done_task.cancelled():
+                return
+
+            # バックグラウンドの再読み込みの例外は待機しているリクエストが無いためログに出力する
+            exception = done_task.exception()
+            if tasks is self._refreshing and exception is not None:
+                logger.warning(f"Cache refresh failed. key: {key} {exception}")
+
+        task.add_done_callback(_on_done)
+
+        return task
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **self.backend.stats(),
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "inflight": len(self._inflight),
+        }
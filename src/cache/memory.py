@@ -0,0 +1,25 @@
+from src.cache.backend import CacheBackend
+from src.utils.ttl_cache import TTLCache
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    プロセス内のLRU/TTLキャッシュを使用する保存先
+    ワーカープロセス間では共有されない
+    """
+
+    def __init__(self, max_size: int):
+        self._cache: TTLCache[str, bytes] = TTLCache(max_size)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
@@ -0,0 +1,72 @@
+from redis.asyncio import BlockingConnectionPool, Redis
+
+from src.cache.backend import CacheBackend
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis(またはRedisプロトコル互換のサーバー)を使用する保存先
+    ワーカープロセス・サーバー間で共有される
+
+    テスト時はfakeredisなどのクライアントを渡して使用する
+    """
+
+    def __init__(self, client: Redis, key_prefix: str = ""):
+        self.client = client
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        key_prefix: str = "",
+        max_connections: int = 50,
+        pool_timeout: float = 5,
+    ) -> "RedisCacheBackend":
+        """
+        接続URLから生成する
+
+        Args:
+            url (str): 接続URL(redis://host:port/db)
+            key_prefix (str): キーの接頭辞(他のアプリケーションとキーが重複しないようにする)
+            max_connections (int): プロセスごとの最大接続数
+            pool_timeout (float): 空き接続を待機する秒数
+
+        Returns:
+            RedisCacheBackend: 保存先
+        """
+
+        # 上限を超えた場合はエラーにせず空き接続を待機する
+        pool = BlockingConnectionPool.from_url(
+            url, max_connections=max_connections, timeout=pool_timeout
+        )
+
+        return cls(Redis(connection_pool=pool), key_prefix)
+
+    async def get(self, key: str) -> bytes | None:
+        value = await self.client.get(self.key_prefix + key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+
+        await self.client.set(self.key_prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*[self.key_prefix + key for key in keys])
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -26,7 +26,7 @@ class AuthController:
             LoginFailedException: 認証エラー
         """
 
-        user = auth_service.authenticate_user(user_data)
+        user = await auth_service.authenticate_user(user_data)
 
         if not user or not user.id:
             raise LoginFailedException()
@@ -53,7 +53,7 @@ class AuthController:
             LoginFailedException: 認証エラー
         """
 
-        user = auth_service.create_user(user_data)
+        user = await auth_service.create_user(user_data)
 
         if not user.id:
             raise LoginFailedException()
@@ -85,23 +85,35 @@ class AuthController:
 
         Returns:
             Token: トークン
+
+        Raises:
+            LoginFailedException: 認証エラー・未確認のメールアドレスで既存のユーザーと連携する場合
         """
-        google_access_token = await auth_service.get_google_access_token(code)
+        google_token = await auth_service.get_google_token(code)
 
-        google_user_data = await auth_service.get_google_user(google_access_token)
+        google_user_data = await auth_service.get_google_user(google_token)
 
-        user_id = auth_service.get_social_account("google", google_user_data["sub"])
+        user_id = await auth_service.get_social_account(
+            "google", google_user_data["sub"]
+        )
         if user_id:
             return auth_service.create_jwt_token(user_id)
 
-        user = auth_service.get_user_by_email(google_user_data["email"])
+        # ソーシャルアカウントの作成に使用するためプライマリから取得する
+        user = await auth_service.get_user_by_email(
+            google_user_data["email"], use_primary=True
+        )
         if user and user.id:
-            auth_service.create_social_account(
+            # 確認されていないメールアドレスでは既存のアカウントと連携しない
+            if google_user_data.get("email_verified") is not True:
+                raise LoginFailedException()
+
+            await auth_service.create_social_account(
                 user.id, "google", google_user_data["sub"]
             )
             return auth_service.create_jwt_token(user.id)
 
-        user_id = auth_service.create_user_with_social_account(
+        user_id = await auth_service.create_user_with_social_account(
             UserCreate(
                 name=google_user_data["name"],
                 email=google_user_data["email"],
@@ -0,0 +1,40 @@
+import hmac
+
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+
+from src.exceptions.unauthorized_exception import UnauthorizedException
+from src.metrics.registry import metrics_registry
+from src.middlewares.authenticate import get_bearer_token
+from src.settings.app import METRICS_TOKEN
+
+# Prometheusのテキスト形式のContent-Type
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsController:
+    @classmethod
+    async def index(cls, request: Request) -> PlainTextResponse:
+        """
+        メトリクス取得API(Prometheusのテキスト形式)
+
+        Args:
+            request (Request): リクエスト
+
+        Returns:
+            PlainTextResponse: ワーカープロセスのメトリクス
+
+        Raises:
+            UnauthorizedException: BearerトークンがMETRICS_TOKENと一致しない場合
+        """
+
+        token = get_bearer_token(request.scope)
+
+        if not METRICS_TOKEN or not hmac.compare_digest(
+            (token or "").encode(), METRICS_TOKEN.encode()
+        ):
+            raise UnauthorizedException()
+
+        return PlainTextResponse(
+            metrics_registry.render(), media_type=METRICS_CONTENT_TYPE
+        )
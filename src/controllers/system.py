@@ -0,0 +1,26 @@
+from src.middlewares.authenticate import get_token_cache_stats
+from src.settings.db import get_all_pool_stats
+
+
+class SystemController:
+    @classmethod
+    async def pool_stats(cls) -> dict[str, dict[str, int | float]]:
+        """
+        DBコネクションプールの状態取得API
+
+        Returns:
+            dict[str, dict[str, int | float]]: エンジンごとのプールの状態
+        """
+
+        return get_all_pool_stats()
+
+    @classmethod
+    async def token_cache_stats(cls) -> dict[str, dict[str, int]]:
+        """
+        アクセストークンのキャッシュの状態取得API
+
+        Returns:
+            dict[str, dict[str, int]]: キャッシュごとの件数・ヒット数・ミス数
+        """
+
+        return get_token_cache_stats()
@@ -1,49 +1,160 @@
-from fastapi import Depends, Query
+import itertools
+from typing import Literal
 
-from src.models.user import UserCreate, UserPublic, UserUpdate
+from fastapi import Body, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from src.dependencies.user import get_current_user
+from src.exceptions.bad_request_exception import BadRequestException
+from src.models.user import (
+    UserBulkResult,
+    UserBulkUpdate,
+    UserCreate,
+    UserPublic,
+    UserUpdate,
+)
 from src.services.user import UserService
+from src.settings.app import USER_BULK_MAX_ITEMS
+from src.utils.cursor import CursorUtil
+from src.utils.etag import EtagUtil
 
 
 class UserController:
     @classmethod
     async def index(
         cls,
+        request: Request,
         offset: int = 0,
         limit: int = Query(default=100, le=100),
+        after: str | None = None,
+        sort: Literal["id", "created_at"] = "id",
         user_service: UserService = Depends(UserService),
-    ) -> list[UserPublic]:
+    ) -> Response:
         """
         ユーザー一覧API
 
+        次ページがある場合はX-Next-Cursorヘッダーにカーソルを返す
+        カーソルをafterに指定するとOFFSETを使用せずに次ページを取得する
+        一覧のIDと更新日時から計算したETagがIf-None-Matchと一致する場合は304を返す
+
         Args:
+            request (Request): リクエスト
             offset (int): 取得開始位置
             limit (int): 取得件数
+            after (str | None): 前ページのX-Next-Cursorの値
+            sort (str): ソートキー(id | created_at)
 
         Returns:
-            list[UserPublic]: ユーザー一覧
+            Response: ユーザー一覧
+
+        Raises:
+            BadRequestException: カーソルが不正な場合
         """
 
-        return [
-            UserPublic.model_validate(user)
-            for user in user_service.get_users(offset, limit)
-        ]
+        if after is not None and offset:
+            raise BadRequestException(message="offset cannot be used with after")
+
+        versions = await user_service.get_user_versions(
+            offset,
+            limit,
+            sort,
+            CursorUtil.decode(after, sort) if after is not None else None,
+        )
+
+        etag = EtagUtil.make(
+            sort, limit, offset, after, *itertools.chain.from_iterable(versions)
+        )
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if versions and len(versions) == limit:
+            last_id, last_created_at, _ = versions[-1]
+            headers["X-Next-Cursor"] = CursorUtil.encode(
+                sort, last_created_at if sort == "created_at" else last_id, last_id
+            )
+
+        if EtagUtil.matches(request.headers.get("If-None-Match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            await user_service.get_users_json(etag, versions),
+            media_type="application/json",
+            headers=headers,
+        )
+
+    @classmethod
+    async def export(
+        cls,
+        file_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+        user_service: UserService = Depends(UserService),
+    ) -> StreamingResponse:
+        """
+        ユーザーエクスポートAPI
+
+        Args:
+            file_format (str): 出力形式(ndjson | csv)
+            user_service (UserService): ユーザーサービス
+
+        Returns:
+            StreamingResponse: 全ユーザーのNDJSONまたはCSV
+        """
+
+        media_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+
+        return StreamingResponse(
+            user_service.export_users(file_format),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f'attachment; filename="users.{file_format}"'
+            },
+        )
+
+    @classmethod
+    async def me(cls, user: UserPublic = Depends(get_current_user)) -> UserPublic:
+        """
+        ログインユーザー取得API
+
+        Args:
+            user (UserPublic): ログインしているユーザー
+
+        Returns:
+            UserPublic: ユーザー情報
+        """
+
+        return user
 
     @classmethod
     async def show(
-        cls, user_id: int, user_service: UserService = Depends(UserService)
-    ) -> UserPublic:
+        cls,
+        request: Request,
+        user_id: int,
+        user_service: UserService = Depends(UserService),
+    ) -> Response:
         """
         ユーザー詳細API
 
+        IDと更新日時から計算したETagがIf-None-Matchと一致する場合は304を返す
+
         Args:
+            request (Request): リクエスト
             user_id (int): ユーザーID
             user_service (UserService): ユーザーサービス
 
         Returns:
-            UserPublic: ユーザー情報
+            Response: ユーザー情報
         """
 
-        return UserPublic.model_validate(user_service.get_user(user_id))
+        version = await user_service.get_user_version(user_id)
+        etag = EtagUtil.make(*version)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if EtagUtil.matches(request.headers.get("If-None-Match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            await user_service.get_user_json(etag, version),
+            media_type="application/json",
+            headers=headers,
+        )
 
     @classmethod
     async def create(
@@ -58,7 +169,7 @@ class UserController:
         Returns:
             UserPublic: 登録したユーザー情報
         """
-        return UserPublic.model_validate(user_service.create_user(user))
+        return UserPublic.model_validate(await user_service.create_user(user))
 
     @classmethod
     async def update(
@@ -79,8 +190,8 @@ class UserController:
             UserPublic: 更新したユーザー情報
         """
 
-        return UserPublic.model_validate(
-            user_service.update_user(user_service.get_user(user_id), user)
+        return await user_service.update_user(
+            await user_service.get_user(user_id, use_primary=True), user
         )
 
     @classmethod
@@ -98,5 +209,86 @@ class UserController:
             dict[str, str]: 削除完了メッセージ
         """
 
-        user_service.delete_user(user_service.get_user(user_id))
+        await user_service.delete_user(
+            await user_service.get_user(user_id, use_primary=True)
+        )
         return {"is_deleted": True}
+
+    @classmethod
+    async def bulk_create(
+        cls,
+        users: list[UserCreate],
+        user_service: UserService = Depends(UserService),
+    ) -> list[UserBulkResult]:
+        """
+        ユーザー一括登録API
+
+        Args:
+            users (list[UserCreate]): ユーザー情報
+            user_service (UserService): ユーザーサービス
+
+        Returns:
+            list[UserBulkResult]: 入力順の登録結果
+
+        Raises:
+            BadRequestException: 件数が上限を超えている場合
+        """
+
+        cls._validate_bulk_size(users)
+
+        return await user_service.create_users(users)
+
+    @classmethod
+    async def bulk_update(
+        cls,
+        users: list[UserBulkUpdate],
+        user_service: UserService = Depends(UserService),
+    ) -> list[UserBulkResult]:
+        """
+        ユーザー一括更新API
+
+        Args:
+            users (list[UserBulkUpdate]): ユーザーIDと更新するユーザー情報
+            user_service (UserService): ユーザーサービス
+
+        Returns:
+            list[UserBulkResult]: 入力順の更新結果
+
+        Raises:
+            BadRequestException: 件数が上限を超えている場合
+        """
+
+        cls._validate_bulk_size(users)
+
+        return await user_service.update_users(users)
+
+    @classmethod
+    async def bulk_delete(
+        cls,
+        user_ids: list[int] = Body(),
+        user_service: UserService = Depends(UserService),
+    ) -> list[UserBulkResult]:
+        """
+        ユーザー一括削除API
+
+        Args:
+            user_ids (list[int]): 削除するユーザーID
+            user_service (UserService): ユーザーサービス
+
+        Returns:
+            list[UserBulkResult]: 入力順の削除結果
+
+        Raises:
+            BadRequestException: 件数が上限を超えている場合
+        """
+
+        cls._validate_bulk_size(user_ids)
+
+        return await user_service.delete_users(user_ids)
+
+    @classmethod
+    def _validate_bulk_size(cls, items: list) -> None:
+        if len(items) > USER_BULK_MAX_ITEMS:
+            raise BadRequestException(
+                message=f"Too many items. Max: {USER_BULK_MAX_ITEMS}"
+            )
@@ -0,0 +1,102 @@
+import sys
+from typing import Any, Iterator
+
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import postgresql
+
+from src.services.auth import AuthService
+from src.services.user import UserService
+from src.settings.db import engine
+
+# インデックスを使用して検索されるべきクエリと対象テーブル
+CHECKS: list[tuple[str, str, Select]] = [
+    (
+        "AuthService.get_user_by_email",
+        "users",
+        AuthService.select_user_by_email("test1@example.com"),
+    ),
+    (
+        "AuthService.get_social_account",
+        "user_social_accounts",
+        AuthService.select_social_account_user_id("google", "seed-1"),
+    ),
+    (
+        "UserService.get_user_id_by_email",
+        "users",
+        UserService.select_user_id_by_email("test1@example.com"),
+    ),
+]
+
+
+def iter_plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """
+    実行計画のノードを再帰的に返す
+
+    Args:
+        plan (dict[str, Any]): EXPLAIN (FORMAT JSON)のPlan
+
+    Returns:
+        Iterator[dict[str, Any]]: 実行計画のノード
+    """
+
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def check_index_scan(statement: Select, table: str) -> tuple[bool, list[str]]:
+    """
+    クエリがテーブルをインデックススキャンで検索するかを確認する
+    テーブルの行数が少ないとシーケンシャルスキャンが選ばれるため、
+    enable_seqscanを無効にしてインデックスが使用可能かを確認する
+
+    Args:
+        statement (Select): 確認するクエリ
+        table (str): 対象テーブル
+
+    Returns:
+        tuple[bool, list[str]]: インデックススキャンの場合はTrueと、対象テーブルのノードの種類
+    """
+
+    sql = str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    with engine.connect() as connection:
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+        connection.rollback()
+
+    node_types = [
+        node["Node Type"]
+        for node in iter_plan_nodes(plan[0]["Plan"])
+        if node.get("Relation Name") == table or "Index Name" in node
+    ]
+
+    return (
+        "Seq Scan" not in node_types
+        and any("Index" in node_type for node_type in node_types),
+        node_types,
+    )
+
+
+def main() -> None:
+    """
+    AuthService・UserServiceの検索クエリがインデックスを使用しているかを確認する
+    インデックスを使用していないクエリがある場合は終了コード1で終了する
+    """
+
+    is_ok = True
+
+    for name, table, statement in CHECKS:
+        uses_index, node_types = check_index_scan(statement, table)
+        print(f"{'OK' if uses_index else 'NG'} {name}: {', '.join(node_types)}")
+        is_ok = is_ok and uses_index
+
+    sys.exit(0 if is_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
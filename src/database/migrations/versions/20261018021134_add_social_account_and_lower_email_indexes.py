@@ -0,0 +1,41 @@
+"""add_social_account_and_lower_email_indexes
+
+Revision ID: 29348fddf9c7
+Revises: 34cfd15932e3
+Create Date: 2026-10-18 02:11:34.902117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "29348fddf9c7"
+down_revision: Union[str, None] = "34cfd15932e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ux_user_social_accounts_provider_provider_user_id",
+        "user_social_accounts",
+        ["provider", "provider_user_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_users_lower_email",
+        "users",
+        [sa.text("lower(email)")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_lower_email", table_name="users")
+    op.drop_index(
+        "ux_user_social_accounts_provider_provider_user_id",
+        table_name="user_social_accounts",
+    )
@@ -0,0 +1,59 @@
+"""make_users_lower_email_index_unique
+
+Revision ID: 189cab7fb3a9
+Revises: 29348fddf9c7
+Create Date: 2026-10-18 02:54:56.715243
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "189cab7fb3a9"
+down_revision: Union[str, None] = "29348fddf9c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 大文字小文字だけが異なるメールアドレスが登録済みの場合は、
+    # どちらのユーザーを残すかを判断できないため中断する(手動で統合・変更してから再実行する)
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT lower(email), count(*) FROM users "
+                "GROUP BY lower(email) HAVING count(*) > 1 "
+                "ORDER BY lower(email) LIMIT 20"
+            )
+        )
+        .all()
+    )
+
+    if duplicates:
+        emails = ", ".join(f"{email} ({count})" for email, count in duplicates)
+        raise RuntimeError(
+            "Case-insensitive duplicate emails exist in users. "
+            f"Merge or rename them before upgrading: {emails}"
+        )
+
+    op.drop_index("ix_users_lower_email", table_name="users")
+    op.create_index(
+        "ux_users_lower_email",
+        "users",
+        [sa.text("lower(email)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_users_lower_email", table_name="users")
+    op.create_index(
+        "ix_users_lower_email",
+        "users",
+        [sa.text("lower(email)")],
+        unique=False,
+    )
@@ -0,0 +1,109 @@
+import threading
+import time
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolWaitStats:
+    """
+    コネクションプールからコネクションを取得するまでの待機時間を集計するクラス
+    同期モードではスレッドプールから呼ばれるためロックで保護する
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def record(self, elapsed: float, is_timeout: bool) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += elapsed
+            self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+            if is_timeout:
+                self.timeouts += 1
+
+    def to_dict(self) -> dict[str, int | float]:
+        with self._lock:
+            return {
+                "wait_count": self.wait_count,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "timeouts": self.timeouts,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """コネクション取得の待機時間を計測するQueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        is_timeout = False
+
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            is_timeout = True
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - start_time, is_timeout)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """コネクション取得の待機時間を計測するAsyncAdaptedQueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        is_timeout = False
+
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            is_timeout = True
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - start_time, is_timeout)
+
+
+def get_pool_stats(engine: Engine | AsyncEngine) -> dict[str, int | float]:
+    """
+    エンジンのコネクションプールの状態を返す
+
+    Args:
+        engine (Engine | AsyncEngine): エンジン
+
+    Returns:
+        dict[str, int | float]: プールサイズ・使用中のコネクション数・オーバーフロー数・待機時間
+    """
+
+    pool: Pool = engine.pool
+    stats: dict[str, int | float] = {}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+
+    wait_stats = getattr(pool, "wait_stats", None)
+    if isinstance(wait_stats, PoolWaitStats):
+        stats.update(wait_stats.to_dict())
+
+    return stats
@@ -0,0 +1,97 @@
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+
+class QueryStats:
+    """
+    1リクエストで実行したSQLの件数・合計時間・同じ形のSQLの実行回数
+
+    同期エンジンのSQLはスレッドプールで実行されるが、
+    コンテキスト変数は同じオブジェクトを参照するため、リクエストの処理内の全てのSQLを集計できる
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        # SQL(パラメーターはプレースホルダーのまま)ごとの実行回数
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def get_repeated_statements(self, threshold: int) -> dict[str, int]:
+        """
+        threshold回以上実行した同じ形のSQLを返す(N+1の検出に使用する)
+
+        Args:
+            threshold (int): 実行回数の閾値
+
+        Returns:
+            dict[str, int]: SQLごとの実行回数
+        """
+
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+# 実行中のリクエストのSQLの集計(リクエスト外の場合はNone)
+query_stats_var: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if query_stats_var.get() is not None:
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    stats = query_stats_var.get()
+    start_times = conn.info.get("query_start_times")
+
+    if stats is None or not start_times:
+        return
+
+    stats.record(statement, time.perf_counter() - start_times.pop())
+
+
+def _handle_error(exception_context: Any) -> None:
+    # 失敗したSQLはafter_cursor_executeが呼ばれないため開始時刻を破棄する
+    conn = exception_context.connection
+    start_times = conn.info.get("query_start_times") if conn is not None else None
+
+    if start_times:
+        start_times.pop()
+
+
+def register_query_listeners() -> None:
+    """
+    全てのエンジン(非同期エンジン・レプリカを含む)のSQLの実行を集計するイベントを登録する
+    """
+
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
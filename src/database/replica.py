@@ -0,0 +1,65 @@
+import itertools
+import threading
+import time
+from typing import Generic, TypeVar
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+E = TypeVar("E", Engine, AsyncEngine)
+
+
+class ReplicaRouter(Generic[E]):
+    """
+    読み取り専用のクエリをリードレプリカにラウンドロビンで振り分けるクラス
+
+    クエリに失敗したレプリカはretry_seconds秒間振り分け対象から外す
+    全てのレプリカが使用できない場合はNoneを返し、呼び出し元はプライマリを使用する
+    """
+
+    def __init__(self, engines: list[E], retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._unhealthy_until: dict[int, float] = {}
+
+    def choose(self) -> E | None:
+        """
+        次に使用するレプリカのエンジンを返す
+
+        Returns:
+            E | None: レプリカのエンジン | 使用できるレプリカがない場合はNone
+        """
+
+        if not self.engines:
+            return None
+
+        start = next(self._counter)
+        now = time.monotonic()
+
+        for i in range(len(self.engines)):
+            index = (start + i) % len(self.engines)
+            if self._unhealthy_until.get(index, 0.0) <= now:
+                return self.engines[index]
+
+        return None
+
+    def mark_unhealthy(self, engine: object) -> None:
+        """
+        レプリカを一定時間振り分け対象から外す
+
+        Args:
+            engine (object): クエリに失敗したエンジン(管理外のエンジンの場合は何もしない)
+        """
+
+        for index, replica_engine in enumerate(self.engines):
+            if replica_engine is engine:
+                with self._lock:
+                    self._unhealthy_until[index] = time.monotonic() + self.retry_seconds
+                return
+
+    def is_healthy(self, engine: E) -> bool:
+        index = self.engines.index(engine)
+
+        return self._unhealthy_until.get(index, 0.0) <= time.monotonic()
@@ -0,0 +1,120 @@
+import time
+from typing import Iterable, Iterator
+
+from src.settings.db import engine
+
+
+class IteratorFile:
+    """
+    行のジェネレータをCOPY FROM STDINに渡すためのファイルライクオブジェクト
+    psycopg2のcopy_expertが呼ぶread(size)の分だけ行を生成するため、全行をメモリに載せない
+    """
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._buffer]
+        length = len(self._buffer)
+
+        while size < 0 or length < size:
+            try:
+                line = next(self._lines)
+            except StopIteration:
+                break
+
+            parts.append(line)
+            length += len(line)
+
+        data = "".join(parts)
+
+        if size < 0:
+            self._buffer = ""
+            return data
+
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def to_copy_line(values: Iterable[object]) -> str:
+    """
+    値をCOPYのテキスト形式(タブ区切り)の1行に変換する
+    シーダーが生成する値はタブ・改行・バックスラッシュを含まないためエスケープしない
+
+    Args:
+        values (Iterable[object]): カラムの値
+
+    Returns:
+        str: COPYのテキスト形式の1行
+    """
+
+    return "\t".join(str(value) for value in values) + "\n"
+
+
+def copy_rows(
+    table: str,
+    columns: tuple[str, ...],
+    rows: Iterator[tuple],
+    chunk_size: int,
+) -> int:
+    """
+    行をCOPY FROM STDINでテーブルに投入する
+    chunk_size行ごとにCOPYを実行してコミットする
+
+    Args:
+        table (str): テーブル名
+        columns (tuple[str, ...]): カラム名
+        rows (Iterator[tuple]): 投入する行
+        chunk_size (int): 1回のCOPYで投入する行数
+
+    Returns:
+        int: 投入した行数
+    """
+
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    total = 0
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+
+        while True:
+            chunk_count = 0
+
+            def chunk_lines() -> Iterator[str]:
+                nonlocal chunk_count
+                for row in rows:
+                    chunk_count += 1
+                    yield to_copy_line(row)
+                    if chunk_count >= chunk_size:
+                        return
+
+            cursor.copy_expert(sql, IteratorFile(chunk_lines()))
+            connection.commit()
+
+            total += chunk_count
+            if chunk_count < chunk_size:
+                return total
+    finally:
+        connection.close()
+
+
+class SeedReport:
+    """投入件数と処理速度を表示するためのクラス"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start_time = time.perf_counter()
+        self.rows = 0
+
+    def add(self, rows: int) -> None:
+        self.rows += rows
+
+    def print(self) -> None:
+        elapsed = time.perf_counter() - self.start_time
+        rows_per_sec = self.rows / elapsed if elapsed > 0 else 0.0
+        print(
+            f"{self.name}: {self.rows} rows in {elapsed:.2f} seconds "
+            f"({rows_per_sec:,.0f} rows/sec)"
+        )
@@ -1,16 +1,177 @@
-from sqlmodel import Session
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterator
 
-from src.models.user import User
+from sqlalchemy import text
+
+from src.database.seeders.base import SeedReport, copy_rows
 from src.settings.db import engine
 
-with Session(engine) as session:
-    users = [
-        User(
-            name=f"テストユーザー {i+1}",
-            email=f"test{i+1}@example.com",
-            password="1234",
+USER_COLUMNS = ("id", "name", "email", "created_at", "updated_at")
+SOCIAL_ACCOUNT_COLUMNS = (
+    "user_id",
+    "provider",
+    "provider_user_id",
+    "created_at",
+    "updated_at",
+)
+
+
+def generate_users(start_id: int, end_id: int) -> Iterator[tuple]:
+    """
+    ユーザーの行を1行ずつ生成する
+
+    Args:
+        start_id (int): 最初のユーザーID
+        end_id (int): 最後のユーザーID(含まない)
+
+    Returns:
+        Iterator[tuple]: usersテーブルの行
+    """
+
+    now = datetime.now()
+
+    for user_id in range(start_id, end_id):
+        yield (
+            user_id,
+            f"テストユーザー {user_id}",
+            f"test{user_id}@example.com",
+            now,
+            now,
         )
-        for i in range(1000000)
+
+
+def generate_social_accounts(
+    start_id: int, end_id: int, social_ratio: float
+) -> Iterator[tuple]:
+    """
+    ソーシャルアカウントの行を1行ずつ生成する
+    ユーザーIDの先頭からsocial_ratioの割合でGoogleアカウントを紐付ける
+
+    Args:
+        start_id (int): 最初のユーザーID
+        end_id (int): 最後のユーザーID(含まない)
+        social_ratio (float): ソーシャルアカウントを作成するユーザーの割合
+
+    Returns:
+        Iterator[tuple]: user_social_accountsテーブルの行
+    """
+
+    now = datetime.now()
+    step = round(1 / social_ratio) if social_ratio > 0 else 0
+
+    if step == 0:
+        return
+
+    for user_id in range(start_id, end_id, step):
+        yield (user_id, "google", f"seed-{user_id}", now, now)
+
+
+def seed_range(
+    start_id: int, end_id: int, chunk_size: int, social_ratio: float
+) -> tuple[int, int]:
+    """
+    ユーザーIDの範囲のユーザーとソーシャルアカウントを投入する(ワーカープロセスで実行)
+
+    Args:
+        start_id (int): 最初のユーザーID
+        end_id (int): 最後のユーザーID(含まない)
+        chunk_size (int): 1回のCOPYで投入する行数
+        social_ratio (float): ソーシャルアカウントを作成するユーザーの割合
+
+    Returns:
+        tuple[int, int]: 投入したユーザー数とソーシャルアカウント数
+    """
+
+    # 親プロセスから引き継いだコネクションは使用しない
+    engine.dispose(close=False)
+
+    users = copy_rows(
+        "users", USER_COLUMNS, generate_users(start_id, end_id), chunk_size
+    )
+    social_accounts = copy_rows(
+        "user_social_accounts",
+        SOCIAL_ACCOUNT_COLUMNS,
+        generate_social_accounts(start_id, end_id, social_ratio),
+        chunk_size,
+    )
+
+    return users, social_accounts
+
+
+def seed(rows: int, workers: int, chunk_size: int, social_ratio: float) -> None:
+    """
+    ユーザーとソーシャルアカウントをCOPY FROM STDINで投入する
+
+    既存の最大IDの次からIDを採番し、ID範囲をワーカーに分割して並列に投入する
+    行はジェネレータで生成してchunk_size行ずつ流し込むため、件数によらずメモリ使用量は一定
+
+    Args:
+        rows (int): 投入するユーザー数
+        workers (int): 並列に投入するワーカープロセス数
+        chunk_size (int): 1回のCOPYで投入する行数
+        social_ratio (float): ソーシャルアカウントを作成するユーザーの割合
+    """
+
+    with engine.connect() as connection:
+        start_id = connection.execute(
+            text("SELECT COALESCE(MAX(id), 0) + 1 FROM users")
+        ).scalar_one()
+
+    end_id = start_id + rows
+    range_size = max(1, -(-rows // workers))
+    ranges = [
+        (range_start, min(range_start + range_size, end_id))
+        for range_start in range(start_id, end_id, range_size)
     ]
-    session.bulk_save_objects(users)
-    session.commit()
+
+    user_report = SeedReport("users")
+    social_account_report = SeedReport("user_social_accounts")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                seed_range, range_start, range_end, chunk_size, social_ratio
+            )
+            for range_start, range_end in ranges
+        ]
+
+        for future in futures:
+            users, social_accounts = future.result()
+            user_report.add(users)
+            social_account_report.add(social_accounts)
+
+    # IDを指定して投入したため、シーケンスを最大IDに合わせる
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence('users', 'id'), "
+                "(SELECT MAX(id) FROM users))"
+            )
+        )
+
+    user_report.print()
+    social_account_report.print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ユーザーのシーダー")
+    parser.add_argument("--rows", type=int, default=1000000, help="ユーザー数")
+    parser.add_argument("--workers", type=int, default=4, help="ワーカープロセス数")
+    parser.add_argument(
+        "--chunk-size", type=int, default=100000, help="1回のCOPYで投入する行数"
+    )
+    parser.add_argument(
+        "--social-ratio",
+        type=float,
+        default=0.1,
+        help="ソーシャルアカウントを作成するユーザーの割合(0で作成しない)",
+    )
+    args = parser.parse_args()
+
+    seed(args.rows, args.workers, args.chunk_size, args.social_ratio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+from fastapi import Depends, Request
+
+from src.exceptions.not_found_exception import NotFoundException
+from src.exceptions.unauthorized_exception import UnauthorizedException
+from src.models.user import UserPublic
+from src.services.user import UserService
+
+
+async def get_current_user(
+    request: Request, user_service: UserService = Depends(UserService)
+) -> UserPublic:
+    """
+    認証ミドルウェアが設定したユーザーIDのユーザー情報を返す(Dependsで使用する)
+
+    UserServiceのリクエスト内のキャッシュとプロセス内のキャッシュを使用するため、
+    1リクエストで取得するのは最大1回で、キャッシュがある場合は取得しない
+
+    Args:
+        request (Request): リクエスト
+        user_service (UserService): ユーザーサービス
+
+    Returns:
+        UserPublic: ログインしているユーザー
+
+    Raises:
+        UnauthorizedException: 未認証の場合やユーザーが削除されている場合
+    """
+
+    user_id = getattr(request.state, "user_id", None)
+
+    if user_id is None:
+        raise UnauthorizedException()
+
+    try:
+        return await user_service.get_user_public(int(user_id))
+    except NotFoundException:
+        raise UnauthorizedException()
@@ -0,0 +1,3 @@
+class BadRequestException(Exception):
+    def __init__(self, message: str):
+        self.message = message
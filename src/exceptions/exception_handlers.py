@@ -2,9 +2,14 @@ from fastapi import Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from src.exceptions.bad_request_exception import BadRequestException
 from src.exceptions.conflict_exception import ConflictException
 from src.exceptions.login_failed_exception import LoginFailedException
 from src.exceptions.not_found_exception import NotFoundException
+from src.exceptions.service_unavailable_exception import (
+    ServiceUnavailableException,
+)
+from src.exceptions.unauthorized_exception import UnauthorizedException
 from src.settings.logger import logger
 
 
@@ -12,13 +17,22 @@ class APIExceptionHandler:
     @classmethod
     def handlers(cls):
         return {
+            BadRequestException: cls.bad_request_exception_handler,
             LoginFailedException: cls.login_failed_exception_handler,
+            UnauthorizedException: cls.unauthorized_exception_handler,
             NotFoundException: cls.not_found_exception_handler,
             ConflictException: cls.conflict_exception_handler,
+            ServiceUnavailableException: cls.service_unavailable_exception_handler,
             RequestValidationError: cls.validation_exception_handler,
             Exception: cls.generic_exception_handler,
         }
 
+    @classmethod
+    async def bad_request_exception_handler(
+        cls, request: Request, exc: BadRequestException
+    ) -> JSONResponse:
+        return JSONResponse(status_code=400, content={"detail": exc.message})
+
     @classmethod
     async def login_failed_exception_handler(
         cls, request: Request, exc: LoginFailedException
@@ -27,6 +41,12 @@ class APIExceptionHandler:
             status_code=401, content={"detail": "Login failed", "is_login_failed": True}
         )
 
+    @classmethod
+    async def unauthorized_exception_handler(
+        cls, request: Request, exc: UnauthorizedException
+    ) -> JSONResponse:
+        return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+
     @classmethod
     async def not_found_exception_handler(
         cls, request: Request, exc: NotFoundException
@@ -39,6 +59,16 @@ class APIExceptionHandler:
     ) -> JSONResponse:
         return JSONResponse(status_code=409, content={"detail": exc.message})
 
+    @classmethod
+    async def service_unavailable_exception_handler(
+        cls, request: Request, exc: ServiceUnavailableException
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Service Unavailable"},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @classmethod
     async def validation_exception_handler(
         cls, request: Request, exc: RequestValidationError
@@ -0,0 +1,3 @@
+class ServiceUnavailableException(Exception):
+    def __init__(self, retry_after: int = 1):
+        self.retry_after = retry_after
@@ -0,0 +1,2 @@
+class UnauthorizedException(Exception):
+    pass
@@ -1,22 +1,82 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from src.exceptions.exception_handlers import APIExceptionHandler
-from src.middlewares.authenticate import AuthenticateMiddleware
+from src.metrics.collectors import register_default_collectors
+from src.metrics.registry import metrics_registry
+from src.middlewares.authenticate import AuthenticateMiddleware, PublicRouteRules
 from src.middlewares.log import LogMiddleware
-from src.routes import auth, user
+from src.middlewares.metrics import MetricsMiddleware
+from src.middlewares.profiling import ProfilingMiddleware
+from src.middlewares.query_stats import QueryStatsMiddleware
+from src.middlewares.server_timing import ServerTimingMiddleware
+from src.routes import auth, metrics, system, user
+from src.settings.app import (
+    LOG_MIDDLEWARE_ENABLED,
+    METRICS_TOKEN,
+    PROFILING_TOKEN,
+    SERVER_TIMING_ENABLED,
+)
+from src.settings.cache import cache
+from src.settings.db import DB_QUERY_STATS_ENABLED
+from src.utils.hash import hash_pool
+from src.utils.http import HttpUtil
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 外部APIのコネクションを再利用するため、HTTPクライアントをアプリケーションで共有する
+    app.state.http_client = HttpUtil.create_client()
+
+    yield
+
+    await app.state.http_client.aclose()
+    await cache.backend.close()
+    hash_pool.shutdown()
 
-app = FastAPI(exception_handlers=APIExceptionHandler.handlers())
 
-app.add_middleware(AuthenticateMiddleware)
-app.add_middleware(LogMiddleware)
+app = FastAPI(
+    exception_handlers=APIExceptionHandler.handlers(),
+    lifespan=lifespan,
+)
 
 # ルーターを登録する
 routers = [
     user.router,
     auth.router,
+    system.router,
+]
+
+# 認証をスキップするルーター
+public_routers = [
+    auth.router,
 ]
 
 APP_PREFIX = "/api"
 
 for router in routers:
     app.include_router(router, prefix=APP_PREFIX)
+
+# メトリクスはAPP_PREFIXの外に公開し、ユーザーのトークンの代わりにMETRICS_TOKENで保護する
+if METRICS_TOKEN:
+    app.include_router(metrics.router)
+register_default_collectors(metrics_registry)
+
+# 後に追加したミドルウェアが外側になる(ログは認証エラーのリクエストも記録する)
+app.add_middleware(
+    AuthenticateMiddleware,
+    public_rules=PublicRouteRules.from_routers(public_routers, APP_PREFIX),
+    protected_prefix=APP_PREFIX,
+)
+if DB_QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+# 認証・SQLの集計より外側で内訳を集計する
+if SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+if LOG_MIDDLEWARE_ENABLED:
+    app.add_middleware(LogMiddleware)
+# 最も外側で計測し、認証エラーやログの処理時間も含める
+app.add_middleware(MetricsMiddleware)
+if PROFILING_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
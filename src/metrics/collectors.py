@@ -0,0 +1,99 @@
+from typing import Iterable, Mapping
+
+from src.metrics.registry import Metric, MetricsRegistry, Untyped
+from src.middlewares.authenticate import get_token_cache_stats
+from src.services.user import user_response_cache
+from src.settings.cache import cache
+from src.settings.db import get_all_pool_stats
+from src.settings.logger import get_log_stats
+from src.utils.hash import hash_pool
+
+
+def stats_to_metrics(
+    prefix: str,
+    help_text: str,
+    stats: Mapping[str, Mapping[str, float]],
+    label_name: str,
+) -> list[Metric]:
+    """
+    コンポーネントの統計情報({ラベル値: {項目: 値}})を項目ごとのメトリクスに変換する
+
+    Args:
+        prefix (str): メトリクス名の接頭辞
+        help_text (str): 説明
+        stats (Mapping[str, Mapping[str, float]]): 統計情報
+        label_name (str): ラベル値のラベル名
+
+    Returns:
+        list[Metric]: 項目ごとのメトリクス
+    """
+
+    metrics: dict[str, Untyped] = {}
+
+    for label_value, values in stats.items():
+        for key, value in values.items():
+            if not isinstance(value, (int, float)):
+                continue
+
+            metric = metrics.get(key)
+            if metric is None:
+                metric = Untyped(
+                    f"{prefix}_{key}", f"{help_text} ({key})", [label_name]
+                )
+                metrics[key] = metric
+
+            metric.set(value, label_value)
+
+    return list(metrics.values())
+
+
+def collect_db_pool() -> Iterable[Metric]:
+    return stats_to_metrics(
+        "db_pool", "DB connection pool", get_all_pool_stats(), "engine"
+    )
+
+
+def collect_hash_pool() -> Iterable[Metric]:
+    return stats_to_metrics(
+        "hash_pool",
+        "Password hashing worker pool",
+        {"bcrypt": hash_pool.stats()},
+        "pool",
+    )
+
+
+def collect_log_queue() -> Iterable[Metric]:
+    return stats_to_metrics("log", "Log queue", {"app": get_log_stats()}, "logger")
+
+
+def collect_caches() -> Iterable[Metric]:
+    return stats_to_metrics(
+        "cache",
+        "In-process and shared caches",
+        {
+            **{
+                f"token_{name}": stats
+                for name, stats in get_token_cache_stats().items()
+            },
+            "user": cache.stats(),
+            "user_response": user_response_cache.stats(),
+        },
+        "cache",
+    )
+
+
+def register_default_collectors(registry: MetricsRegistry) -> None:
+    """
+    DBプール・ハッシュ化プール・ログキュー・キャッシュの状態を収集時に出力するように登録する
+
+    Args:
+        registry (MetricsRegistry): 登録先
+    """
+
+    for collector in (
+        collect_db_pool,
+        collect_hash_pool,
+        collect_log_queue,
+        collect_caches,
+    ):
+        registry.register_collector(collector)
@@ -0,0 +1,249 @@
+import bisect
+import math
+from typing import Callable, Iterable, TypeVar
+
+# リクエストのレイテンシ(秒)のヒストグラムのバケット
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# リクエスト・レスポンスのサイズ(バイト)のヒストグラムのバケット
+DEFAULT_SIZE_BUCKETS = (
+    100.0,
+    1_000.0,
+    10_000.0,
+    100_000.0,
+    1_000_000.0,
+    10_000_000.0,
+)
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+
+    pairs = ",".join(
+        f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)
+    )
+
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """
+    メトリクスの基底クラス
+
+    イベントループ上から更新される前提でロックは使用しない
+    (値の更新はawaitを挟まないため、他のリクエストと競合しない)
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> list[str]:
+        """
+        テキスト形式(Prometheusのexposition format)の行を返す
+
+        Returns:
+            list[str]: HELP・TYPEと値の行
+        """
+
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.render_samples(),
+        ]
+
+    def render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """増加のみする値"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def get(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render_samples(self) -> list[str]:
+        return [
+            f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """増減する値"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def get(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render_samples(self) -> list[str]:
+        return [
+            f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Untyped(Gauge):
+    """
+    型を持たない値(他のコンポーネントの統計情報を収集時に変換する場合に使用する)
+    累計値と現在値が混在するため、Gaugeとして扱わないようにする
+    """
+
+    type_name = "untyped"
+
+
+class Histogram(Metric):
+    """
+    値の分布を集計する(パーセンタイルはPrometheus側でhistogram_quantileで計算する)
+
+    バケットは累積せずに保持し、出力時に累積する
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # ラベルごとの[バケットごとの件数(+Infを含む), 合計, 件数]
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        entry = self._values.get(labelvalues)
+
+        if entry is None:
+            entry = ([0] * (len(self.buckets) + 1), [0.0, 0])
+            self._values[labelvalues] = entry
+
+        counts, totals = entry
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def get_count(self, *labelvalues: str) -> int:
+        entry = self._values.get(labelvalues)
+
+        return int(entry[1][1]) if entry else 0
+
+    def render_samples(self) -> list[str]:
+        lines = []
+        bucket_labelnames = (*self.labelnames, "le")
+        upper_bounds = [format_value(bound) for bound in (*self.buckets, math.inf)]
+
+        for labels, (counts, (total, count)) in self._values.items():
+            cumulative = 0
+            for upper_bound, bucket_count in zip(upper_bounds, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{format_labels(bucket_labelnames, (*labels, upper_bound))}"
+                    f" {cumulative}"
+                )
+
+            label_text = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {format_value(count)}")
+
+        return lines
+
+
+Collector = Callable[[], Iterable[Metric]]
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    """
+    メトリクスとコレクター(収集時に他のコンポーネントの状態からメトリクスを生成する関数)の登録先
+    メトリクスはワーカープロセスごとに保持する
+    """
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: list[Collector] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        登録されている全てのメトリクスをテキスト形式で返す
+
+        Returns:
+            str: テキスト形式のメトリクス
+        """
+
+        lines = []
+
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
@@ -1,51 +1,216 @@
-from fastapi import Request
+import re
+import time
+
+from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-from jose import JWTError, jwt
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.routing import APIRoute
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.settings.app import (
+    TOKEN_CACHE_MAX_SIZE,
+    TOKEN_CACHE_TTL,
+    TOKEN_NEGATIVE_CACHE_MAX_SIZE,
+    TOKEN_NEGATIVE_CACHE_TTL,
+)
+from src.utils.server_timing import measure_timing
+from src.utils.token import InvalidTokenError, token_codec
+from src.utils.ttl_cache import TTLCache
+
+# 検証済みのトークンとユーザーID
+token_cache: TTLCache[str, str] = TTLCache(TOKEN_CACHE_MAX_SIZE)
+
+# 検証に失敗したトークン(有効なトークンを追い出さないよう別のキャッシュにする)
+invalid_token_cache: TTLCache[str, bool] = TTLCache(TOKEN_NEGATIVE_CACHE_MAX_SIZE)
+
+
+def verify_token(token: str) -> str | None:
+    """
+    トークンを検証してユーザーIDを返す
+    検証結果をキャッシュし、同じトークンの再検証を省略する
+
+    Args:
+        token (str): アクセストークン
+
+    Returns:
+        str | None: ユーザーID | トークンが不正な場合はNone
+    """
+
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    if invalid_token_cache.get(token):
+        return None
+
+    try:
+        payload = token_codec.decode(token)
+    except InvalidTokenError:
+        invalid_token_cache.set(token, True, TOKEN_NEGATIVE_CACHE_TTL)
+        return None
+
+    user_id = payload.get("sub")
+
+    if user_id is None:
+        invalid_token_cache.set(token, True, TOKEN_NEGATIVE_CACHE_TTL)
+        return None
+
+    # トークンの有効期限を超えてキャッシュしない
+    ttl: float = TOKEN_CACHE_TTL
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
 
-from src.settings.app import ALGORITHM, JWT_SECRET_KEY
+    token_cache.set(token, user_id, ttl)
 
+    return user_id
 
-class AuthenticateMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+
+def get_token_cache_stats() -> dict[str, dict[str, int]]:
+    """
+    トークンのキャッシュの状態を返す
+
+    Returns:
+        dict[str, dict[str, int]]: キャッシュごとの件数・ヒット数・ミス数
+    """
+
+    return {
+        "valid": token_cache.stats(),
+        "invalid": invalid_token_cache.stats(),
+    }
+
+
+class PublicRouteRules:
+    """
+    認証をスキップするルートの判定ルール
+
+    起動時にルーターのルートからパスを収集し、
+    パスパラメータを含まないパスは集合、含むパスは正規表現にコンパイルしておく
+    """
+
+    def __init__(self, paths: frozenset[str], patterns: list[re.Pattern]):
+        self.paths = paths
+        self.patterns = patterns
+
+    @classmethod
+    def from_routers(cls, routers: list[APIRouter], prefix: str) -> "PublicRouteRules":
         """
-        リクエストにトークンが含まれているかを確認し
-        トークンが正しいかを確認するミドルウェア
+        ルーターに登録されているルートから生成する
 
         Args:
-            request (Request): リクエスト
-            call_next (Callable): 次のミドルウェア
+            routers (list[APIRouter]): 認証をスキップするルーター
+            prefix (str): ルーターを登録する際のプレフィックス
 
         Returns:
-            JSONResponse: レスポンス
+            PublicRouteRules: ルール
         """
 
-        # Swagger UIのリクエストは認証をスキップ
-        if request.url.path.startswith("/api") is False:
-            return await call_next(request)
+        paths = set()
+        patterns = []
+
+        for router in routers:
+            for route in router.routes:
+                if not isinstance(route, APIRoute):
+                    continue
+
+                path = prefix + route.path
+                path_regex, _, param_convertors = compile_path(path)
+
+                if param_convertors:
+                    patterns.append(path_regex)
+                else:
+                    paths.add(path)
 
-        # ログインAPIは認証をスキップ
-        if request.url.path.startswith("/api/auth"):
-            return await call_next(request)
+        return cls(frozenset(paths), patterns)
 
-        token = request.headers.get("Authorization")
+    def is_public(self, path: str) -> bool:
+        if path in self.paths:
+            return True
 
-        if token is None:
-            # TODO: カスタム例外ハンドラーを使用するとエラーになるため一旦ここだけ直接レスポンスを返す(raiseするとエラーになる)
-            return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+        return any(pattern.match(path) for pattern in self.patterns)
 
-        try:
+
+def get_bearer_token(scope: Scope) -> str | None:
+    """
+    AuthorizationヘッダーからBearerトークンを取り出す
+
+    Args:
+        scope (Scope): ASGIスコープ
+
+    Returns:
+        str | None: トークン | ヘッダーが無い場合はNone
+    """
+
+    for name, value in scope["headers"]:
+        if name == b"authorization":
             # "Bearer <token>"からトークン部分を抽出
-            token = token.split(" ")[1]
+            _, _, token = value.decode("latin-1").partition(" ")
+            return token
+
+    return None
+
+
+class AuthenticateMiddleware:
+    """
+    認証ミドルウェア
+
+    BaseHTTPMiddlewareを使用せずASGIのメッセージを直接中継する
+    認証に失敗した場合は後続のアプリケーションを呼ばずに401を返す
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        public_rules: PublicRouteRules,
+        protected_prefix: str = "/api",
+    ):
+        self.app = app
+        self.public_rules = public_rules
+        self.protected_prefix = protected_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        リクエストにトークンが含まれているかを確認し
+        トークンが正しいかを確認するミドルウェア
 
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
-            user_id = payload.get("sub")
+        Args:
+            scope (Scope): ASGIスコープ
+            receive (Receive): リクエストメッセージの受信関数
+            send (Send): レスポンスメッセージの送信関数
+        """
+
+        if scope["type"] != "http" or not self.is_protected(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        with measure_timing("auth"):
+            token = get_bearer_token(scope)
+            user_id = verify_token(token) if token else None
+
+        if user_id is None:
+            response = JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+            await response(scope, receive, send)
+            return
+
+        # request.state.user_idで参照できるようにする
+        scope.setdefault("state", {})["user_id"] = user_id
+
+        await self.app(scope, receive, send)
 
-            if user_id is None:
-                return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+    def is_protected(self, path: str) -> bool:
+        """
+        認証が必要なパスかを判定する
+
+        Args:
+            path (str): リクエストのパス
+
+        Returns:
+            bool: 認証が必要な場合はTrue
+        """
 
-            request.state.user_id = user_id
+        # Swagger UIなどAPI以外のリクエストと、ログインAPIなどは認証をスキップ
+        if path != self.protected_prefix and not path.startswith(
+            self.protected_prefix + "/"
+        ):
+            return False
 
-            return await call_next(request)
-        except JWTError:
-            return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+        return not self.public_rules.is_public(path)
@@ -1,82 +1,253 @@
+import logging
+import random
 import time
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.settings.app import (
+    LOG_MAX_BODY_BYTES,
+    LOG_SAMPLE_RATE_DEFAULT,
+    LOG_SAMPLE_RATES,
+)
 from src.settings.logger import logger
 
 
-class LogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
+class LogSampler:
+    """
+    ルート(メソッドとルートのパステンプレート)ごとにログを記録するかを決めるクラス
+    ステータスコードが400以上のリクエストは常に記録する
+    """
+
+    def __init__(self, rates: dict[str, float], default_rate: float = 1.0):
+        self.rates = rates
+        self.default_rate = default_rate
+
+    @classmethod
+    def from_config(cls, config: str, default_rate: float = 1.0) -> "LogSampler":
         """
-        ログミドルウェア
+        "GET /api/users=0.01,GET /api/users/{user_id}=0.1"形式の設定から生成する
 
         Args:
-            request (Request): リクエストオブジェクト
-            call_next: 次のミドルウェアまたはエンドポイントハンドラーを呼び出す関数
+            config (str): サンプリング率の設定
+            default_rate (float): 設定にないルートのサンプリング率
+
+        Returns:
+            LogSampler: サンプラー
+        """
+
+        rates = {}
+        for item in config.split(","):
+            if not item.strip():
+                continue
+
+            route, rate = item.rsplit("=", 1)
+            rates[route.strip()] = float(rate)
+
+        return cls(rates, default_rate)
+
+    def should_log(self, method: str, route_path: str, status_code: int) -> bool:
+        """
+        ログを記録するかを判定する
+
+        Args:
+            method (str): HTTPメソッド
+            route_path (str): ルートのパステンプレート
+            status_code (int): ステータスコード
+
+        Returns:
+            bool: 記録する場合はTrue
+        """
+
+        if status_code >= 400:
+            return True
+
+        rate = self.rates.get(f"{method} {route_path}", self.default_rate)
+        if rate >= 1.0:
+            return True
+
+        return random.random() < rate
+
+
+def get_route_path(scope: Scope) -> str:
+    """
+    リクエストにマッチしたルートのパステンプレートを返す
+
+    Args:
+        scope (Scope): ASGIスコープ
+
+    Returns:
+        str: パステンプレート(ルーティング前やマッチしない場合はリクエストのパス)
+    """
+
+    route = scope.get("route")
+
+    return getattr(route, "path", scope["path"])
+
+
+class BodyCapture:
+    """
+    ログ出力用にボディの先頭max_bytesバイトだけを保持するバッファ
+    ボディ全体は保持しないため、リクエストあたりのメモリ使用量は一定になる
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.chunks: list[bytes] = []
+        self.captured_bytes = 0
+        self.total_bytes = 0
+
+    def append(self, chunk: bytes) -> None:
+        """
+        チャンクを追加する(上限を超えた分は破棄する)
+
+        Args:
+            chunk (bytes): ボディのチャンク
+        """
+
+        self.total_bytes += len(chunk)
+
+        remaining = self.max_bytes - self.captured_bytes
+        if remaining <= 0 or not chunk:
+            return
+
+        captured = chunk[:remaining]
+        self.chunks.append(captured)
+        self.captured_bytes += len(captured)
+
+    def get_body(self) -> str:
+        """
+        保持しているボディを文字列で返す
 
         Returns:
-            Response: レスポンスオブジェクト
+            str: ボディ(切り詰めた場合は末尾に全体のバイト数を付与する)
         """
 
+        body = b"".join(self.chunks).decode("utf-8", errors="replace")
+
+        if self.total_bytes > self.captured_bytes:
+            body += f"...(truncated, {self.total_bytes} bytes)"
+
+        return body
+
+
+class LogMiddleware:
+    """
+    ログミドルウェア
+
+    BaseHTTPMiddlewareを使用せずASGIのメッセージを直接中継する
+    ボディは加工せずにそのまま流し、ログ用に先頭だけをBodyCaptureに複製する
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_bytes: int = LOG_MAX_BODY_BYTES,
+        sampler: LogSampler | None = None,
+    ):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.sampler = sampler or LogSampler.from_config(
+            LOG_SAMPLE_RATES, LOG_SAMPLE_RATE_DEFAULT
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        ログミドルウェア
+
+        Args:
+            scope (Scope): ASGIスコープ
+            receive (Receive): リクエストメッセージの受信関数
+            send (Send): レスポンスメッセージの送信関数
+        """
+
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
+        request = Request(scope)
         client_ip = request.client.host if request.client else "Unknown"
 
-        # リクエストのログを記録
-        await self.log_request(request, client_ip)
+        request_body = BodyCapture(self.max_body_bytes)
+        response_body = BodyCapture(self.max_body_bytes)
+        status_code = 500
+        is_sampled = False
 
-        try:
-            # レスポンスの処理
-            response = await call_next(request)
-            response_body = await self.get_response_body(response)
-
-            # レスポンスのログを記録
-            await self.log_response(
-                request, response, response_body, client_ip, start_time
-            )
-
-            return Response(
-                content=response_body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type,
-            )
+        async def receive_wrapper() -> Message:
+            message = await receive()
+
+            if message["type"] == "http.request":
+                request_body.append(message.get("body", b""))
 
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, is_sampled
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+                # ステータスコードとルートが確定した時点で記録するかを判定し、
+                # 記録する場合はリクエストのログを記録
+                is_sampled = self.sampler.should_log(
+                    request.method, get_route_path(scope), status_code
+                )
+                if is_sampled:
+                    self.log_request(request, request_body, client_ip)
+
+            elif message["type"] == "http.response.body" and is_sampled:
+                response_body.append(message.get("body", b""))
+
+                # レスポンスの最後のチャンクでレスポンスのログを記録
+                if not message.get("more_body", False):
+                    self.log_response(
+                        request, status_code, response_body, client_ip, start_time
+                    )
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
         except Exception as e:
-            # 例外発生時のレスポンスログを記録
-            await self.log_error_response(request, client_ip, start_time)
+            # 例外発生時のログは常に記録
+            if not is_sampled:
+                self.log_request(request, request_body, client_ip)
+            self.log_error_response(request, client_ip, start_time)
 
             # 例外発生時のレスポンスはエラーハンドラーに任せる
             raise e
 
-    async def log_request(self, request: Request, client_ip: str) -> None:
+    def log_request(
+        self, request: Request, request_body: BodyCapture, client_ip: str
+    ) -> None:
         """
         リクエストのログを記録
 
         Args:
             request (Request): リクエストオブジェクト
+            request_body (BodyCapture): リクエストボディ
             client_ip (str): クライアントIPアドレス
 
         Returns:
             None
         """
 
-        request_body = await request.body()
         request_log_dict = {
             "client_ip": client_ip,
             "url": str(request.url),
             "method": request.method,
             "query_params": str(request.query_params),
             "headers": dict(request.headers),
-            "body": request_body.decode("utf-8"),
+            "body": request_body.get_body(),
         }
-        logger.info(f"Request: {request_log_dict}")
+        logger.info("Request", extra={"fields": request_log_dict})
 
-    async def log_response(
+    def log_response(
         self,
         request: Request,
-        response: Response,
-        response_body: bytes,
+        status_code: int,
+        response_body: BodyCapture,
         client_ip: str,
         start_time: float,
     ) -> None:
@@ -85,8 +256,8 @@ class LogMiddleware(BaseHTTPMiddleware):
 
         Args:
             request (Request): リクエストオブジェクト
-            response (Response): レスポンスオブジェクト
-            response_body (bytes): レスポンスボディ
+            status_code (int): ステータスコード
+            response_body (BodyCapture): レスポンスボディ
             client_ip (str): クライアントIPアドレス
             start_time (float): リクエスト処理開始時刻
 
@@ -98,13 +269,13 @@ class LogMiddleware(BaseHTTPMiddleware):
             "client_ip": client_ip,
             "url": str(request.url),
             "method": request.method,
-            "status_code": response.status_code,
-            "body": response_body.decode("utf-8"),
+            "status_code": status_code,
+            "body": response_body.get_body(),
             "processing_time": f"{time.time() - start_time:.4f} seconds",
         }
-        logger.info(f"Response: {response_log_dict}")
+        logger.info("Response", extra={"fields": response_log_dict})
 
-    async def log_error_response(
+    def log_error_response(
         self, request: Request, client_ip: str, start_time: float
     ) -> None:
         """
@@ -127,21 +298,4 @@ class LogMiddleware(BaseHTTPMiddleware):
             "body": {"detail": "Internal Server Error"},
             "processing_time": f"{time.time() - start_time:.4f} seconds",
         }
-        logger.info(f"Response: {error_response_log_dict}")
-
-    async def get_response_body(self, response: Response) -> bytes:
-        """
-        レスポンスボディを取得
-
-        Args:
-            response (Response): レスポンスオブジェクト
-
-        Returns:
-            bytes: レスポンスボディ
-        """
-
-        response_body = b""
-        async for chunk in response.body_iterator:  # type: ignore
-            response_body += chunk
-
-        return response_body
+        logger.info("Response", extra={"fields": error_response_log_dict})
@@ -0,0 +1,195 @@
+import time
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics.registry import (
+    DEFAULT_SIZE_BUCKETS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    metrics_registry,
+)
+
+# ルートにマッチしないリクエストのルートのラベル
+# (リクエストのパスをそのままラベルにすると、不正なURLへのアクセスで系列が増え続けるため)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# メソッドのラベルに使用するHTTPメソッド(それ以外はOTHER_METHODにまとめ、任意のメソッドで系列が増えないようにする)
+KNOWN_METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE")
+)
+OTHER_METHOD = "OTHER"
+
+
+class HttpMetrics:
+    """
+    HTTPリクエストのメトリクス
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        labelnames = ("method", "route")
+
+        self.requests = registry.register(
+            Counter(
+                "http_requests_total",
+                "Total HTTP requests",
+                (*labelnames, "status"),
+            )
+        )
+        self.duration = registry.register(
+            Histogram(
+                "http_request_duration_seconds",
+                "HTTP request latency in seconds",
+                labelnames,
+            )
+        )
+        self.request_size = registry.register(
+            Histogram(
+                "http_request_size_bytes",
+                "HTTP request body size in bytes",
+                labelnames,
+                DEFAULT_SIZE_BUCKETS,
+            )
+        )
+        self.response_size = registry.register(
+            Histogram(
+                "http_response_size_bytes",
+                "HTTP response body size in bytes",
+                labelnames,
+                DEFAULT_SIZE_BUCKETS,
+            )
+        )
+        self.in_flight = registry.register(
+            Gauge("http_requests_in_flight", "HTTP requests being processed")
+        )
+
+
+http_metrics = HttpMetrics(metrics_registry)
+
+
+def get_method_label(scope: Scope) -> str:
+    """
+    メトリクスのラベルに使用するHTTPメソッドを返す
+
+    Args:
+        scope (Scope): ASGIスコープ
+
+    Returns:
+        str: HTTPメソッド(KNOWN_METHODS以外の場合はOTHER_METHOD)
+    """
+
+    method = scope["method"]
+
+    return method if method in KNOWN_METHODS else OTHER_METHOD
+
+
+def get_route_label(scope: Scope) -> str:
+    """
+    メトリクスのラベルに使用するルートのパステンプレートを返す
+
+    認証ミドルウェアで拒否された場合などルーティング前にレスポンスを返した場合は
+    scopeにrouteが設定されないため、アプリケーションのルートとパスを照合する
+
+    Args:
+        scope (Scope): ASGIスコープ
+
+    Returns:
+        str: パステンプレート(マッチしない場合はUNMATCHED_ROUTE)
+    """
+
+    route = scope.get("route") or match_route(scope)
+
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+def match_route(scope: Scope) -> BaseRoute | None:
+    """
+    scopeのパスにマッチするアプリケーションのルートを返す
+
+    Args:
+        scope (Scope): ASGIスコープ
+
+    Returns:
+        BaseRoute | None: ルート(パスのみ一致しメソッドが異なる場合を含む) | マッチしない場合はNone
+    """
+
+    router = getattr(scope.get("app"), "router", None)
+    partial_route = None
+
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+
+        if match == Match.FULL:
+            return route
+
+        if match == Match.PARTIAL and partial_route is None:
+            partial_route = route
+
+    return partial_route
+
+
+class MetricsMiddleware:
+    """
+    メトリクスミドルウェア
+
+    ルートのパステンプレートごとにリクエスト数・ステータスクラス・レイテンシ・
+    リクエストとレスポンスのサイズを記録する
+    値の更新はメモリ上の加算のみで、I/Oやロックの待機は行わない
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HttpMetrics | None = None):
+        self.app = app
+        self.metrics = metrics or http_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        メトリクスミドルウェア
+
+        Args:
+            scope (Scope): ASGIスコープ
+            receive (Receive): リクエストメッセージの受信関数
+            send (Send): レスポンスメッセージの送信関数
+        """
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_bytes
+
+            message = await receive()
+
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_bytes
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+
+            await send(message)
+
+        self.metrics.in_flight.inc()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            self.metrics.in_flight.dec()
+
+            labels = (get_method_label(scope), get_route_label(scope))
+            self.metrics.requests.inc(*labels, f"{status_code // 100}xx")
+            self.metrics.duration.observe(time.perf_counter() - start_time, *labels)
+            self.metrics.request_size.observe(request_bytes, *labels)
+            self.metrics.response_size.observe(response_bytes, *labels)
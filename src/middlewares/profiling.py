@@ -0,0 +1,161 @@
+import cProfile
+import hmac
+import os
+import re
+from datetime import datetime
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.settings.app import PROFILING_DIR, PROFILING_TOKEN
+from src.settings.logger import logger
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pyinstrumentはオプションの依存関係(poetry install -E profiling)
+    Profiler = None  # type: ignore[assignment,misc]
+
+# プロファイリングを要求するリクエストヘッダー(値はPROFILING_TOKEN)
+PROFILE_HEADER = b"x-profile"
+
+FILENAME_UNSAFE_PATTERN = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class RequestProfiler:
+    """
+    1リクエストのプロファイラー
+
+    pyinstrumentがインストールされている場合はサンプリングプロファイラー(awaitをまたいで計測するHTML)、
+    インストールされていない場合はcProfile(pstats形式)を使用する
+    cProfileはイベントループのスレッドで同時に処理している他のリクエストも計測に含む
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._profiler: Any = (
+            Profiler(interval=0.001, async_mode="enabled")
+            if Profiler is not None
+            else cProfile.Profile()
+        )
+
+    def start(self) -> None:
+        if Profiler is not None:
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if Profiler is not None:
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        if Profiler is not None:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(self._profiler.output_html())
+        else:
+            self._profiler.dump_stats(self.path)
+
+
+class ProfilingMiddleware:
+    """
+    X-Profileヘッダーに管理者用のトークンが指定されたリクエストをプロファイリングするミドルウェア
+
+    プロファイルはPROFILING_DIRに保存し、ファイル名をX-Profile-Fileヘッダーで返す
+    同時にプロファイリングするのは1リクエストのみ(実行中の場合は計測せずに処理する)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str = PROFILING_TOKEN,
+        profile_dir: str = PROFILING_DIR,
+    ):
+        self.app = app
+        self.token = token.encode()
+        self.profile_dir = profile_dir
+        self._is_profiling = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        プロファイリングミドルウェア
+
+        Args:
+            scope (Scope): ASGIスコープ
+            receive (Receive): リクエストメッセージの受信関数
+            send (Send): レスポンスメッセージの送信関数
+        """
+
+        if scope["type"] != "http" or not self.is_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # トークンがログに記録されないよう内側の処理にはヘッダーを渡さない
+        scope = {
+            **scope,
+            "headers": [
+                (name, value)
+                for name, value in scope["headers"]
+                if name != PROFILE_HEADER
+            ],
+        }
+
+        if self._is_profiling:
+            logger.warning("Profiling skipped. Another request is being profiled.")
+            await self.app(scope, receive, send)
+            return
+
+        profiler = RequestProfiler(self.get_profile_path(scope))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-File"] = os.path.basename(
+                    profiler.path
+                )
+
+            await send(message)
+
+        self._is_profiling = True
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            self._is_profiling = False
+
+            try:
+                await run_in_threadpool(profiler.save)
+                logger.info(f"Profile saved. path: {profiler.path}")
+            except OSError as e:
+                logger.error(f"Failed to save profile. {e}")
+
+    def is_requested(self, scope: Scope) -> bool:
+        """
+        X-Profileヘッダーのトークンが一致するかを判定する
+
+        Args:
+            scope (Scope): ASGIスコープ
+
+        Returns:
+            bool: プロファイリングする場合はTrue
+        """
+
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token)
+
+        return False
+
+    def get_profile_path(self, scope: Scope) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = FILENAME_UNSAFE_PATTERN.sub("_", scope["path"]).strip("_") or "root"
+        extension = "html" if Profiler is not None else "prof"
+
+        return os.path.join(
+            self.profile_dir, f"{timestamp}-{scope['method']}-{path}.{extension}"
+        )
@@ -0,0 +1,136 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.query_stats import QueryStats, query_stats_var
+from src.metrics.registry import (
+    DEFAULT_LATENCY_BUCKETS,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    metrics_registry,
+)
+from src.middlewares.metrics import get_method_label, get_route_label
+from src.settings.db import DB_QUERY_WARNING_THRESHOLD, DB_REPEATED_QUERY_THRESHOLD
+from src.settings.logger import logger
+from src.utils.server_timing import record_timing
+
+
+class QueryMetrics:
+    """
+    リクエストごとのSQLのメトリクス
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        labelnames = ("method", "route")
+
+        self.queries = registry.register(
+            Histogram(
+                "db_queries_per_request",
+                "SQL statements executed per HTTP request",
+                labelnames,
+                (0, 1, 2, 3, 5, 10, 20, 50, 100),
+            )
+        )
+        self.duration = registry.register(
+            Histogram(
+                "db_query_duration_seconds_per_request",
+                "Total SQL execution time per HTTP request in seconds",
+                labelnames,
+                DEFAULT_LATENCY_BUCKETS,
+            )
+        )
+        self.warnings = registry.register(
+            Counter(
+                "db_query_warnings_total",
+                "HTTP requests exceeding the SQL count or repeated statement threshold",
+                (*labelnames, "reason"),
+            )
+        )
+
+
+query_metrics = QueryMetrics(metrics_registry)
+
+
+class QueryStatsMiddleware:
+    """
+    リクエストごとにSQLの件数と合計時間を集計するミドルウェア
+
+    レスポンスヘッダーのX-DB-Queriesに出力し、Server-Timingのdbに追加する
+    (ストリーミングレスポンスはヘッダー送信時点までの集計になる)
+    件数が閾値を超えた場合や同じ形のSQLを繰り返し実行した場合は警告ログを出力する
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        warning_threshold: int = DB_QUERY_WARNING_THRESHOLD,
+        repeated_threshold: int = DB_REPEATED_QUERY_THRESHOLD,
+        metrics: QueryMetrics | None = None,
+    ):
+        self.app = app
+        self.warning_threshold = warning_threshold
+        self.repeated_threshold = repeated_threshold
+        self.metrics = metrics or query_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        SQLの集計ミドルウェア
+
+        Args:
+            scope (Scope): ASGIスコープ
+            receive (Receive): リクエストメッセージの受信関数
+            send (Send): レスポンスメッセージの送信関数
+        """
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats_var.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                record_timing("db", stats.total_seconds, f"{stats.count} queries")
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats_var.reset(token)
+            self.record(scope, stats)
+
+    def record(self, scope: Scope, stats: QueryStats) -> None:
+        """
+        メトリクスを記録し、閾値を超えている場合は警告ログを出力する
+
+        Args:
+            scope (Scope): ASGIスコープ
+            stats (QueryStats): リクエストのSQLの集計
+        """
+
+        method = get_method_label(scope)
+        route = get_route_label(scope)
+
+        self.metrics.queries.observe(stats.count, method, route)
+        self.metrics.duration.observe(stats.total_seconds, method, route)
+
+        if stats.count > self.warning_threshold:
+            self.metrics.warnings.inc(method, route, "count")
+            logger.warning(
+                f"Too many queries. route: {method} {route} "
+                f"queries: {stats.count} time: {stats.total_seconds * 1000:.1f}ms"
+            )
+
+        repeated = stats.get_repeated_statements(self.repeated_threshold)
+
+        if repeated:
+            self.metrics.warnings.inc(method, route, "repeated")
+            statement, count = max(repeated.items(), key=lambda item: item[1])
+            logger.warning(
+                f"Repeated query detected. route: {method} {route} "
+                f"count: {count} statement: {' '.join(statement.split())[:500]}"
+            )
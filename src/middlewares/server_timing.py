@@ -0,0 +1,50 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.server_timing import ServerTiming, server_timing_var
+
+
+class ServerTimingMiddleware:
+    """
+    処理時間の内訳をServer-Timingヘッダーに出力するミドルウェア
+
+    内側の処理がrecord_timing・measure_timingで追加した項目
+    (auth・db・hash・http・serialize)と、レスポンスヘッダー送信までの合計(app)を出力する
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Server-Timingミドルウェア
+
+        Args:
+            scope (Scope): ASGIスコープ
+            receive (Receive): リクエストメッセージの受信関数
+            send (Send): レスポンスメッセージの送信関数
+        """
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        server_timing = ServerTiming()
+        token = server_timing_var.set(server_timing)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                server_timing.add("app", time.perf_counter() - start_time)
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", server_timing.to_header()
+                )
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            server_timing_var.reset(token)
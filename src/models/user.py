@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -14,6 +15,12 @@ class UserBase(SQLModel):
 
 class User(UserBase, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # created_at順のキーセットページネーション用
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # 大文字小文字を区別しないメールアドレス検索用(大文字小文字だけが異なる重複も防ぐ)
+        Index("ux_users_lower_email", text("lower(email)"), unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.now)
@@ -30,6 +37,11 @@ class UserPublic(UserBase):
     id: int
 
 
+class UserSnapshot(UserPublic):
+    # キャッシュに保存するユーザー情報(詳細APIのETagの計算にDBへアクセスしないよう更新日時を含む)
+    updated_at: datetime
+
+
 class UserCreate(UserBase):
     pass
 
@@ -39,6 +51,19 @@ class UserUpdate(SQLModel):
     email: Optional[str] = None
 
 
+class UserBulkUpdate(UserUpdate):
+    id: int
+
+
+class UserBulkResult(SQLModel):
+    # リクエストの配列内の位置
+    index: int
+    id: Optional[int] = None
+    # created | updated | deleted | conflict | not_found
+    status: str
+    detail: Optional[str] = None
+
+
 class UserPasswordLogin(SQLModel):
     email: str
     password: str
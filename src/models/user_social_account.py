@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from src.models.user import User
@@ -8,6 +9,15 @@ from src.models.user import User
 
 class UserSocialAccount(SQLModel, table=True):
     __tablename__ = "user_social_accounts"
+    __table_args__ = (
+        # ソーシャルログイン時の検索用(同じプロバイダーのアカウントは1つのみ)
+        Index(
+            "ux_user_social_accounts_provider_provider_user_id",
+            "provider",
+            "provider_user_id",
+            unique=True,
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[int] = Field(index=True, default=None, foreign_key="users.id")
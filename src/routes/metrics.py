@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+from src.controllers.metrics import MetricsController
+
+router = APIRouter(tags=["metrics"])
+
+router.add_api_route(
+    "/metrics",
+    MetricsController.index,
+    methods=["GET"],
+    response_model=None,
+    include_in_schema=False,
+)
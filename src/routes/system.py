@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+
+from src.controllers.system import SystemController
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+router.add_api_route(
+    "/pool-stats", SystemController.pool_stats, methods=["GET"], response_model=dict
+)
+router.add_api_route(
+    "/token-cache-stats",
+    SystemController.token_cache_stats,
+    methods=["GET"],
+    response_model=dict,
+)
@@ -1,13 +1,38 @@
 from fastapi import APIRouter
 
 from src.controllers.user import UserController
-from src.models.user import UserPublic
+from src.models.user import UserBulkResult, UserPublic
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 router.add_api_route(
     "", UserController.index, methods=["GET"], response_model=list[UserPublic]
 )
+# "/{user_id}"より先に登録する
+router.add_api_route(
+    "/me", UserController.me, methods=["GET"], response_model=UserPublic
+)
+router.add_api_route(
+    "/export", UserController.export, methods=["GET"], response_model=None
+)
+router.add_api_route(
+    "/bulk",
+    UserController.bulk_create,
+    methods=["POST"],
+    response_model=list[UserBulkResult],
+)
+router.add_api_route(
+    "/bulk",
+    UserController.bulk_update,
+    methods=["PATCH"],
+    response_model=list[UserBulkResult],
+)
+router.add_api_route(
+    "/bulk",
+    UserController.bulk_delete,
+    methods=["DELETE"],
+    response_model=list[UserBulkResult],
+)
 router.add_api_route(
     "/{user_id}", UserController.show, methods=["GET"], response_model=UserPublic
 )
@@ -2,8 +2,11 @@ import urllib.parse
 from datetime import datetime, timedelta, timezone
 
 import httpx
-from jose import jwt
-from sqlmodel import select
+from fastapi import Depends
+from jose import JWTError, jwt
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
 from src.exceptions.conflict_exception import ConflictException
 from src.exceptions.login_failed_exception import LoginFailedException
@@ -12,21 +15,33 @@ from src.models.user_social_account import UserSocialAccount
 from src.services.base import BaseService
 from src.settings.app import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
-    ALGORITHM,
     GOOGLE_AUTHORIZATION_URL,
     GOOGLE_CALLBACK_URL,
     GOOGLE_CLIENT_ID,
     GOOGLE_CLIENT_SECRET,
     GOOGLE_TOKEN_URL,
+    GOOGLE_USER_INFO_FALLBACK,
     GOOGLE_USER_INFO_URL,
-    JWT_SECRET_KEY,
 )
+from src.settings.db import read_session_dependency, session_dependency
 from src.settings.logger import logger
 from src.utils.hash import HashUtil
+from src.utils.http import HttpUtil
+from src.utils.jwks import google_jwks_cache
+from src.utils.token import token_codec
 
 
 class AuthService(BaseService):
-    def authenticate_user(self, user_data: UserPasswordLogin) -> User | None:
+    def __init__(
+        self,
+        session: Session | AsyncSession = Depends(session_dependency),
+        read_session: Session | AsyncSession | None = Depends(read_session_dependency),
+        http_client: httpx.AsyncClient = Depends(HttpUtil.get_client),
+    ):
+        super().__init__(session, read_session)
+        self.http_client = http_client
+
+    async def authenticate_user(self, user_data: UserPasswordLogin) -> User | None:
         """
         ユーザー認証を行うメソッド
 
@@ -37,17 +52,17 @@ class AuthService(BaseService):
             User|None: ユーザー情報またはNone
         """
 
-        user = self.get_user_by_email(user_data.email)
+        user = await self.get_user_by_email(user_data.email)
 
         if not user:
             return None
 
-        if not HashUtil.verify_password(user_data.password, user.password):
+        if not await HashUtil.verify_password_async(user_data.password, user.password):
             return None
 
         return user
 
-    def create_user(
+    async def create_user(
         self,
         user_data: UserCreate,
     ) -> User:
@@ -65,17 +80,19 @@ class AuthService(BaseService):
         """
 
         try:
-            if self.get_user_by_email(user_data.email):
+            if await self.get_user_by_email(user_data.email, use_primary=True):
                 raise ConflictException(message="Email already exists")
 
             user = User.model_validate(user_data)
-            user.password = HashUtil.get_password_hash(user.password)
+            user.password = await HashUtil.get_password_hash_async(user.password)
 
-            self.session.add(user)
-            self.session.commit()
-            self.session.refresh(user)
+            def _create(session: Session) -> User:
+                session.add(user)
+                session.commit()
+                session.refresh(user)
+                return user
 
-            return user
+            return await self.run(_create)
         except ConflictException:
             # メールアドレス重複エラーはログ出力しない
             raise
@@ -102,7 +119,7 @@ class AuthService(BaseService):
 
         to_encode.update({"exp": expire})
 
-        return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
+        return token_codec.encode(to_encode)
 
     def create_jwt_token(self, user_id: int) -> Token:
         """
@@ -121,18 +138,39 @@ class AuthService(BaseService):
             token_type="bearer",
         )
 
-    def get_user_by_email(self, email: str) -> User | None:
+    async def get_user_by_email(
+        self, email: str, use_primary: bool = False
+    ) -> User | None:
         """
         メールアドレスに対応するユーザーを返すメソッド
 
         Args:
             email (str): メールアドレス
+            use_primary (bool): 結果をもとに書き込みを行う場合はTrue(プライマリから取得する)
 
         Returns:
             User | None: ユーザー| ユーザーが存在しない場合はNone
         """
 
-        return self.session.exec(select(User).where(User.email == email)).first()
+        return await self.run(
+            lambda session: session.exec(self.select_user_by_email(email)).first(),
+            read_only=not use_primary,
+        )
+
+    @classmethod
+    def select_user_by_email(cls, email: str) -> SelectOfScalar[User]:
+        """
+        メールアドレス(大文字小文字を区別しない)に対応するユーザーを取得するクエリ
+        lower(email)の関数インデックスを使用する
+
+        Args:
+            email (str): メールアドレス
+
+        Returns:
+            SelectOfScalar[User]: クエリ
+        """
+
+        return select(User).where(func.lower(User.email) == email.lower())
 
     def get_google_auth_url(self) -> str:
         """
@@ -153,23 +191,27 @@ class AuthService(BaseService):
 
         return f"{GOOGLE_AUTHORIZATION_URL}?{urllib.parse.urlencode(params)}"
 
-    async def get_google_access_token(self, code: str) -> str:
+    async def get_google_token(self, code: str) -> dict:
         """
-        Googleの認証コードを使用してアクセストークンを取得する
+        Googleの認証コードを使用してトークン(アクセストークン・id_token)を取得する
 
         Args:
             code (str): Google認証コード
 
         Returns:
-            str: Googleアクセストークン
+            dict: トークンエンドポイントのレスポンス
 
         Raises:
             LoginFailedException: 認証エラー
         """
 
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
+        # 認証コードは1回しか使用できないため、送信前の接続エラーのみリトライする
+        try:
+            token_response = await HttpUtil.request_with_retry(
+                self.http_client,
+                "POST",
                 GOOGLE_TOKEN_URL,
+                idempotent=False,
                 data={
                     "grant_type": "authorization_code",
                     "code": code,
@@ -178,6 +220,9 @@ class AuthService(BaseService):
                     "client_secret": GOOGLE_CLIENT_SECRET,
                 },
             )
+        except httpx.HTTPError as e:
+            logger.error(f"Google token request failed. {e}")
+            raise LoginFailedException()
 
         token_response_json = token_response.json()
 
@@ -185,11 +230,92 @@ class AuthService(BaseService):
             logger.error(token_response_json)
             raise LoginFailedException()
 
-        return token_response_json.get("access_token")
+        return token_response_json
 
-    async def get_google_user(self, access_token: str) -> dict:
+    async def get_google_user(self, token: dict) -> dict:
         """
-        Googleアクセストークンを使用してユーザーの情報を取得する
+        Googleのトークンからユーザーの情報(sub・email・name)を取得する
+
+        id_tokenをキャッシュした公開鍵でローカルに検証してクレームを使用する
+        id_tokenが無い場合や公開鍵を取得できない場合はユーザー情報APIから取得する
+
+        Args:
+            token (dict): トークンエンドポイントのレスポンス
+
+        Returns:
+            dict: ユーザー情報
+
+        Raises:
+            LoginFailedException: 認証エラー
+        """
+
+        id_token = token.get("id_token")
+
+        if id_token:
+            try:
+                claims = await self.verify_google_id_token(
+                    id_token, token.get("access_token")
+                )
+            except httpx.HTTPError as e:
+                logger.warning(f"Google JWKS request failed. {e}")
+            else:
+                if claims.get("email") and claims.get("name"):
+                    return claims
+
+        if not GOOGLE_USER_INFO_FALLBACK:
+            raise LoginFailedException()
+
+        return await self.get_google_user_info(token.get("access_token", ""))
+
+    async def verify_google_id_token(
+        self, id_token: str, access_token: str | None = None
+    ) -> dict:
+        """
+        Googleのid_tokenの署名・発行者・対象者・有効期限を検証する
+
+        Args:
+            id_token (str): id_token
+            access_token (str | None): at_hashの検証に使用するアクセストークン
+
+        Returns:
+            dict: id_tokenのクレーム
+
+        Raises:
+            LoginFailedException: id_tokenが不正な場合
+            httpx.HTTPError: ディスカバリードキュメント・JWKSの取得に失敗した場合
+        """
+
+        try:
+            kid = jwt.get_unverified_header(id_token).get("kid")
+        except JWTError as e:
+            logger.error(f"Invalid Google id_token. {e}")
+            raise LoginFailedException()
+
+        key = await google_jwks_cache.get_key(self.http_client, kid) if kid else None
+
+        if key is None:
+            logger.error(f"Unknown Google id_token kid. {kid}")
+            raise LoginFailedException()
+
+        issuer = await google_jwks_cache.get_issuer(self.http_client)
+
+        try:
+            return jwt.decode(
+                id_token,
+                key,
+                algorithms=[key.get("alg", "RS256")],
+                audience=GOOGLE_CLIENT_ID,
+                # Googleはスキーム無しの発行者を使用する場合がある
+                issuer=[issuer, issuer.removeprefix("https://")],
+                access_token=access_token,
+            )
+        except JWTError as e:
+            logger.error(f"Invalid Google id_token. {e}")
+            raise LoginFailedException()
+
+    async def get_google_user_info(self, access_token: str) -> dict:
+        """
+        Googleアクセストークンを使用してユーザー情報APIからユーザーの情報を取得する
 
         Args:
             access_token (str): Googleアクセストークン
@@ -201,11 +327,16 @@ class AuthService(BaseService):
             LoginFailedException: 認証エラー
         """
 
-        async with httpx.AsyncClient() as client:
-            user_info_response = await client.get(
+        try:
+            user_info_response = await HttpUtil.request_with_retry(
+                self.http_client,
+                "GET",
                 GOOGLE_USER_INFO_URL,
                 headers={"Authorization": f"Bearer {access_token}"},
             )
+        except httpx.HTTPError as e:
+            logger.error(f"Google user info request failed. {e}")
+            raise LoginFailedException()
 
         user_info_response_json = user_info_response.json()
 
@@ -215,7 +346,9 @@ class AuthService(BaseService):
 
         return user_info_response_json
 
-    def get_social_account(self, provider: str, provider_user_id: str) -> int | None:
+    async def get_social_account(
+        self, provider: str, provider_user_id: str
+    ) -> int | None:
         """
         ソーシャルアカウントを取得するメソッド
 
@@ -227,13 +360,36 @@ class AuthService(BaseService):
             int | None: ユーザーID | ユーザーが存在しない場合はNone
         """
 
-        return self.session.exec(
+        return await self.run(
+            lambda session: session.exec(
+                self.select_social_account_user_id(provider, provider_user_id)
+            ).first(),
+            read_only=True,
+        )
+
+    @classmethod
+    def select_social_account_user_id(
+        cls, provider: str, provider_user_id: str
+    ) -> SelectOfScalar[int | None]:
+        """
+        ソーシャルアカウントに紐づくユーザーIDを取得するクエリ
+        (provider, provider_user_id)のユニークインデックスを使用する
+
+        Args:
+            provider (str): プロバイダー名
+            provider_user_id (str): プロバイダーユーザーID
+
+        Returns:
+            SelectOfScalar[int | None]: クエリ
+        """
+
+        return (
             select(UserSocialAccount.user_id)
             .where(UserSocialAccount.provider == provider)
             .where(UserSocialAccount.provider_user_id == provider_user_id)
-        ).first()
+        )
 
-    def create_social_account(
+    async def create_social_account(
         self, user_id: int, provider: str, provider_user_id: str
     ) -> None:
         """
@@ -245,17 +401,20 @@ class AuthService(BaseService):
             provider_user_id (str): プロバイダーユーザーID
         """
 
-        social_account = UserSocialAccount(
-            user_id=user_id,
-            provider=provider,
-            provider_user_id=provider_user_id,
-        )
+        def _create(session: Session) -> None:
+            social_account = UserSocialAccount(
+                user_id=user_id,
+                provider=provider,
+                provider_user_id=provider_user_id,
+            )
+
+            session.add(social_account)
+            session.commit()
+            session.refresh(social_account)
 
-        self.session.add(social_account)
-        self.session.commit()
-        self.session.refresh(social_account)
+        await self.run(_create)
 
-    def create_user_with_social_account(
+    async def create_user_with_social_account(
         self,
         user_data: UserCreate,
         provider: str,
@@ -275,11 +434,12 @@ class AuthService(BaseService):
         Raises:
             LoginFailedException: ログイン失敗
         """
-        try:
+
+        def _create(session: Session) -> int:
             user = User.model_validate(user_data)
 
-            self.session.add(user)
-            self.session.flush()
+            session.add(user)
+            session.flush()
 
             if user.id is None:
                 raise LoginFailedException()
@@ -290,9 +450,12 @@ class AuthService(BaseService):
                 provider_user_id=provider_user_id,
             )
 
-            self.session.add(social_account)
-            self.session.commit()
+            session.add(social_account)
+            session.commit()
             return user.id
+
+        try:
+            return await self.run(_create)
         except Exception as e:
             logger.error(e)
             raise e
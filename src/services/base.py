@@ -1,9 +1,109 @@
+from typing import Callable, TypeVar
+
 from fastapi import Depends
+from sqlalchemy import Engine
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from src.settings.db import (
+    get_primary_engine,
+    get_read_engine,
+    mark_replica_unhealthy,
+    read_session_dependency,
+    session_dependency,
+)
+from src.settings.logger import logger
+
+T = TypeVar("T")
+
+
+async def run_in_new_session(fn: Callable[[Session], T], read_only: bool = False) -> T:
+    """
+    リクエストのセッションとは別の新しいセッションで処理を実行する
+    キャッシュのバックグラウンドの再読み込みなど、リクエストの終了後も実行される処理に使用する
+
+    Args:
+        fn (Callable[[Session], T]): セッションを受け取る処理
+        read_only (bool): 読み取り専用の処理かどうか(Trueの場合はリードレプリカで実行する)
+
+    Returns:
+        T: 処理の戻り値
+    """
+
+    primary_engine = get_primary_engine()
+    engine = get_read_engine() if read_only else primary_engine
+
+    try:
+        return await _run_with_engine(engine, fn)
+    except (OperationalError, InterfaceError, OSError) as e:
+        if engine is primary_engine:
+            raise
+
+        logger.warning(f"Replica query failed. Fallback to primary. {e}")
+        mark_replica_unhealthy(engine)
+
+        return await _run_with_engine(primary_engine, fn)
+
 
-from src.settings.db import get_session
+async def _run_with_engine(
+    engine: Engine | AsyncEngine, fn: Callable[[Session], T]
+) -> T:
+    if isinstance(engine, AsyncEngine):
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await session.run_sync(fn)
+
+    def _run() -> T:
+        with Session(engine) as session:
+            return fn(session)
+
+    return await run_in_threadpool(_run)
 
 
 class BaseService:
-    def __init__(self, session: Session = Depends(get_session)):
+    def __init__(
+        self,
+        session: Session | AsyncSession = Depends(session_dependency),
+        read_session: Session | AsyncSession | None = Depends(read_session_dependency),
+    ):
         self.session = session
+        self.read_session = read_session
+
+    async def run(self, fn: Callable[[Session], T], read_only: bool = False) -> T:
+        """
+        セッションを使用する同期処理をイベントループをブロックせずに実行するメソッド
+
+        非同期モードではAsyncSession.run_syncでasyncpg上で実行し、
+        同期モードではスレッドプールで実行する
+        read_only=Trueの場合はリードレプリカで実行し、失敗した場合はプライマリで再実行する
+
+        Args:
+            fn (Callable[[Session], T]): セッションを受け取る処理
+            read_only (bool): 読み取り専用の処理かどうか
+
+        Returns:
+            T: 処理の戻り値
+        """
+
+        if read_only and self.read_session is not None:
+            read_session = self.read_session
+
+            try:
+                return await self._run_in_session(read_session, fn)
+            except (OperationalError, InterfaceError, OSError) as e:
+                logger.warning(f"Replica query failed. Fallback to primary. {e}")
+
+                mark_replica_unhealthy(read_session.bind)
+                self.read_session = None
+
+        return await self._run_in_session(self.session, fn)
+
+    async def _run_in_session(
+        self, session: Session | AsyncSession, fn: Callable[[Session], T]
+    ) -> T:
+        if isinstance(session, AsyncSession):
+            return await session.run_sync(fn)
+
+        return await run_in_threadpool(fn, session)
@@ -1,36 +1,308 @@
-from typing import Sequence
-
-from sqlmodel import select
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Iterator, Sequence, TypeVar
+
+import orjson
+from fastapi import Depends
+from pydantic import TypeAdapter
+from sqlalchemy import Engine, Row, Select, delete, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
 from src.exceptions.conflict_exception import ConflictException
 from src.exceptions.not_found_exception import NotFoundException
-from src.models.user import User, UserCreate, UserUpdate
-from src.services.base import BaseService
+from src.models.user import (
+    User,
+    UserBulkResult,
+    UserBulkUpdate,
+    UserCreate,
+    UserPublic,
+    UserSnapshot,
+    UserUpdate,
+)
+from src.models.user_social_account import UserSocialAccount
+from src.services.base import BaseService, run_in_new_session
+from src.settings.app import (
+    USER_BULK_CHUNK_SIZE,
+    USER_CACHE_TTL,
+    USER_EXPORT_BATCH_SIZE,
+    USER_RESPONSE_CACHE_MAX_BYTES,
+)
+from src.settings.cache import cache
+from src.settings.db import (
+    get_read_engine,
+    read_session_dependency,
+    session_dependency,
+)
 from src.settings.logger import logger
 from src.utils.hash import HashUtil
+from src.utils.response_cache import ResponseCache
+from src.utils.server_timing import measure_timing
+
+T = TypeVar("T")
+SelectT = TypeVar("SelectT", bound=Select)
+
+# ユーザー情報のキャッシュのキー
+# キャッシュする値の形式を変更した場合は番号を変える(共有キャッシュに残っている古い形式の値を読まない)
+USER_CACHE_KEY = "user:v2:{user_id}"
+
+# エクスポートで出力するカラム(UserPublicと同じ)
+EXPORT_COLUMNS = ("id", "name", "email")
+
+# ユーザー詳細・一覧のシリアライズ済みのJSON(キーは("user", ユーザーID, ETag) | ("users", ETag))
+user_response_cache = ResponseCache(USER_RESPONSE_CACHE_MAX_BYTES)
+
+USER_PUBLIC_ADAPTER = TypeAdapter(UserPublic)
+USER_SNAPSHOT_ADAPTER = TypeAdapter(UserSnapshot)
+USER_LIST_ADAPTER = TypeAdapter(list[UserPublic])
+
+
+def encode_user_rows(rows: Sequence[Row], file_format: str) -> bytes:
+    """
+    エクスポートする行をNDJSONまたはCSVに変換する
+
+    Args:
+        rows (Sequence[Row]): (id, name, email)の行
+        file_format (str): 出力形式(ndjson | csv)
+
+    Returns:
+        bytes: 変換した行
+    """
+
+    if file_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+    return b"".join(
+        orjson.dumps(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in rows
+    )
+
+
+def chunked(items: list[T], size: int) -> Iterator[list[T]]:
+    """
+    リストをsize件ずつに分割する
+
+    Args:
+        items (list[T]): 分割するリスト
+        size (int): 1チャンクの件数
+
+    Returns:
+        Iterator[list[T]]: 分割したリスト
+    """
+
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
 
 
 class UserService(BaseService):
-    def get_users(self, offset: int, limit: int) -> Sequence[User]:
+    def __init__(
+        self,
+        session: Session | AsyncSession = Depends(session_dependency),
+        read_session: Session | AsyncSession | None = Depends(read_session_dependency),
+    ):
+        super().__init__(session, read_session)
+        # リクエスト内で取得したユーザー(Dependsはリクエストごとに同じインスタンスを返す)
+        self.identity_map: dict[int, UserSnapshot] = {}
+
+    async def get_users(
+        self,
+        offset: int,
+        limit: int,
+        sort: str = "id",
+        after: tuple[int | datetime, int] | None = None,
+    ) -> Sequence[User]:
         """
         ユーザー一覧を返すメソッド
 
+        afterを指定した場合はOFFSETを使用せず、(ソートキー, ID)がafterより後の行を
+        インデックスを使って取得する(キーセットページネーション)
+
         Args:
             offset (int): 取得開始位置
             limit (int): 取得件数
+            sort (str): ソートキー(id | created_at)
+            after (tuple[int | datetime, int] | None): 前ページ最後の行の(ソートキーの値, ID)
 
         Returns:
             Sequence[User]: ユーザー一覧
         """
 
-        return self.session.exec(select(User).offset(offset).limit(limit)).all()
+        statement = self._paginate(select(User), offset, limit, sort, after)
+
+        return await self.run(
+            lambda session: session.exec(statement).all(), read_only=True
+        )
+
+    async def get_user_versions(
+        self,
+        offset: int,
+        limit: int,
+        sort: str = "id",
+        after: tuple[int | datetime, int] | None = None,
+    ) -> Sequence[tuple[int, datetime, datetime]]:
+        """
+        get_usersと同じ条件でユーザーのID・作成日時・更新日時のみを返すメソッド
+        (ETagの計算に使用する)
+
+        Args:
+            offset (int): 取得開始位置
+            limit (int): 取得件数
+            sort (str): ソートキー(id | created_at)
+            after (tuple[int | datetime, int] | None): 前ページ最後の行の(ソートキーの値, ID)
+
+        Returns:
+            Sequence[tuple[int, datetime, datetime]]: (ID, 作成日時, 更新日時)の一覧
+        """
+
+        statement = self._paginate(
+            select(User.id, User.created_at, User.updated_at),
+            offset,
+            limit,
+            sort,
+            after,
+        )
+
+        return await self.run(
+            lambda session: session.exec(statement).all(), read_only=True
+        )
+
+    @classmethod
+    def _paginate(
+        cls,
+        statement: SelectT,
+        offset: int,
+        limit: int,
+        sort: str,
+        after: tuple[int | datetime, int] | None,
+    ) -> SelectT:
+        if sort == "created_at":
+            statement = statement.order_by(col(User.created_at), col(User.id))
+            if after is not None:
+                statement = statement.where(
+                    tuple_(User.created_at, User.id) > tuple_(*after)
+                )
+        else:
+            statement = statement.order_by(col(User.id))
+            if after is not None:
+                statement = statement.where(col(User.id) > after[1])
+
+        if after is None:
+            statement = statement.offset(offset)
+
+        return statement.limit(limit)
+
+    async def get_users_json(
+        self, etag: str, versions: Sequence[tuple[int, datetime, datetime]]
+    ) -> bytes:
+        """
+        ユーザー一覧のJSONを返すメソッド
+
+        シリアライズ済みのJSONをETagをキーにキャッシュし、変更がない間は再利用する
+
+        Args:
+            etag (str): versionsから計算したETag
+            versions (Sequence[tuple[int, datetime, datetime]]): get_user_versionsの結果
+
+        Returns:
+            bytes: ユーザー一覧のJSON
+        """
+
+        key = ("users", etag)
+        body = user_response_cache.get(key)
+
+        if body is None:
+            user_ids = [user_id for user_id, _, _ in versions]
+            users = await self.run(
+                lambda session: session.exec(
+                    select(User).where(col(User.id).in_(user_ids))
+                ).all(),
+                read_only=True,
+            )
+            users_by_id = {user.id: user for user in users}
+            ordered_users = [
+                users_by_id[user_id] for user_id in user_ids if user_id in users_by_id
+            ]
+
+            with measure_timing("serialize"):
+                body = USER_LIST_ADAPTER.dump_json(
+                    [UserPublic.model_validate(user) for user in ordered_users]
+                )
+
+            # ETagの計算後に変更された場合はキャッシュしない
+            if [
+                (user.id, user.created_at, user.updated_at) for user in ordered_users
+            ] == [tuple(version) for version in versions]:
+                user_response_cache.set(key, body)
+
+        return body
+
+    async def get_user_version(self, user_id: int) -> tuple[int, datetime]:
+        """
+        ユーザーのIDと更新日時のみを返すメソッド(ETagの計算に使用する)
+
+        get_user_snapshotと同じキャッシュを使用する
+
+        Args:
+            user_id (int): ユーザーID
+
+        Returns:
+            tuple[int, datetime]: (ID, 更新日時)
+
+        Raises:
+            NotFoundException: ユーザーが見つからない場合の例外
+        """
+
+        user = await self.get_user_snapshot(user_id)
+
+        return user.id, user.updated_at
+
+    async def get_user_json(self, etag: str, version: tuple[int, datetime]) -> bytes:
+        """
+        ユーザー情報のJSONを返すメソッド
+
+        シリアライズ済みのJSONをETagをキーにキャッシュし、変更がない間は再利用する
+
+        Args:
+            etag (str): versionから計算したETag
+            version (tuple[int, datetime]): get_user_versionの結果
+
+        Returns:
+            bytes: ユーザー情報のJSON
+
+        Raises:
+            NotFoundException: ユーザーが見つからない場合の例外
+        """
+
+        user_id, updated_at = version
+        key = ("user", user_id, etag)
+        body = user_response_cache.get(key)
+
+        if body is None:
+            user = await self.get_user_snapshot(user_id)
+            with measure_timing("serialize"):
+                body = USER_PUBLIC_ADAPTER.dump_json(user)
+
+            # ETagの計算後に変更された場合はキャッシュしない
+            if user.updated_at == updated_at:
+                user_response_cache.set(key, body)
+
+        return body
 
-    def get_user(self, user_id: int) -> User:
+    async def get_user(self, user_id: int, use_primary: bool = False) -> User:
         """
         ユーザーIDに対応するユーザー情報を返すメソッド
 
+        更新・削除するエンティティを取得するためキャッシュは使用しない
+        (参照のみの場合はget_user_snapshotを使用する)
+
         Args:
             user_id (int): ユーザーID
+            use_primary (bool): 取得したユーザーを更新・削除する場合はTrue(プライマリから取得する)
 
         Returns:
             User: ユーザー情報
@@ -39,7 +311,83 @@ class UserService(BaseService):
             NotFoundException: ユーザーが見つからない場合の例外
         """
 
-        user = self.session.get(User, user_id)
+        user = await self.run(
+            lambda session: session.get(User, user_id), read_only=not use_primary
+        )
+
+        if not user:
+            logger.error(f"User not found. user_id: {user_id}")
+            raise NotFoundException()
+
+        return user
+
+    async def get_user_public(self, user_id: int) -> UserPublic:
+        """
+        ユーザーIDに対応するユーザー情報を返すメソッド
+
+        Args:
+            user_id (int): ユーザーID
+
+        Returns:
+            UserPublic: ユーザー情報
+
+        Raises:
+            NotFoundException: ユーザーが見つからない場合の例外
+        """
+
+        return await self.get_user_snapshot(user_id)
+
+    async def get_user_snapshot(self, user_id: int) -> UserSnapshot:
+        """
+        ユーザーIDに対応するユーザー情報(更新日時を含む)を返すメソッド
+
+        リクエスト内で取得済みの場合とキャッシュにある場合はDBにアクセスしない
+        同じユーザーの同時のキャッシュミスは1回の取得にまとめる
+
+        Args:
+            user_id (int): ユーザーID
+
+        Returns:
+            UserSnapshot: ユーザー情報
+
+        Raises:
+            NotFoundException: ユーザーが見つからない場合の例外
+        """
+
+        user = self.identity_map.get(user_id)
+
+        if user is None:
+            user = await cache.get_or_load(
+                USER_CACHE_KEY.format(user_id=user_id),
+                lambda: self.load_user_snapshot(user_id),
+                USER_CACHE_TTL,
+                USER_SNAPSHOT_ADAPTER,
+            )
+            self.identity_map[user_id] = user
+
+        return user
+
+    @classmethod
+    async def load_user_snapshot(cls, user_id: int) -> UserSnapshot:
+        """
+        ユーザー情報をDBから取得するメソッド
+        キャッシュの再読み込みからも呼ばれるため、リクエストとは別のセッションで取得する
+
+        Args:
+            user_id (int): ユーザーID
+
+        Returns:
+            UserSnapshot: ユーザー情報
+
+        Raises:
+            NotFoundException: ユーザーが見つからない場合の例外
+        """
+
+        def _get(session: Session) -> UserSnapshot | None:
+            user = session.get(User, user_id)
+            return UserSnapshot.model_validate(user) if user else None
+
+        user = await run_in_new_session(_get, read_only=True)
 
         if not user:
             logger.error(f"User not found. user_id: {user_id}")
@@ -47,7 +395,29 @@ class UserService(BaseService):
 
         return user
 
-    def create_user(self, create_data: UserCreate) -> User:
+    async def invalidate_user_cache(self, user_ids: Iterable[int]) -> None:
+        """
+        登録・更新・削除したユーザーをキャッシュから削除するメソッド
+        一覧のレスポンスは全て削除する
+
+        Args:
+            user_ids (Iterable[int]): ユーザーID
+        """
+
+        user_ids = set(user_ids)
+
+        for user_id in user_ids:
+            self.identity_map.pop(user_id, None)
+
+        await cache.delete(
+            *[USER_CACHE_KEY.format(user_id=user_id) for user_id in user_ids]
+        )
+
+        user_response_cache.invalidate(
+            lambda key: key[0] == "users" or (key[0] == "user" and key[1] in user_ids)
+        )
+
+    async def create_user(self, create_data: UserCreate) -> User:
         """
         ユーザー情報を登録するメソッド
 
@@ -63,17 +433,22 @@ class UserService(BaseService):
         """
 
         try:
-            if self.get_user_id_by_email(create_data.email):
+            if await self.get_user_id_by_email(create_data.email):
                 raise ConflictException(message="Email already exists")
 
             user = User.model_validate(create_data)
-            user.password = HashUtil.get_password_hash(user.password)
+            user.password = await HashUtil.get_password_hash_async(user.password)
+
+            def _create(session: Session) -> User:
+                session.add(user)
+                session.commit()
+                session.refresh(user)
+                return user
 
-            self.session.add(user)
-            self.session.commit()
-            self.session.refresh(user)
+            created_user = await self.run(_create)
+            await self.invalidate_user_cache([])
 
-            return user
+            return created_user
         except ConflictException:
             # メールアドレス重複エラーはログ出力しない
             raise
@@ -81,7 +456,7 @@ class UserService(BaseService):
             logger.error(e)
             raise e
 
-    def update_user(self, user: User, update_data: UserUpdate) -> User:
+    async def update_user(self, user: User, update_data: UserUpdate) -> UserPublic:
         """
         ユーザー情報を更新するメソッド
 
@@ -90,7 +465,7 @@ class UserService(BaseService):
             update_data (UserUpdate): 更新するユーザー情報
 
         Returns:
-            User: 更新したユーザー情報
+            UserPublic: 更新したユーザー情報
 
         Raises:
             ConflictException: メールアドレスが重複している場合の例外
@@ -98,16 +473,25 @@ class UserService(BaseService):
         """
 
         try:
-            registered_user_id = self.get_user_id_by_email(update_data.email or "")
-            if registered_user_id and registered_user_id != user.id:
-                raise ConflictException(message="Email already exists")
+            # メールアドレスを変更する場合のみ重複を確認する
+            if update_data.email and update_data.email.lower() != user.email.lower():
+                registered_user_id = await self.get_user_id_by_email(update_data.email)
+                if registered_user_id and registered_user_id != user.id:
+                    raise ConflictException(message="Email already exists")
+
+            def _update(session: Session) -> UserPublic:
+                user.sqlmodel_update(update_data.model_dump(exclude_unset=True))
 
-            user.sqlmodel_update(update_data.model_dump(exclude_unset=True))
+                # コミット後の再取得(refresh)を省略するため、フラッシュ後の値を返す
+                session.flush()
+                updated_user = UserPublic.model_validate(user)
+                session.commit()
+                return updated_user
 
-            self.session.commit()
-            self.session.refresh(user)
+            updated_user = await self.run(_update)
+            await self.invalidate_user_cache([updated_user.id])
 
-            return user
+            return updated_user
         except ConflictException:
             # メールアドレス重複エラーはログ出力しない
             raise
@@ -115,7 +499,7 @@ class UserService(BaseService):
             logger.error(e)
             raise e
 
-    def delete_user(self, user: User) -> None:
+    async def delete_user(self, user: User) -> None:
         """
         ユーザーIDに対応するユーザー情報を削除するメソッド
 
@@ -126,14 +510,275 @@ class UserService(BaseService):
             Exception: 削除に失敗した場合の例外
         """
 
+        user_id = user.id
+
+        def _delete(session: Session) -> None:
+            session.delete(user)
+            session.commit()
+
+        try:
+            await self.run(_delete)
+        except Exception as e:
+            logger.error(e)
+            raise e
+
+        if user_id is not None:
+            await self.invalidate_user_cache([user_id])
+
+    async def create_users(self, create_data: list[UserCreate]) -> list[UserBulkResult]:
+        """
+        ユーザー情報を一括登録するメソッド
+
+        USER_BULK_CHUNK_SIZE件ごとに、メールアドレスの重複をIN句の1クエリで確認し、
+        複数行INSERT(ON CONFLICT DO NOTHING)で登録してコミットする
+
+        Args:
+            create_data (list[UserCreate]): ユーザー情報
+
+        Returns:
+            list[UserBulkResult]: 入力順の登録結果(created | conflict)
+
+        Raises:
+            Exception: 登録に失敗した場合の例外
+        """
+
+        results: list[UserBulkResult] = []
+        seen_emails: set[str] = set()
+
+        def _create(session: Session, chunk: list[tuple[int, UserCreate]]) -> None:
+            registered_emails = set(
+                session.exec(
+                    select(func.lower(User.email)).where(
+                        func.lower(User.email).in_(
+                            [data.email.lower() for _, data in chunk]
+                        )
+                    )
+                ).all()
+            )
+
+            # 登録済みまたは同じリクエスト内で重複しているメールアドレスは登録しない
+            insert_items: list[tuple[int, UserCreate]] = []
+            for index, data in chunk:
+                email = data.email.lower()
+                if email in registered_emails or email in seen_emails:
+                    results.append(
+                        UserBulkResult(
+                            index=index,
+                            status="conflict",
+                            detail="Email already exists",
+                        )
+                    )
+                    continue
+
+                seen_emails.add(email)
+                insert_items.append((index, data))
+
+            if not insert_items:
+                return
+
+            now = datetime.now()
+            inserted = session.execute(
+                insert(User)
+                .values(
+                    [
+                        {
+                            "name": data.name,
+                            "email": data.email,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for _, data in insert_items
+                    ]
+                )
+                # 重複確認後に他のリクエストで登録された場合は登録しない
+                # (emailとlower(email)のどちらの一意制約に違反した場合も対象にする)
+                .on_conflict_do_nothing()
+                .returning(col(User.id), col(User.email))
+            ).all()
+            session.commit()
+
+            inserted_ids = {email: user_id for user_id, email in inserted}
+            for index, data in insert_items:
+                if data.email in inserted_ids:
+                    results.append(
+                        UserBulkResult(
+                            index=index, id=inserted_ids[data.email], status="created"
+                        )
+                    )
+                else:
+                    results.append(
+                        UserBulkResult(
+                            index=index,
+                            status="conflict",
+                            detail="Email already exists",
+                        )
+                    )
+
+        try:
+            for chunk in chunked(list(enumerate(create_data)), USER_BULK_CHUNK_SIZE):
+                await self.run(lambda session: _create(session, chunk))
+        except Exception as e:
+            logger.error(e)
+            raise e
+        finally:
+            await self.invalidate_user_cache([])
+
+        return sorted(results, key=lambda result: result.index)
+
+    async def update_users(
+        self, update_data: list[UserBulkUpdate]
+    ) -> list[UserBulkResult]:
+        """
+        ユーザー情報を一括更新するメソッド
+
+        USER_BULK_CHUNK_SIZE件ごとに、ユーザーの存在とメールアドレスの重複を
+        IN句のクエリで確認し、主キー指定の一括UPDATEで更新してコミットする
+
+        Args:
+            update_data (list[UserBulkUpdate]): ユーザーIDと更新するユーザー情報
+
+        Returns:
+            list[UserBulkResult]: 入力順の更新結果(updated | not_found | conflict)
+
+        Raises:
+            Exception: 更新に失敗した場合の例外
+        """
+
+        results: list[UserBulkResult] = []
+        # 同じリクエスト内で設定されるメールアドレスとユーザーIDの対応
+        claimed_emails: dict[str, int] = {}
+        updated_ids: list[int] = []
+
+        def _update(session: Session, chunk: list[tuple[int, UserBulkUpdate]]) -> None:
+            registered_ids = set(
+                session.exec(
+                    select(User.id).where(
+                        col(User.id).in_([data.id for _, data in chunk])
+                    )
+                ).all()
+            )
+            email_owners = dict(
+                session.exec(
+                    select(func.lower(User.email), User.id).where(
+                        func.lower(User.email).in_(
+                            [data.email.lower() for _, data in chunk if data.email]
+                        )
+                    )
+                ).all()
+            )
+
+            now = datetime.now()
+            update_params: list[dict] = []
+            for index, data in chunk:
+                if data.id not in registered_ids:
+                    results.append(
+                        UserBulkResult(index=index, id=data.id, status="not_found")
+                    )
+                    continue
+
+                email = data.email.lower() if data.email else None
+                if email and (
+                    email_owners.get(email, data.id) != data.id
+                    or claimed_emails.get(email, data.id) != data.id
+                ):
+                    results.append(
+                        UserBulkResult(
+                            index=index,
+                            id=data.id,
+                            status="conflict",
+                            detail="Email already exists",
+                        )
+                    )
+                    continue
+
+                if email:
+                    claimed_emails[email] = data.id
+
+                update_params.append(
+                    {
+                        **data.model_dump(exclude_unset=True, exclude_none=True),
+                        "id": data.id,
+                        "updated_at": now,
+                    }
+                )
+                results.append(
+                    UserBulkResult(index=index, id=data.id, status="updated")
+                )
+
+            if update_params:
+                session.execute(update(User), update_params)
+                session.commit()
+                updated_ids.extend(params["id"] for params in update_params)
+
         try:
-            self.session.delete(user)
-            self.session.commit()
+            for chunk in chunked(list(enumerate(update_data)), USER_BULK_CHUNK_SIZE):
+                await self.run(lambda session: _update(session, chunk))
         except Exception as e:
             logger.error(e)
             raise e
+        finally:
+            # 途中のチャンクで失敗した場合もコミット済みの更新はキャッシュから削除する
+            await self.invalidate_user_cache(updated_ids)
+
+        return sorted(results, key=lambda result: result.index)
+
+    async def delete_users(self, user_ids: list[int]) -> list[UserBulkResult]:
+        """
+        ユーザー情報を一括削除するメソッド
+
+        USER_BULK_CHUNK_SIZE件ごとに、ソーシャルアカウントの紐付けを解除した上で
+        IN句の1回のDELETEで削除してコミットする(delete_userと同じ動作)
+
+        Args:
+            user_ids (list[int]): 削除するユーザーID
+
+        Returns:
+            list[UserBulkResult]: 入力順の削除結果(deleted | not_found)
 
-    def get_user_id_by_email(self, email: str) -> int | None:
+        Raises:
+            Exception: 削除に失敗した場合の例外
+        """
+
+        deleted_ids: set[int] = set()
+
+        def _delete(session: Session, chunk: list[int]) -> None:
+            session.execute(
+                update(UserSocialAccount)
+                .where(col(UserSocialAccount.user_id).in_(chunk))
+                .values(user_id=None)
+            )
+            deleted_ids.update(
+                session.execute(
+                    delete(User).where(col(User.id).in_(chunk)).returning(col(User.id))
+                ).scalars()
+            )
+            session.commit()
+
+        try:
+            for chunk in chunked(list(dict.fromkeys(user_ids)), USER_BULK_CHUNK_SIZE):
+                await self.run(lambda session: _delete(session, chunk))
+        except Exception as e:
+            logger.error(e)
+            raise e
+        finally:
+            await self.invalidate_user_cache(deleted_ids)
+
+        results: list[UserBulkResult] = []
+        for index, user_id in enumerate(user_ids):
+            if user_id in deleted_ids:
+                # 同じIDが複数指定された場合は最初の1件のみ削除扱いにする
+                deleted_ids.discard(user_id)
+                results.append(
+                    UserBulkResult(index=index, id=user_id, status="deleted")
+                )
+            else:
+                results.append(
+                    UserBulkResult(index=index, id=user_id, status="not_found")
+                )
+
+        return results
+
+    async def get_user_id_by_email(self, email: str) -> int | None:
         """
         メールアドレスに対応するユーザーidを返すメソッド
 
@@ -144,4 +789,75 @@ class UserService(BaseService):
             int | None: ユーザーID| ユーザーが存在しない場合はNone
         """
 
-        return self.session.exec(select(User.id).where(User.email == email)).first()
+        return await self.run(
+            lambda session: session.exec(self.select_user_id_by_email(email)).first()
+        )
+
+    @classmethod
+    def select_user_id_by_email(cls, email: str) -> SelectOfScalar[int | None]:
+        """
+        メールアドレス(大文字小文字を区別しない)に対応するユーザーIDを取得するクエリ
+        lower(email)の関数インデックスを使用する
+
+        Args:
+            email (str): メールアドレス
+
+        Returns:
+            SelectOfScalar[int | None]: クエリ
+        """
+
+        return select(User.id).where(func.lower(User.email) == email.lower())
+
+    def export_users(self, file_format: str) -> Iterator[bytes] | AsyncIterator[bytes]:
+        """
+        全ユーザーをNDJSONまたはCSVで順に返すメソッド
+
+        レスポンスの送信中もDBから読み続けるため、リクエストのセッションではなく
+        読み取り用エンジンのコネクションをサーバーサイドカーソルで使用する
+        UserPublicのカラムのみを取得し、USER_EXPORT_BATCH_SIZE行ずつ変換するため
+        メモリ使用量は件数によらず一定になる
+
+        Args:
+            file_format (str): 出力形式(ndjson | csv)
+
+        Returns:
+            Iterator[bytes] | AsyncIterator[bytes]: 変換した行のチャンク
+        """
+
+        read_engine = get_read_engine()
+
+        if isinstance(read_engine, AsyncEngine):
+            return self._export_users_async(read_engine, file_format)
+
+        return self._export_users_sync(read_engine, file_format)
+
+    def _export_users_sync(self, engine: Engine, file_format: str) -> Iterator[bytes]:
+        if file_format == "csv":
+            yield encode_user_rows([EXPORT_COLUMNS], file_format)  # type: ignore
+
+        with engine.connect() as connection:
+            result = connection.execution_options(
+                yield_per=USER_EXPORT_BATCH_SIZE
+            ).execute(self._export_statement())
+
+            for rows in result.partitions():
+                yield encode_user_rows(rows, file_format)
+
+    async def _export_users_async(
+        self, engine: AsyncEngine, file_format: str
+    ) -> AsyncIterator[bytes]:
+        if file_format == "csv":
+            yield encode_user_rows([EXPORT_COLUMNS], file_format)  # type: ignore
+
+        async with engine.connect() as connection:
+            result = await connection.stream(
+                self._export_statement().execution_options(
+                    yield_per=USER_EXPORT_BATCH_SIZE
+                )
+            )
+
+            async for rows in result.partitions():
+                yield encode_user_rows(rows, file_format)
+
+    def _export_statement(self):
+        return select(User.id, User.name, User.email).order_by(col(User.id))
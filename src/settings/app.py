@@ -1,14 +1,50 @@
-from src.utils.environment import get_env_variable
+import os
+
+from src.utils.environment import get_bool_env_variable, get_env_variable
 
 # JWTシークレットキー
 JWT_SECRET_KEY = get_env_variable("JWT_SECRET_KEY")
 
-# JWTトークンの署名に使用するアルゴリズム
-ALGORITHM = "HS256"
+# JWTトークンの署名に使用するアルゴリズム(HS256 | ES256 | EdDSA など)
+JWT_ALGORITHM = get_env_variable("JWT_ALGORITHM", "HS256")
+
+# JWTトークンの生成・検証に使用するライブラリ(jose | pyjwt | hmac)
+# hmacはHS*専用、EdDSAはpyjwtのみ対応
+JWT_BACKEND = get_env_variable("JWT_BACKEND", "jose")
+
+# 署名に使用する鍵のID(トークンのヘッダーのkidに設定する、空の場合は設定しない)
+JWT_KEY_ID = get_env_variable("JWT_KEY_ID", "")
+
+# ES256・EdDSAの署名に使用する秘密鍵(PEM)のパス
+JWT_PRIVATE_KEY_FILE = get_env_variable("JWT_PRIVATE_KEY_FILE", "")
+
+# 鍵のローテーション中に検証を受け付ける以前の公開鍵("kid=パス"のカンマ区切り)
+JWT_PUBLIC_KEY_FILES = get_env_variable("JWT_PUBLIC_KEY_FILES", "")
 
 # トークンの有効期限
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# 検証済みのアクセストークンをキャッシュする件数(0の場合はキャッシュしない)
+TOKEN_CACHE_MAX_SIZE = int(get_env_variable("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+# 検証済みのアクセストークンをキャッシュする最大秒数(トークンの有効期限を超えない)
+TOKEN_CACHE_TTL = int(get_env_variable("TOKEN_CACHE_TTL", "300"))
+
+# 不正なアクセストークンをキャッシュする件数と秒数(同じトークンの再送を検証せずに拒否する)
+TOKEN_NEGATIVE_CACHE_MAX_SIZE = int(
+    get_env_variable("TOKEN_NEGATIVE_CACHE_MAX_SIZE", "10000")
+)
+TOKEN_NEGATIVE_CACHE_TTL = int(get_env_variable("TOKEN_NEGATIVE_CACHE_TTL", "30"))
+
+# ユーザー情報をキャッシュする秒数(0の場合はキャッシュしない)
+# 更新・削除時に削除するが、CACHE_BACKEND=memoryの場合は他のワーカープロセスに古い値が残る
+USER_CACHE_TTL = int(get_env_variable("USER_CACHE_TTL", "30"))
+
+# ユーザー詳細・一覧のシリアライズ済みのJSONをキャッシュする合計バイト数
+USER_RESPONSE_CACHE_MAX_BYTES = int(
+    get_env_variable("USER_RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+)
+
 # Google認証URL
 GOOGLE_AUTHORIZATION_URL = get_env_variable("GOOGLE_AUTHORIZATION_URL")
 
@@ -26,3 +62,84 @@ GOOGLE_TOKEN_URL = get_env_variable("GOOGLE_TOKEN_URL")
 
 # Googleユーザー情報URL
 GOOGLE_USER_INFO_URL = get_env_variable("GOOGLE_USER_INFO_URL")
+
+# GoogleのOpenID ConnectのディスカバリードキュメントのURL(JWKSのURLと発行者を取得する)
+GOOGLE_DISCOVERY_URL = get_env_variable(
+    "GOOGLE_DISCOVERY_URL",
+    "https://accounts.google.com/.well-known/openid-configuration",
+)
+
+# Cache-Controlが無い場合にディスカバリードキュメントとJWKSをキャッシュする秒数
+GOOGLE_JWKS_DEFAULT_TTL = int(get_env_variable("GOOGLE_JWKS_DEFAULT_TTL", "3600"))
+
+# 未知のkidでJWKSを再取得する最短間隔の秒数(不正なkidによる再取得の連発を防ぐ)
+GOOGLE_JWKS_MIN_REFRESH_INTERVAL = int(
+    get_env_variable("GOOGLE_JWKS_MIN_REFRESH_INTERVAL", "60")
+)
+
+# id_tokenを検証できない場合にユーザー情報APIから取得するか
+GOOGLE_USER_INFO_FALLBACK = get_bool_env_variable("GOOGLE_USER_INFO_FALLBACK", True)
+
+# パスワードハッシュ化に使用するワーカープールの種類(thread | process)
+HASH_POOL_TYPE = get_env_variable("HASH_POOL_TYPE", "thread")
+
+# パスワードハッシュ化のワーカー数(空の場合はCPUコア数)
+HASH_POOL_MAX_WORKERS = int(
+    get_env_variable("HASH_POOL_MAX_WORKERS", "") or os.cpu_count() or 1
+)
+
+# ワーカーが全て使用中の場合に待機できるハッシュ化処理の最大数(超えた場合は503を返す)
+HASH_POOL_MAX_QUEUE = int(get_env_variable("HASH_POOL_MAX_QUEUE", "64"))
+
+# リクエスト・レスポンスのログを記録するか(ベンチマークでミドルウェアの有無を比較する場合にfalseにする)
+LOG_MIDDLEWARE_ENABLED = get_bool_env_variable("LOG_MIDDLEWARE_ENABLED", True)
+
+# ログに記録するリクエスト・レスポンスボディの最大バイト数
+LOG_MAX_BODY_BYTES = int(get_env_variable("LOG_MAX_BODY_BYTES", "4096"))
+
+# ルートごとのログのサンプリング率("GET /api/users=0.01,GET /api/users/{user_id}=0.1")
+# ステータスコードが400以上のリクエストはサンプリング率に関わらず全て記録する
+LOG_SAMPLE_RATES = get_env_variable("LOG_SAMPLE_RATES", "")
+
+# LOG_SAMPLE_RATESに指定がないルートのサンプリング率
+LOG_SAMPLE_RATE_DEFAULT = float(get_env_variable("LOG_SAMPLE_RATE_DEFAULT", "1.0"))
+
+# 処理時間の内訳(auth・db・hash・http・serialize)をServer-Timingヘッダーに出力するか
+SERVER_TIMING_ENABLED = get_bool_env_variable("SERVER_TIMING_ENABLED", True)
+
+# X-Profileヘッダーにこの値を指定したリクエストをプロファイリングする(空の場合は無効)
+PROFILING_TOKEN = get_env_variable("PROFILING_TOKEN", "")
+
+# /metricsの取得に必要なBearerトークン(空の場合は/metricsを公開しない)
+METRICS_TOKEN = get_env_variable("METRICS_TOKEN", "")
+
+# プロファイルの保存先
+PROFILING_DIR = get_env_variable("PROFILING_DIR", "src/logs/profiles")
+
+# ユーザーエクスポートでDBから一度に取得する行数
+USER_EXPORT_BATCH_SIZE = int(get_env_variable("USER_EXPORT_BATCH_SIZE", "5000"))
+
+# 一括登録・更新・削除APIで1リクエストに指定できる最大件数
+USER_BULK_MAX_ITEMS = int(get_env_variable("USER_BULK_MAX_ITEMS", "10000"))
+
+# 一括登録・更新・削除APIで1回のコミットにまとめる件数
+USER_BULK_CHUNK_SIZE = int(get_env_variable("USER_BULK_CHUNK_SIZE", "1000"))
+
+# 外部APIのHTTPクライアントの最大コネクション数
+HTTP_MAX_CONNECTIONS = int(get_env_variable("HTTP_MAX_CONNECTIONS", "100"))
+
+# 外部APIのHTTPクライアントが保持するキープアライブのコネクション数
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(
+    get_env_variable("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+)
+
+# キープアライブのコネクションを保持する秒数
+HTTP_KEEPALIVE_EXPIRY = float(get_env_variable("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# 外部APIの接続タイムアウトと全体のタイムアウトの秒数
+HTTP_CONNECT_TIMEOUT = float(get_env_variable("HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_TIMEOUT = float(get_env_variable("HTTP_TIMEOUT", "10"))
+
+# 外部APIの一時的なエラーのリトライ回数とバックオフの基準秒数
+HTTP_RETRIES = int(get_env_variable("HTTP_RETRIES", "2"))
+HTTP_RETRY_BACKOFF = float(get_env_variable("HTTP_RETRY_BACKOFF", "0.2"))
@@ -0,0 +1,41 @@
+from src.cache.backend import CacheBackend
+from src.cache.cache import Cache
+from src.cache.memory import MemoryCacheBackend
+from src.cache.redis import RedisCacheBackend
+from src.utils.environment import get_env_variable
+
+# キャッシュの保存先(memory | redis)
+# memoryはワーカープロセスごと、redisはワーカープロセス・サーバー間で共有する
+CACHE_BACKEND = get_env_variable("CACHE_BACKEND", "memory")
+
+# CACHE_BACKEND=redisの場合の接続URLとキーの接頭辞
+CACHE_REDIS_URL = get_env_variable("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_KEY_PREFIX = get_env_variable("CACHE_KEY_PREFIX", "fastapi-tutorial:")
+
+# CACHE_BACKEND=redisの場合のプロセスごとの最大接続数と空き接続を待機する秒数
+CACHE_REDIS_MAX_CONNECTIONS = int(get_env_variable("CACHE_REDIS_MAX_CONNECTIONS", "50"))
+CACHE_REDIS_POOL_TIMEOUT = float(get_env_variable("CACHE_REDIS_POOL_TIMEOUT", "5"))
+
+# CACHE_BACKEND=memoryの場合に保持する件数
+CACHE_MAX_SIZE = int(get_env_variable("CACHE_MAX_SIZE", "10000"))
+
+# 有効期限を最大で何割短くするか(同時に作成したエントリが同時に期限切れにならないようにする)
+CACHE_TTL_JITTER = float(get_env_variable("CACHE_TTL_JITTER", "0.1"))
+
+# 有効期限の何割を過ぎたらバックグラウンドで再読み込みするか
+CACHE_SOFT_TTL_RATIO = float(get_env_variable("CACHE_SOFT_TTL_RATIO", "0.8"))
+
+
+def create_cache_backend() -> CacheBackend:
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(
+            CACHE_REDIS_URL,
+            CACHE_KEY_PREFIX,
+            CACHE_REDIS_MAX_CONNECTIONS,
+            CACHE_REDIS_POOL_TIMEOUT,
+        )
+
+    return MemoryCacheBackend(CACHE_MAX_SIZE)
+
+
+cache = Cache(create_cache_backend(), CACHE_TTL_JITTER, CACHE_SOFT_TTL_RATIO)
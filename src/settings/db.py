@@ -1,8 +1,23 @@
+from typing import Any
 from urllib.parse import quote_plus
 
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.utils.environment import get_env_variable
+from src.database.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    get_pool_stats,
+)
+from src.database.query_stats import register_query_listeners
+from src.database.replica import ReplicaRouter
+from src.utils.environment import get_bool_env_variable, get_env_variable
 
 DB_USERNAME = get_env_variable("DB_USERNAME")
 DB_PASSWORD = get_env_variable("DB_PASSWORD")
@@ -10,12 +25,108 @@ DB_HOST = get_env_variable("DB_HOST")
 DB_PORT = get_env_variable("DB_PORT")
 DB_DATABASE = get_env_variable("DB_DATABASE")
 
+# Trueの場合はasyncpgを使用した非同期エンジンでDBにアクセスする
+DB_ASYNC = get_bool_env_variable("DB_ASYNC", False)
+
+# 実行したSQLをログに出力するか
+DB_ECHO = get_bool_env_variable("DB_ECHO", False)
+
+# コネクションプールに常時保持するコネクション数(ワーカーごと)
+DB_POOL_SIZE = int(get_env_variable("DB_POOL_SIZE", "5"))
+
+# DB_POOL_SIZEを超えて一時的に作成できるコネクション数
+DB_MAX_OVERFLOW = int(get_env_variable("DB_MAX_OVERFLOW", "10"))
+
+# コネクションが空くまで待機する秒数(超えるとTimeoutErrorになる)
+DB_POOL_TIMEOUT = float(get_env_variable("DB_POOL_TIMEOUT", "30"))
+
+# コネクションを再作成するまでの秒数(-1の場合は再作成しない)
+DB_POOL_RECYCLE = int(get_env_variable("DB_POOL_RECYCLE", "1800"))
+
+# コネクション取得時に疎通確認を行うか
+DB_POOL_PRE_PING = get_bool_env_variable("DB_POOL_PRE_PING", True)
+
+# リードレプリカの接続URL(カンマ区切りで複数指定可能、未設定の場合はプライマリのみ使用)
+DB_REPLICA_URLS = [
+    url.strip()
+    for url in get_env_variable("DB_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+
+# クエリに失敗したレプリカを振り分け対象から外す秒数
+DB_REPLICA_RETRY_SECONDS = float(get_env_variable("DB_REPLICA_RETRY_SECONDS", "30"))
+
+# リクエストごとのSQLの件数と時間を集計するか(X-DB-Queries・Server-Timingヘッダーに出力する)
+DB_QUERY_STATS_ENABLED = get_bool_env_variable("DB_QUERY_STATS_ENABLED", True)
+
+# 1リクエストのSQLの件数がこの値を超えた場合に警告ログを出力する
+DB_QUERY_WARNING_THRESHOLD = int(get_env_variable("DB_QUERY_WARNING_THRESHOLD", "20"))
+
+# 1リクエストで同じ形のSQLをこの回数以上実行した場合に警告ログを出力する(N+1の検出)
+DB_REPEATED_QUERY_THRESHOLD = int(get_env_variable("DB_REPEATED_QUERY_THRESHOLD", "5"))
+
 DATABASE_URL = (
     f"postgresql://{quote_plus(DB_USERNAME)}:{quote_plus(DB_PASSWORD)}"
     f"@{DB_HOST}:{DB_PORT}/{DB_DATABASE}"
 )
 
-engine = create_engine(DATABASE_URL, echo=True)
+
+def to_async_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+POOL_OPTIONS: dict[str, Any] = {
+    "echo": DB_ECHO,
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+if DB_QUERY_STATS_ENABLED:
+    register_query_listeners()
+
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
+
+# 非同期モードの場合のみ非同期エンジンを作成する
+async_engine = (
+    create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **POOL_OPTIONS,
+    )
+    if DB_ASYNC
+    else None
+)
+
+# リードレプリカのエンジン(非同期モードの場合は非同期エンジン)
+replica_router: ReplicaRouter = ReplicaRouter(
+    [
+        create_engine(url, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
+        for url in ([] if DB_ASYNC else DB_REPLICA_URLS)
+    ],
+    DB_REPLICA_RETRY_SECONDS,
+)
+async_replica_router: ReplicaRouter = ReplicaRouter(
+    [
+        create_async_engine(
+            to_async_url(url),
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            **POOL_OPTIONS,
+        )
+        for url in (DB_REPLICA_URLS if DB_ASYNC else [])
+    ],
+    DB_REPLICA_RETRY_SECONDS,
+)
+
+async_session_maker = (
+    async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    if async_engine
+    else None
+)
 
 
 def get_session():
@@ -28,3 +139,108 @@ def get_session():
         raise
     finally:
         session.close()
+
+
+async def get_async_session():
+    if async_session_maker is None:
+        raise RuntimeError("Async database engine is disabled. Set DB_ASYNC=true.")
+
+    async with async_session_maker() as session:
+        try:
+            yield session
+        except Exception:
+            # ログは例外発生箇所で出力する
+            await session.rollback()
+            raise
+
+
+def get_read_session():
+    replica_engine = replica_router.choose()
+
+    # 使用できるレプリカがない場合はNoneを返し、プライマリのセッションを使用させる
+    if replica_engine is None:
+        yield None
+        return
+
+    session = Session(replica_engine)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+async def get_async_read_session():
+    replica_engine = async_replica_router.choose()
+
+    # 使用できるレプリカがない場合はNoneを返し、プライマリのセッションを使用させる
+    if replica_engine is None:
+        yield None
+        return
+
+    async with AsyncSession(replica_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def get_primary_engine() -> Engine | AsyncEngine:
+    """
+    プライマリのエンジンを返す
+
+    Returns:
+        Engine | AsyncEngine: 非同期モードの場合は非同期エンジン
+    """
+
+    return async_engine if async_engine is not None else engine
+
+
+def get_read_engine() -> Engine | AsyncEngine:
+    """
+    読み取り専用の処理に使用するエンジンを返す
+
+    Returns:
+        Engine | AsyncEngine: レプリカのエンジン | 使用できるレプリカがない場合はプライマリ
+    """
+
+    if async_engine is not None:
+        return async_replica_router.choose() or async_engine
+
+    return replica_router.choose() or engine
+
+
+def mark_replica_unhealthy(bind: object) -> None:
+    """
+    クエリに失敗したレプリカを一定時間振り分け対象から外す
+
+    Args:
+        bind (object): セッションにバインドされているエンジン
+    """
+
+    replica_router.mark_unhealthy(bind)
+    async_replica_router.mark_unhealthy(bind)
+
+
+# サービスが使用するセッションの依存関係(DB_ASYNCで切り替える)
+session_dependency = get_async_session if DB_ASYNC else get_session
+read_session_dependency = get_async_read_session if DB_ASYNC else get_read_session
+
+
+def get_all_pool_stats() -> dict[str, dict[str, int | float]]:
+    """
+    全てのエンジンのコネクションプールの状態を返す
+
+    Returns:
+        dict[str, dict[str, int | float]]: エンジン名ごとのプールの状態
+    """
+
+    stats = {"primary": get_pool_stats(engine)}
+
+    if async_engine is not None:
+        stats["primary_async"] = get_pool_stats(async_engine)
+
+    for router in (replica_router, async_replica_router):
+        for index, replica_engine in enumerate(router.engines):
+            stats[f"replica_{index}"] = {
+                **get_pool_stats(replica_engine),
+                "healthy": int(router.is_healthy(replica_engine)),
+            }
+
+    return stats
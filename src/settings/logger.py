@@ -1,8 +1,15 @@
+import atexit
 import logging
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+import orjson
+
+from src.utils.environment import get_env_variable
 
 
 class CustomTimedRotatingFileHandler(TimedRotatingFileHandler):
@@ -52,17 +59,99 @@ class MaxLevelFilter(logging.Filter):
         return record.levelno <= self.max_level
 
 
+class TextFormatter(logging.Formatter):
+    """
+    extra={"fields": {...}}で渡された構造化フィールドをメッセージの後ろに付与するフォーマッタ
+    フィールドの文字列化はハンドラーが実際に出力する時(QueueListenerのスレッド)に行う
+    """
+
+    def format(self, record):
+        fields = getattr(record, "fields", None)
+
+        if fields is not None:
+            record = logging.makeLogRecord(record.__dict__)
+            record.msg = f"{record.getMessage()}: {fields}"
+            record.args = None
+
+        return super().format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    ログレコードを1行のJSONに変換するフォーマッタ
+    extra={"fields": {...}}で渡された構造化フィールドはトップレベルに展開する
+    """
+
+    def format(self, record):
+        log = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "pathname": record.pathname,
+            "lineno": record.lineno,
+        }
+
+        fields = getattr(record, "fields", None)
+        if fields is not None:
+            log.update(fields)
+
+        if record.exc_info:
+            log["exc_info"] = self.formatException(record.exc_info)
+
+        return orjson.dumps(log, default=str).decode("utf-8")
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    ログレコードを上限付きキューに積むハンドラー
+    キューが満杯の場合はblock=Trueなら空くまで待機し、Falseなら破棄して件数を数える
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool):
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped_count = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record):
+        if self.block:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped_count += 1
+
+
 log_dir = "src/logs"
 
-logger = logging.getLogger("uvicorn")
+# ログキューの最大件数
+LOG_QUEUE_SIZE = int(get_env_variable("LOG_QUEUE_SIZE", "10000"))
+
+# ログキューが満杯の場合の動作(drop: 破棄する | block: 空くまで待機する)
+LOG_QUEUE_POLICY = get_env_variable("LOG_QUEUE_POLICY", "drop")
+
+# ログの出力形式(text | json)
+LOG_FORMAT = get_env_variable("LOG_FORMAT", "text")
+
+# アプリケーションのロガー
+# uvicornのロガーはuvicornが自身のStreamHandlerを設定するため使用しない(同じログが同期的に2回出力される)
+logger = logging.getLogger("app")
 
 logger.setLevel(logging.INFO)
+logger.propagate = False
 
 # フォーマッタの設定
-formatter = logging.Formatter(
-    fmt="%(asctime)s - %(levelname)s - %(message)s in %(pathname)s:%(lineno)d",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+formatter: logging.Formatter
+if LOG_FORMAT == "json":
+    formatter = JsonFormatter(datefmt="%Y-%m-%d %H:%M:%S")
+else:
+    formatter = TextFormatter(
+        fmt="%(asctime)s - %(levelname)s - %(message)s in %(pathname)s:%(lineno)d",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
 
 # ストリームハンドラーの設定
 stream_handler = logging.StreamHandler(sys.stdout)
@@ -85,7 +174,60 @@ error_handler.setLevel(logging.WARNING)
 # app_handlerにフィルタを追加してWARNINGレベル未満のログのみを記録
 app_handler.addFilter(MaxLevelFilter(logging.INFO))
 
+# 出力処理はバックグラウンドスレッドのQueueListenerが担当し、
+# リクエストを処理するスレッドではキューに積むだけにする
+log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+queue_handler = BoundedQueueHandler(log_queue, block=LOG_QUEUE_POLICY == "block")
+
+queue_listener = QueueListener(
+    log_queue,
+    stream_handler,
+    app_handler,
+    error_handler,
+    respect_handler_level=True,
+)
+queue_listener.start()
+
+# プロセス終了時にキューに残っているログを書き出す
+atexit.register(queue_listener.stop)
+
 # ハンドラーをロガーに追加
-logger.addHandler(stream_handler)
-logger.addHandler(app_handler)
-logger.addHandler(error_handler)
+logger.addHandler(queue_handler)
+
+
+def configure_server_logger(name: str = "uvicorn") -> None:
+    """
+    サーバーのロガーの出力先をキューに置き換える
+    サーバーが設定したハンドラーを削除し、起動・エラーのログもバックグラウンドスレッドで出力する
+    (アクセスログは別のロガーのため対象外)
+
+    Args:
+        name (str): サーバーのロガー名
+    """
+
+    server_logger = logging.getLogger(name)
+
+    for handler in server_logger.handlers[:]:
+        server_logger.removeHandler(handler)
+
+    server_logger.addHandler(queue_handler)
+    server_logger.propagate = False
+
+
+# uvicornはアプリケーションを読み込む前にロギングを設定するため、読み込み時に置き換える
+configure_server_logger()
+
+
+def get_log_stats() -> dict[str, int]:
+    """
+    ログキューの状態を返す
+
+    Returns:
+        dict[str, int]: キューに溜まっている件数と破棄した件数
+    """
+
+    return {
+        "queue_size": log_queue.qsize(),
+        "queue_max_size": LOG_QUEUE_SIZE,
+        "dropped": queue_handler.dropped_count,
+    }
@@ -0,0 +1,68 @@
+import base64
+import binascii
+from datetime import datetime
+
+import orjson
+
+from src.exceptions.bad_request_exception import BadRequestException
+
+
+class CursorUtil:
+    @classmethod
+    def encode(cls, sort: str, sort_value: int | datetime, last_id: int) -> str:
+        """
+        キーセットページネーション用のカーソルを生成するメソッド
+
+        Args:
+            sort (str): ソートキー
+            sort_value (int | datetime): 最後の行のソートキーの値
+            last_id (int): 最後の行のID
+
+        Returns:
+            str: URLセーフなBase64でエンコードしたカーソル
+        """
+
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+
+        payload = orjson.dumps({"s": sort, "v": sort_value, "id": last_id})
+
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str, sort: str) -> tuple[int | datetime, int]:
+        """
+        カーソルをデコードするメソッド
+
+        Args:
+            cursor (str): カーソル
+            sort (str): リクエストのソートキー
+
+        Returns:
+            tuple[int | datetime, int]: 最後の行のソートキーの値とID
+
+        Raises:
+            BadRequestException: カーソルが不正な場合、またはソートキーが一致しない場合
+        """
+
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            payload = orjson.loads(base64.urlsafe_b64decode(cursor + padding))
+
+            if payload["s"] != sort:
+                raise BadRequestException(message="Cursor does not match sort")
+
+            if sort == "created_at":
+                return datetime.fromisoformat(payload["v"]), int(payload["id"])
+
+            return int(payload["v"]), int(payload["id"])
+        except BadRequestException:
+            raise
+        except (
+            binascii.Error,
+            orjson.JSONDecodeError,
+            KeyError,
+            TypeError,
+            ValueError,
+        ):
+            raise BadRequestException(message="Invalid cursor")
@@ -3,25 +3,43 @@ import os
 from dotenv import load_dotenv
 
 
-def get_env_variable(name: str) -> str:
+def get_env_variable(name: str, default: str | None = None) -> str:
     """
     環境変数を取得する
 
     Args:
         name (str): 環境変数名
+        default (str | None): 環境変数が設定されていない場合のデフォルト値
 
     Returns:
         str: 環境変数の値
 
     Raises:
-        EnvironmentError: 環境変数が設定されていない場合に発生する例外
+        EnvironmentError: 環境変数が設定されておらずデフォルト値もない場合に発生する例外
     """
     load_dotenv()
 
-    value = os.environ.get(name)
+    value = os.environ.get(name, default)
 
     if value is None:
         error_message = f"Environment variable {name} not set."
         raise EnvironmentError(error_message)
 
     return value
+
+
+def get_bool_env_variable(name: str, default: bool = False) -> bool:
+    """
+    真偽値の環境変数を取得する
+
+    Args:
+        name (str): 環境変数名
+        default (bool): 環境変数が設定されていない場合のデフォルト値
+
+    Returns:
+        bool: "true", "1", "yes", "on"のいずれかであればTrue
+    """
+
+    value = get_env_variable(name, str(default))
+
+    return value.strip().lower() in ("true", "1", "yes", "on")
@@ -0,0 +1,51 @@
+import hashlib
+from datetime import datetime
+
+
+class EtagUtil:
+    @classmethod
+    def make(cls, *parts: object) -> str:
+        """
+        値から強いETagを生成するメソッド
+
+        Args:
+            *parts (object): ETagの元にする値(datetimeはISO形式にする)
+
+        Returns:
+            str: ダブルクォートで囲んだETag
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+
+        for part in parts:
+            if isinstance(part, datetime):
+                part = part.isoformat()
+            digest.update(str(part).encode())
+            digest.update(b"\x1f")
+
+        return f'"{digest.hexdigest()}"'
+
+    @classmethod
+    def matches(cls, if_none_match: str | None, etag: str) -> bool:
+        """
+        If-None-MatchヘッダーがETagと一致するかを判定するメソッド
+
+        Args:
+            if_none_match (str | None): If-None-Matchヘッダーの値
+            etag (str): 現在のETag
+
+        Returns:
+            bool: 一致する場合はTrue(304を返す)
+        """
+
+        if not if_none_match:
+            return False
+
+        if if_none_match.strip() == "*":
+            return True
+
+        # If-None-Matchは弱い比較を行うため、W/を取り除いて比較する
+        return any(
+            candidate.strip().removeprefix("W/") == etag
+            for candidate in if_none_match.split(",")
+        )
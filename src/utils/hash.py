@@ -1,5 +1,23 @@
+import asyncio
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, TypeVar
+
 from passlib.context import CryptContext
 
+from src.exceptions.service_unavailable_exception import (
+    ServiceUnavailableException,
+)
+from src.settings.app import HASH_POOL_MAX_QUEUE, HASH_POOL_MAX_WORKERS, HASH_POOL_TYPE
+from src.utils.server_timing import measure_timing
+
+T = TypeVar("T")
+
 
 class HashUtil:
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -32,3 +50,195 @@ class HashUtil:
         """
 
         return cls.pwd_context.verify(plain_password, hashed_password)
+
+    @classmethod
+    async def get_password_hash_async(cls, plain_password: str) -> str:
+        """
+        パスワードのハッシュ化をワーカープールで行うメソッド
+
+        Args:
+            plain_password (str): 平文パスワード
+
+        Returns:
+            str: ハッシュ化されたパスワード
+
+        Raises:
+            ServiceUnavailableException: ワーカープールが飽和している場合
+        """
+
+        # ワーカーの待機時間を含めて計測する
+        with measure_timing("hash"):
+            return await hash_pool.submit(_get_password_hash, plain_password)
+
+    @classmethod
+    async def verify_password_async(
+        cls, plain_password: str, hashed_password: str
+    ) -> bool:
+        """
+        パスワードの検証をワーカープールで行うメソッド
+
+        Args:
+            plain_password (str): 平文パスワード
+            hashed_password (str): ハッシュ化されたパスワード
+
+        Returns:
+            bool: パスワードが一致するかどうか
+
+        Raises:
+            ServiceUnavailableException: ワーカープールが飽和している場合
+        """
+
+        with measure_timing("hash"):
+            return await hash_pool.submit(
+                _verify_password, plain_password, hashed_password
+            )
+
+
+# プロセスプールに渡すためモジュールレベルの関数として定義する
+def _get_password_hash(plain_password: str) -> str:
+    return HashUtil.get_password_hash(plain_password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return HashUtil.verify_password(plain_password, hashed_password)
+
+
+class HashPool:
+    """
+    bcryptをイベントループの外で実行するワーカープール
+
+    実行中と待機中の処理数の合計が max_workers + max_queue に達した場合は
+    ServiceUnavailableExceptionを送出して呼び出し元に503を返させる
+    枠は呼び出し元ではなくワーカーの処理が終わった時点で解放するため、
+    クライアントの切断で待機がキャンセルされても実際の同時実行数は上限を超えない
+    カウンタはイベントループのスレッドからのみ更新するためロックは不要
+    """
+
+    def __init__(self, pool_type: str, max_workers: int, max_queue: int):
+        if pool_type not in ("thread", "process"):
+            raise ValueError(f"Unsupported hash pool type: {pool_type}")
+
+        self.pool_type = pool_type
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        """ワーカーの空きを待っている処理数"""
+
+        return max(0, self.in_flight - self.max_workers)
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                # bcryptはGILを解放するためスレッドプールでも複数コアを使用できる
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="hash"
+                )
+
+        return self._executor
+
+    async def submit(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        処理をワーカープールで実行する
+
+        Args:
+            fn (Callable[..., T]): 実行する関数
+            *args (Any): 関数の引数
+
+        Returns:
+            T: 関数の戻り値
+
+        Raises:
+            ServiceUnavailableException: ワーカープールが飽和している場合
+        """
+
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise ServiceUnavailableException()
+
+        loop = asyncio.get_running_loop()
+        future = self.executor.submit(fn, *args)
+        self.in_flight += 1
+        start_time = time.perf_counter()
+
+        def on_done(done_future: Future) -> None:
+            # ワーカー側のスレッドで呼ばれるためイベントループに処理を渡す
+            elapsed = time.perf_counter() - start_time
+            try:
+                loop.call_soon_threadsafe(self._release, done_future, elapsed)
+            except RuntimeError:
+                # シャットダウンでイベントループが閉じられている場合
+                pass
+
+        future.add_done_callback(on_done)
+
+        # 待機がキャンセルされても、実行中の処理はon_doneで枠を解放するまで残る
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release(self, future: Future, elapsed: float) -> None:
+        """
+        ワーカーの処理が終わった枠を解放し、成功した処理のみ処理時間を記録する
+
+        Args:
+            future (Future): 終了した処理
+            elapsed (float): 投入から終了までの秒数
+        """
+
+        self.in_flight -= 1
+
+        if future.cancelled():
+            return
+
+        if future.exception() is not None:
+            self.failed += 1
+            return
+
+        self.completed += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        ワーカープールのメトリクスを返す
+
+        Returns:
+            dict[str, int | float]: キュー長・処理件数・成功した処理の処理時間(待機時間を含む)
+        """
+
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "avg_seconds": (
+                self.total_seconds / self.completed if self.completed else 0.0
+            ),
+            "max_seconds": self.max_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = HashPool(HASH_POOL_TYPE, HASH_POOL_MAX_WORKERS, HASH_POOL_MAX_QUEUE)
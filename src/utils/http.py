@@ -0,0 +1,130 @@
+import asyncio
+import random
+
+import httpx
+from fastapi import Request
+
+from src.settings.app import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_RETRIES,
+    HTTP_RETRY_BACKOFF,
+    HTTP_TIMEOUT,
+)
+from src.settings.logger import logger
+from src.utils.server_timing import measure_timing
+
+# リトライする一時的なエラーのステータスコード
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+
+class HttpUtil:
+    @classmethod
+    def create_client(
+        cls, transport: httpx.AsyncBaseTransport | None = None
+    ) -> httpx.AsyncClient:
+        """
+        アプリケーション全体で共有するHTTPクライアントを生成するメソッド
+        HTTP/2とキープアライブでコネクションを再利用する
+
+        Args:
+            transport (httpx.AsyncBaseTransport | None): テスト時にhttpx.MockTransportを渡す
+
+        Returns:
+            httpx.AsyncClient: HTTPクライアント
+        """
+
+        return httpx.AsyncClient(
+            http2=transport is None,
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        )
+
+    @classmethod
+    async def request_with_retry(
+        cls,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        一時的なエラーの場合に指数バックオフでリトライしてリクエストを送信するメソッド
+
+        冪等なリクエストは通信エラーと502/503/504でリトライし、
+        冪等でないリクエストはリクエストを送信できなかった接続エラーのみリトライする
+
+        Args:
+            client (httpx.AsyncClient): HTTPクライアント
+            method (str): HTTPメソッド
+            url (str): URL
+            idempotent (bool): リクエストが冪等かどうか
+            **kwargs: httpx.AsyncClient.requestの引数
+
+        Returns:
+            httpx.Response: レスポンス
+
+        Raises:
+            httpx.HTTPError: リトライ回数を超えても通信エラーになった場合
+        """
+
+        retryable_errors: tuple[type[httpx.HTTPError], ...] = (
+            (httpx.TransportError,)
+            if idempotent
+            else (httpx.ConnectError, httpx.ConnectTimeout)
+        )
+
+        for attempt in range(HTTP_RETRIES + 1):
+            is_last_attempt = attempt == HTTP_RETRIES
+
+            try:
+                # リトライを含め、試行ごとにServer-Timingのhttpに追加する
+                with measure_timing("http"):
+                    response = await client.request(method, url, **kwargs)
+            except retryable_errors as e:
+                if is_last_attempt:
+                    raise
+
+                logger.warning(f"HTTP request failed. Retrying. {method} {url} {e}")
+            else:
+                if (
+                    not idempotent
+                    or is_last_attempt
+                    or response.status_code not in RETRY_STATUS_CODES
+                ):
+                    return response
+
+                logger.warning(
+                    f"HTTP request failed. Retrying. {method} {url} "
+                    f"status_code: {response.status_code}"
+                )
+
+            # 指数バックオフ(同時にリトライが集中しないようにジッターを加える)
+            await asyncio.sleep(
+                HTTP_RETRY_BACKOFF * (2**attempt) * random.uniform(0.5, 1.5)
+            )
+
+        raise RuntimeError("Unreachable")
+
+    @classmethod
+    async def get_client(cls, request: Request) -> httpx.AsyncClient:
+        """
+        lifespanで生成した共有のHTTPクライアントを返す(Dependsで使用する)
+        スレッドプールで実行されないよう非同期関数にする
+
+        Args:
+            request (Request): リクエスト
+
+        Returns:
+            httpx.AsyncClient: HTTPクライアント
+        """
+
+        return request.app.state.http_client
@@ -0,0 +1,198 @@
+import asyncio
+import re
+import time
+from typing import Any
+
+import httpx
+
+from src.settings.app import (
+    GOOGLE_DISCOVERY_URL,
+    GOOGLE_JWKS_DEFAULT_TTL,
+    GOOGLE_JWKS_MIN_REFRESH_INTERVAL,
+)
+from src.utils.http import HttpUtil
+
+CACHE_CONTROL_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+def get_max_age(response: httpx.Response, default: int) -> int:
+    """
+    レスポンスのCache-Controlのmax-ageを返す
+
+    Args:
+        response (httpx.Response): レスポンス
+        default (int): max-ageが無い場合の秒数
+
+    Returns:
+        int: キャッシュする秒数(no-store・no-cacheの場合は0)
+    """
+
+    cache_control = response.headers.get("Cache-Control", "").lower()
+
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+
+    match = CACHE_CONTROL_MAX_AGE_PATTERN.search(cache_control)
+
+    return int(match.group(1)) if match else default
+
+
+def parse_json_object(response: httpx.Response, required: dict[str, type]) -> dict:
+    """
+    レスポンスのJSONオブジェクトを返す
+
+    不正なレスポンスを取得失敗と同様に扱えるよう、httpx.HTTPErrorのサブクラスを送出する
+
+    Args:
+        response (httpx.Response): レスポンス
+        required (dict[str, type]): 必須の項目と型
+
+    Returns:
+        dict: JSONオブジェクト
+
+    Raises:
+        httpx.DecodingError: JSONオブジェクトでない場合・必須の項目が無い場合
+    """
+
+    try:
+        data = response.json()
+    except ValueError as e:
+        raise httpx.DecodingError(
+            f"Invalid JSON response from {response.url}", request=response.request
+        ) from e
+
+    if not isinstance(data, dict):
+        raise httpx.DecodingError(
+            f"Unexpected JSON response from {response.url}", request=response.request
+        )
+
+    for key, value_type in required.items():
+        if not isinstance(data.get(key), value_type):
+            raise httpx.DecodingError(
+                f"Missing {key} in response from {response.url}",
+                request=response.request,
+            )
+
+    return data
+
+
+class JwksCache:
+    """
+    OpenID Connectのディスカバリードキュメントと公開鍵(JWKS)をメモリにキャッシュするクラス
+
+    キャッシュの有効期限はレスポンスのCache-Controlのmax-ageに従う
+    鍵のローテーションに対応するため、未知のkidの場合は有効期限内でもJWKSを再取得する
+    """
+
+    def __init__(self, discovery_url: str, default_ttl: int, min_refresh_interval: int):
+        self.discovery_url = discovery_url
+        self.default_ttl = default_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._lock = asyncio.Lock()
+        self._discovery: dict[str, Any] = {}
+        self._discovery_expires_at = 0.0
+        self._keys: dict[str, dict[str, Any]] = {}
+        self._keys_expires_at = 0.0
+        self._keys_fetched_at = float("-inf")
+
+    def set_keys(self, jwks: dict[str, Any], ttl: int) -> None:
+        """
+        JWKSをキャッシュに設定する(ローカルで生成した鍵を使用する場合にも使用する)
+
+        Args:
+            jwks (dict[str, Any]): JWKS({"keys": [...]})
+            ttl (int): キャッシュする秒数
+        """
+
+        now = time.monotonic()
+
+        self._keys = {
+            key["kid"]: key
+            for key in jwks.get("keys", [])
+            if isinstance(key, dict) and "kid" in key
+        }
+        self._keys_expires_at = now + ttl
+        self._keys_fetched_at = now
+
+    async def get_issuer(self, client: httpx.AsyncClient) -> str:
+        """
+        ディスカバリードキュメントの発行者(iss)を返す
+
+        Args:
+            client (httpx.AsyncClient): HTTPクライアント
+
+        Returns:
+            str: 発行者
+
+        Raises:
+            httpx.HTTPError: ディスカバリードキュメントの取得に失敗した場合・不正な場合
+        """
+
+        discovery = await self._get_discovery(client)
+
+        return discovery["issuer"]
+
+    async def get_key(
+        self, client: httpx.AsyncClient, kid: str
+    ) -> dict[str, Any] | None:
+        """
+        kidに対応する公開鍵を返す
+
+        Args:
+            client (httpx.AsyncClient): HTTPクライアント
+            kid (str): id_tokenのヘッダーのkid
+
+        Returns:
+            dict[str, Any] | None: 公開鍵(JWK) | 見つからない場合はNone
+
+        Raises:
+            httpx.HTTPError: JWKSの取得に失敗した場合・不正な場合
+        """
+
+        now = time.monotonic()
+
+        if now < self._keys_expires_at and kid in self._keys:
+            return self._keys[kid]
+
+        async with self._lock:
+            # 待機中に他のリクエストが再取得している場合はそれを使用する
+            now = time.monotonic()
+            is_expired = now >= self._keys_expires_at
+            can_refresh = now - self._keys_fetched_at >= self.min_refresh_interval
+
+            if is_expired or (kid not in self._keys and can_refresh):
+                await self._refresh_keys(client)
+
+        return self._keys.get(kid)
+
+    async def _get_discovery(self, client: httpx.AsyncClient) -> dict[str, Any]:
+        if time.monotonic() < self._discovery_expires_at:
+            return self._discovery
+
+        response = await HttpUtil.request_with_retry(client, "GET", self.discovery_url)
+        response.raise_for_status()
+
+        self._discovery = parse_json_object(response, {"issuer": str, "jwks_uri": str})
+        self._discovery_expires_at = time.monotonic() + get_max_age(
+            response, self.default_ttl
+        )
+
+        return self._discovery
+
+    async def _refresh_keys(self, client: httpx.AsyncClient) -> None:
+        discovery = await self._get_discovery(client)
+
+        response = await HttpUtil.request_with_retry(
+            client, "GET", discovery["jwks_uri"]
+        )
+        response.raise_for_status()
+
+        self.set_keys(
+            parse_json_object(response, {"keys": list}),
+            get_max_age(response, self.default_ttl),
+        )
+
+
+google_jwks_cache = JwksCache(
+    GOOGLE_DISCOVERY_URL, GOOGLE_JWKS_DEFAULT_TTL, GOOGLE_JWKS_MIN_REFRESH_INTERVAL
+)
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class ResponseCache:
+    """
+    シリアライズ済みのレスポンスボディを保持する、合計バイト数上限付きのLRUキャッシュ
+
+    上限を超えた場合は最も長く参照されていないエントリから削除する
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    def get(self, key: Hashable) -> bytes | None:
+        """
+        キャッシュからボディを取得する
+
+        Args:
+            key (Hashable): キー
+
+        Returns:
+            bytes | None: ボディ | 存在しない場合はNone
+        """
+
+        with self._lock:
+            body = self._entries.get(key)
+
+            if body is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return body
+
+    def set(self, key: Hashable, body: bytes) -> None:
+        """
+        キャッシュにボディを設定する(上限より大きいボディは設定しない)
+
+        Args:
+            key (Hashable): キー
+            body (bytes): ボディ
+        """
+
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous)
+
+            self._entries[key] = body
+            self.total_bytes += len(body)
+
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        条件に一致するキーのエントリを削除する
+
+        Args:
+            predicate (Callable[[Hashable], bool]): 削除するキーの場合にTrueを返す関数
+        """
+
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self.total_bytes -= len(self._entries.pop(key))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,102 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class ServerTiming:
+    """
+    1リクエストの処理時間の内訳(Server-Timingヘッダーに出力する)
+
+    同じ名前の処理は合計時間と回数を集計する
+    """
+
+    def __init__(self):
+        # 名前ごとの[合計秒数, 回数, 説明]
+        self.entries: dict[str, list] = {}
+
+    def add(self, name: str, seconds: float, description: str = "") -> None:
+        entry = self.entries.get(name)
+
+        if entry is None:
+            self.entries[name] = [seconds, 1, description]
+            return
+
+        entry[0] += seconds
+        entry[1] += 1
+        if description:
+            entry[2] = description
+
+    def to_header(self) -> str:
+        """
+        Server-Timingヘッダーの値を返す
+
+        Returns:
+            str: "名前;dur=ミリ秒;desc=説明"のカンマ区切り
+        """
+
+        return ", ".join(
+            format_server_timing(
+                name, seconds, description or (f"{count} calls" if count > 1 else "")
+            )
+            for name, (seconds, count, description) in self.entries.items()
+        )
+
+
+# 実行中のリクエストの処理時間の内訳(リクエスト外の場合はNone)
+server_timing_var: ContextVar[ServerTiming | None] = ContextVar(
+    "server_timing", default=None
+)
+
+
+def format_server_timing(name: str, seconds: float, description: str = "") -> str:
+    """
+    Server-Timingヘッダーの1項目を返す
+
+    Args:
+        name (str): 名前
+        seconds (float): 秒数
+        description (str): 説明
+
+    Returns:
+        str: Server-Timingヘッダーの項目(ミリ秒)
+    """
+
+    value = f"{name};dur={seconds * 1000:.1f}"
+
+    if description:
+        value += f';desc="{description}"'
+
+    return value
+
+
+def record_timing(name: str, seconds: float, description: str = "") -> None:
+    """
+    実行中のリクエストの処理時間の内訳に追加する(リクエスト外の場合は何もしない)
+
+    Args:
+        name (str): 名前(auth | db | hash | http | serialize など)
+        seconds (float): 秒数
+        description (str): 説明
+    """
+
+    server_timing = server_timing_var.get()
+
+    if server_timing is not None:
+        server_timing.add(name, seconds, description)
+
+
+@contextmanager
+def measure_timing(name: str) -> Iterator[None]:
+    """
+    withブロックの処理時間を実行中のリクエストの処理時間の内訳に追加する
+
+    Args:
+        name (str): 名前
+    """
+
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start_time)
@@ -0,0 +1,372 @@
+import base64
+import hashlib
+import hmac
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any
+
+import jwt as pyjwt
+import orjson
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from jose import JWTError
+from jose import jwt as jose_jwt
+
+from src.settings.app import (
+    JWT_ALGORITHM,
+    JWT_BACKEND,
+    JWT_KEY_ID,
+    JWT_PRIVATE_KEY_FILE,
+    JWT_PUBLIC_KEY_FILES,
+    JWT_SECRET_KEY,
+)
+
+HMAC_ALGORITHMS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+class InvalidTokenError(Exception):
+    """トークンの署名・形式・有効期限が不正な場合の例外"""
+
+
+class TokenKeySet:
+    """
+    トークンの署名鍵と検証鍵
+
+    署名には現在の鍵(kid)を使用し、検証ではヘッダーのkidに対応する鍵を使用する
+    鍵のローテーション中は以前の鍵も検証鍵に含めておく
+
+    HS*の場合は共通鍵(bytes)、ES256・EdDSAの場合はcryptographyの鍵オブジェクトを使用する
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        signing_key: Any,
+        verification_keys: dict[str, Any],
+        kid: str | None = None,
+    ):
+        self.algorithm = algorithm
+        self.signing_key = signing_key
+        self.verification_keys = verification_keys
+        self.kid = kid
+
+    def get_verification_key(self, kid: str | None) -> Any:
+        """
+        kidに対応する検証鍵を返す
+
+        Args:
+            kid (str | None): トークンのヘッダーのkid
+
+        Returns:
+            Any: 検証鍵
+
+        Raises:
+            InvalidTokenError: kidが文字列でない場合・kidに対応する鍵が無い場合
+        """
+
+        if kid is None:
+            kid = self.kid
+        elif not isinstance(kid, str):
+            # ヘッダーは改ざんできるため、辞書のキーに使えない値は不正なトークンとして扱う
+            raise InvalidTokenError("Invalid kid")
+
+        key = self.verification_keys.get(kid or "")
+
+        if key is None:
+            raise InvalidTokenError(f"Unknown kid: {kid}")
+
+        return key
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"kid": self.kid} if self.kid else {}
+
+
+def to_timestamp_claims(claims: dict[str, Any]) -> dict[str, Any]:
+    """
+    datetimeのクレーム(exp・iat・nbf)をUNIX時間に変換する
+
+    Args:
+        claims (dict[str, Any]): クレーム
+
+    Returns:
+        dict[str, Any]: 変換したクレーム
+    """
+
+    return {
+        key: int(value.timestamp()) if isinstance(value, datetime) else value
+        for key, value in claims.items()
+    }
+
+
+class TokenCodec(ABC):
+    """
+    トークンの生成と検証を行うクラスの基底クラス
+    バックエンドのライブラリの違いを吸収し、例外はInvalidTokenErrorに統一する
+    """
+
+    name: str
+
+    def __init__(self, key_set: TokenKeySet):
+        self.key_set = key_set
+
+    @abstractmethod
+    def encode(self, claims: dict[str, Any]) -> str:
+        """
+        クレームに署名してトークンを生成する
+
+        Args:
+            claims (dict[str, Any]): クレーム
+
+        Returns:
+            str: トークン
+        """
+
+    @abstractmethod
+    def decode(self, token: str) -> dict[str, Any]:
+        """
+        トークンの署名と有効期限を検証してクレームを返す
+
+        Args:
+            token (str): トークン
+
+        Returns:
+            dict[str, Any]: クレーム
+
+        Raises:
+            InvalidTokenError: トークンが不正な場合
+        """
+
+
+class JoseTokenCodec(TokenCodec):
+    """python-joseを使用するバックエンド(EdDSAには対応していない)"""
+
+    name = "jose"
+
+    def __init__(self, key_set: TokenKeySet):
+        if key_set.algorithm == "EdDSA":
+            raise ValueError("python-jose does not support EdDSA. Use pyjwt.")
+
+        super().__init__(key_set)
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return jose_jwt.encode(
+            claims,
+            self.key_set.signing_key,
+            algorithm=self.key_set.algorithm,
+            headers=self.key_set.headers or None,
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            kid = jose_jwt.get_unverified_header(token).get("kid")
+            key = self.key_set.get_verification_key(kid)
+
+            return jose_jwt.decode(token, key, algorithms=[self.key_set.algorithm])
+        except JWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+class PyJWTTokenCodec(TokenCodec):
+    """PyJWTを使用するバックエンド(EdDSAにも対応)"""
+
+    name = "pyjwt"
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return pyjwt.encode(
+            claims,
+            self.key_set.signing_key,
+            algorithm=self.key_set.algorithm,
+            headers=self.key_set.headers or None,
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            kid = pyjwt.get_unverified_header(token).get("kid")
+            key = self.key_set.get_verification_key(kid)
+
+            return pyjwt.decode(token, key, algorithms=[self.key_set.algorithm])
+        except pyjwt.PyJWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+def base64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def base64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HmacTokenCodec(TokenCodec):
+    """
+    標準ライブラリのhmacで実装したHS*専用のバックエンド
+
+    鍵を設定したHMACオブジェクトとヘッダーのエンコード結果を事前に計算しておき、
+    トークンごとにはコピーしてペイロードを追加するだけにする
+    """
+
+    name = "hmac"
+
+    def __init__(self, key_set: TokenKeySet):
+        digestmod = HMAC_ALGORITHMS.get(key_set.algorithm)
+
+        if digestmod is None:
+            raise ValueError(f"hmac backend does not support {key_set.algorithm}.")
+
+        super().__init__(key_set)
+
+        self._macs = {
+            kid: hmac.new(key, digestmod=digestmod)
+            for kid, key in key_set.verification_keys.items()
+        }
+        self._signing_mac = hmac.new(key_set.signing_key, digestmod=digestmod)
+        self._encoded_header = base64url_encode(
+            orjson.dumps({"alg": key_set.algorithm, "typ": "JWT", **key_set.headers})
+        )
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        signing_input = (
+            self._encoded_header
+            + b"."
+            + base64url_encode(orjson.dumps(to_timestamp_claims(claims)))
+        )
+
+        mac = self._signing_mac.copy()
+        mac.update(signing_input)
+
+        return (signing_input + b"." + base64url_encode(mac.digest())).decode()
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            signing_input, _, signature = token.encode().rpartition(b".")
+            encoded_header, _, encoded_payload = signing_input.partition(b".")
+
+            header = orjson.loads(base64url_decode(encoded_header))
+            payload = orjson.loads(base64url_decode(encoded_payload))
+            expected_signature = base64url_decode(signature)
+        except (ValueError, orjson.JSONDecodeError) as e:
+            raise InvalidTokenError(str(e)) from e
+
+        if not isinstance(header, dict) or not isinstance(payload, dict):
+            raise InvalidTokenError("Invalid token")
+
+        # ヘッダーのalgは信用せず、設定したアルゴリズムのみ受け付ける
+        if header.get("alg") != self.key_set.algorithm:
+            raise InvalidTokenError("Invalid algorithm")
+
+        kid = header.get("kid")
+
+        if kid is not None and not isinstance(kid, str):
+            raise InvalidTokenError("Invalid kid")
+
+        kid = kid or self.key_set.kid or ""
+        base_mac = self._macs.get(kid)
+
+        if base_mac is None:
+            raise InvalidTokenError(f"Unknown kid: {kid}")
+
+        mac = base_mac.copy()
+        mac.update(signing_input)
+
+        if not hmac.compare_digest(mac.digest(), expected_signature):
+            raise InvalidTokenError("Signature verification failed")
+
+        now = time.time()
+
+        if "exp" in payload and not (
+            isinstance(payload["exp"], (int, float)) and now < payload["exp"]
+        ):
+            raise InvalidTokenError("Signature has expired")
+
+        if "nbf" in payload and not (
+            isinstance(payload["nbf"], (int, float)) and payload["nbf"] <= now
+        ):
+            raise InvalidTokenError("The token is not yet valid")
+
+        return payload
+
+
+TOKEN_CODECS: dict[str, type[TokenCodec]] = {
+    codec.name: codec for codec in (JoseTokenCodec, PyJWTTokenCodec, HmacTokenCodec)
+}
+
+
+def load_key_set(
+    algorithm: str,
+    secret_key: str,
+    kid: str,
+    private_key_file: str,
+    public_key_files: str,
+) -> TokenKeySet:
+    """
+    設定から署名鍵と検証鍵を読み込む
+
+    Args:
+        algorithm (str): アルゴリズム(HS256 | ES256 | EdDSA など)
+        secret_key (str): HS*で使用する共通鍵
+        kid (str): 現在の鍵のkid(空の場合はヘッダーに付与しない)
+        private_key_file (str): ES256・EdDSAで使用する秘密鍵(PEM)のパス
+        public_key_files (str): "kid=パス"のカンマ区切り(ローテーション前の公開鍵)
+
+    Returns:
+        TokenKeySet: 署名鍵と検証鍵
+    """
+
+    if algorithm in HMAC_ALGORITHMS:
+        key = secret_key.encode()
+        return TokenKeySet(algorithm, key, {kid: key}, kid or None)
+
+    with open(private_key_file, "rb") as f:
+        private_key = load_pem_private_key(f.read(), password=None)
+
+    verification_keys: dict[str, Any] = {kid: private_key.public_key()}
+
+    for item in public_key_files.split(","):
+        if not item.strip():
+            continue
+
+        public_kid, path = item.split("=", 1)
+        with open(path.strip(), "rb") as f:
+            verification_keys[public_kid.strip()] = load_pem_public_key(f.read())
+
+    return TokenKeySet(algorithm, private_key, verification_keys, kid or None)
+
+
+def create_token_codec(backend: str, key_set: TokenKeySet) -> TokenCodec:
+    """
+    バックエンド名に対応するトークンのコーデックを生成する
+
+    Args:
+        backend (str): バックエンド名(jose | pyjwt | hmac)
+        key_set (TokenKeySet): 署名鍵と検証鍵
+
+    Returns:
+        TokenCodec: コーデック
+    """
+
+    codec_class = TOKEN_CODECS.get(backend)
+
+    if codec_class is None:
+        raise ValueError(f"Unknown JWT backend: {backend}")
+
+    return codec_class(key_set)
+
+
+token_codec = create_token_codec(
+    JWT_BACKEND,
+    load_key_set(
+        JWT_ALGORITHM,
+        JWT_SECRET_KEY,
+        JWT_KEY_ID,
+        JWT_PRIVATE_KEY_FILE,
+        JWT_PUBLIC_KEY_FILES,
+    ),
+)
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    エントリごとに有効期限を持つ、件数上限付きのLRUキャッシュ
+
+    上限を超えた場合は最も長く参照されていないエントリから削除する
+    有効期限切れのエントリは参照時に削除する
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """
+        キャッシュから値を取得する
+
+        Args:
+            key (K): キー
+
+        Returns:
+            V | None: 値 | 存在しないか有効期限切れの場合はNone
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def set(self, key: K, value: V, ttl: float) -> None:
+        """
+        キャッシュに値を設定する
+
+        Args:
+            key (K): キー
+            value (V): 値
+            ttl (float): 有効期限の秒数(0以下の場合は設定しない)
+        """
+
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        キャッシュの状態を返す
+
+        Returns:
+            dict[str, int]: 件数・上限・ヒット数・ミス数
+        """
+
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+# 設定モジュールの読み込み時に必須の環境変数(テストでは接続しない値)
+for name, value in {
+    "DB_USERNAME": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_DATABASE": "test",
+    "JWT_SECRET_KEY": "test-secret",
+    "GOOGLE_AUTHORIZATION_URL": "https://accounts.google.com/o/oauth2/v2/auth",
+    "GOOGLE_CLIENT_ID": "test-client-id",
+    "GOOGLE_CLIENT_SECRET": "test-client-secret",
+    "GOOGLE_CALLBACK_URL": "http://localhost/auth/google/callback",
+    "GOOGLE_TOKEN_URL": "https://oauth2.googleapis.com/token",
+    "GOOGLE_USER_INFO_URL": "https://openidconnect.googleapis.com/v1/userinfo",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # アプリケーションはasyncioで動作するため、非同期のテストもasyncioのみで実行する
+    return "asyncio"
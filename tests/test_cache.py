@@ -0,0 +1,218 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+from pydantic import TypeAdapter
+
+from src.cache.cache import Cache
+from src.cache.redis import RedisCacheBackend
+
+pytestmark = pytest.mark.anyio
+
+adapter = TypeAdapter(dict[str, int])
+
+
+class Loader:
+    """
+    呼び出し回数を記録する読み込み関数
+    """
+
+    def __init__(self, delay: float = 0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> dict[str, int]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"value": self.calls}
+
+
+class FailingBackend(RedisCacheBackend):
+    """
+    全ての操作で接続エラーになる保存先
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise ConnectionError("connection refused")
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise ConnectionError("connection refused")
+
+    async def delete(self, *keys: str) -> None:
+        raise ConnectionError("connection refused")
+
+
+@pytest.fixture
+def redis_client() -> FakeAsyncRedis:
+    return FakeAsyncRedis(server=FakeServer())
+
+
+@pytest.fixture
+def backend(redis_client: FakeAsyncRedis) -> RedisCacheBackend:
+    return RedisCacheBackend(redis_client, key_prefix="test:")
+
+
+async def test_backend_get_set_delete(
+    backend: RedisCacheBackend, redis_client: FakeAsyncRedis
+):
+    assert await backend.get("key") is None
+
+    await backend.set("key", b"value", 10)
+
+    assert await backend.get("key") == b"value"
+    assert await redis_client.get("test:key") == b"value"
+    assert 0 < await redis_client.pttl("test:key") <= 10000
+
+    await backend.delete("key")
+
+    assert await backend.get("key") is None
+    assert backend.stats() == {"hits": 1, "misses": 2}
+
+
+async def test_backend_set_skips_non_positive_ttl(
+    backend: RedisCacheBackend, redis_client: FakeAsyncRedis
+):
+    await backend.set("key", b"value", 0)
+
+    assert await redis_client.exists("test:key") == 0
+
+
+async def test_get_or_load_caches_value(backend: RedisCacheBackend):
+    cache = Cache(backend)
+    loader = Loader()
+
+    assert await cache.get_or_load("key", loader, 60, adapter) == {"value": 1}
+    assert await cache.get_or_load("key", loader, 60, adapter) == {"value": 1}
+    assert loader.calls == 1
+
+
+async def test_get_or_load_without_ttl_does_not_cache(backend: RedisCacheBackend):
+    cache = Cache(backend)
+    loader = Loader()
+
+    await cache.get_or_load("key", loader, 0, adapter)
+    await cache.get_or_load("key", loader, 0, adapter)
+
+    assert loader.calls == 2
+    assert await backend.get("key") is None
+
+
+async def test_delete_invalidates_cached_value(backend: RedisCacheBackend):
+    cache = Cache(backend)
+    loader = Loader()
+
+    await cache.get_or_load("key", loader, 60, adapter)
+    await cache.delete("key")
+
+    assert await cache.get_or_load("key", loader, 60, adapter) == {"value": 2}
+    assert loader.calls == 2
+
+
+async def test_delete_during_load_does_not_cache_stale_value(
+    backend: RedisCacheBackend,
+):
+    cache = Cache(backend)
+    loader = Loader(delay=0.05)
+
+    task = asyncio.ensure_future(cache.get_or_load("key", loader, 60, adapter))
+    await asyncio.sleep(0.01)
+    await cache.delete("key")
+
+    assert await task == {"value": 1}
+    assert await backend.get("key") is None
+
+
+async def test_single_flight_coalesces_concurrent_misses(
+    backend: RedisCacheBackend,
+):
+    cache = Cache(backend)
+    loader = Loader(delay=0.05)
+
+    results = await asyncio.gather(
+        *[cache.get_or_load("key", loader, 60, adapter) for _ in range(100)]
+    )
+
+    assert loader.calls == 1
+    assert results == [{"value": 1}] * 100
+    assert cache.stats()["loads"] == 1
+    assert cache.stats()["coalesced"] == 99
+    assert cache.stats()["inflight"] == 0
+
+
+async def test_ttl_jitter_shortens_ttl_within_range(
+    backend: RedisCacheBackend, redis_client: FakeAsyncRedis
+):
+    cache = Cache(backend, ttl_jitter=0.5)
+
+    for i in range(20):
+        await cache.get_or_load(f"key{i}", Loader(), 100, adapter)
+
+    ttls = [await redis_client.pttl(f"test:key{i}") for i in range(20)]
+
+    assert all(50000 <= ttl <= 100000 for ttl in ttls)
+    assert len(set(ttls)) > 1
+
+
+async def test_ttl_jitter_uses_random_ratio(
+    backend: RedisCacheBackend,
+    redis_client: FakeAsyncRedis,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr("src.cache.cache.random.uniform", lambda a, b: b)
+    cache = Cache(backend, ttl_jitter=0.2)
+
+    await cache.get_or_load("key", Loader(), 100, adapter)
+
+    assert 79000 < await redis_client.pttl("test:key") <= 80000
+
+
+async def test_soft_expiry_returns_stale_value_and_refreshes(
+    backend: RedisCacheBackend,
+):
+    # 書き込み直後からソフト期限切れになる
+    cache = Cache(backend, ttl_jitter=0, soft_ttl_ratio=0)
+    loader = Loader()
+
+    assert await cache.get_or_load("key", loader, 60, adapter) == {"value": 1}
+
+    # 古い値を返し、再読み込みはバックグラウンドで1回だけ実行する
+    results = await asyncio.gather(
+        *[cache.get_or_load("key", loader, 60, adapter) for _ in range(10)]
+    )
+    assert results == [{"value": 1}] * 10
+    assert cache.stats()["refreshes"] == 1
+
+    await asyncio.gather(*cache._refreshing.values())
+
+    assert loader.calls == 2
+    assert await cache.get_or_load("key", Loader(), 60, adapter) == {"value": 2}
+
+
+async def test_soft_expiry_refresh_failure_keeps_stale_value(
+    backend: RedisCacheBackend,
+):
+    cache = Cache(backend, ttl_jitter=0, soft_ttl_ratio=0)
+    await cache.get_or_load("key", Loader(), 60, adapter)
+
+    async def failing_loader() -> dict[str, int]:
+        raise RuntimeError("database is down")
+
+    assert await cache.get_or_load("key", failing_loader, 60, adapter) == {"value": 1}
+    await asyncio.gather(*cache._refreshing.values(), return_exceptions=True)
+
+    assert await cache.get_or_load("key", Loader(), 60, adapter) == {"value": 1}
+
+
+async def test_backend_errors_fall_back_to_loader(redis_client: FakeAsyncRedis):
+    cache = Cache(FailingBackend(redis_client))
+    loader = Loader()
+
+    assert await cache.get_or_load("key", loader, 60, adapter) == {"value": 1}
+    assert await cache.get_or_load("key", loader, 60, adapter) == {"value": 2}
+
+
+async def test_delete_ignores_backend_errors(redis_client: FakeAsyncRedis):
+    cache = Cache(FailingBackend(redis_client))
+
+    # 更新処理を失敗させないよう例外を送出しない
+    await cache.delete("key")
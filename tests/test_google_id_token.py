@@ -0,0 +1,355 @@
+import time
+from typing import Any
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from src.controllers.auth import AuthController
+from src.exceptions.login_failed_exception import LoginFailedException
+from src.models.user import User
+from src.services.auth import AuthService
+from src.settings.app import GOOGLE_CLIENT_ID, GOOGLE_USER_INFO_URL
+from src.utils.jwks import JwksCache
+
+pytestmark = pytest.mark.anyio
+
+DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
+JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+ISSUER = "https://accounts.google.com"
+KID = "test-key"
+USER_INFO = {"sub": "1234", "email": "user@example.com", "name": "User"}
+
+
+def generate_private_key() -> bytes:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def to_public_jwk(private_key: bytes, kid: str) -> dict[str, Any]:
+    public_key = jwk.construct(private_key, "RS256").public_key().to_dict()
+
+    return {**public_key, "kid": kid, "use": "sig"}
+
+
+PRIVATE_KEY = generate_private_key()
+OTHER_PRIVATE_KEY = generate_private_key()
+
+
+def create_id_token(
+    private_key: bytes = PRIVATE_KEY,
+    kid: str = KID,
+    access_token: str | None = None,
+    **claims: Any,
+) -> str:
+    now = int(time.time())
+
+    return jwt.encode(
+        {
+            "iss": ISSUER,
+            "aud": GOOGLE_CLIENT_ID,
+            "iat": now,
+            "exp": now + 3600,
+            **USER_INFO,
+            **claims,
+        },
+        private_key,
+        algorithm="RS256",
+        headers={"kid": kid},
+        access_token=access_token,
+    )
+
+
+class GoogleServer:
+    """
+    ディスカバリードキュメント・JWKS・ユーザー情報APIを返すモック
+    """
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.counts[url] = self.counts.get(url, 0) + 1
+
+        if url == DISCOVERY_URL:
+            return httpx.Response(200, json={"issuer": ISSUER, "jwks_uri": JWKS_URL})
+
+        if url == JWKS_URL:
+            return httpx.Response(
+                200,
+                json={"keys": [to_public_jwk(PRIVATE_KEY, KID)]},
+                headers={"Cache-Control": "public, max-age=3600"},
+            )
+
+        if url == GOOGLE_USER_INFO_URL:
+            return httpx.Response(200, json={**USER_INFO, "name": "From UserInfo"})
+
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def server() -> GoogleServer:
+    return GoogleServer()
+
+
+@pytest.fixture
+def auth_service(server: GoogleServer, monkeypatch: pytest.MonkeyPatch):
+    # テストごとに空のJWKSキャッシュを使用する
+    monkeypatch.setattr(
+        "src.services.auth.google_jwks_cache", JwksCache(DISCOVERY_URL, 3600, 60)
+    )
+
+    return AuthService(
+        None, None, httpx.AsyncClient(transport=httpx.MockTransport(server))
+    )
+
+
+async def test_verify_google_id_token(auth_service: AuthService, server: GoogleServer):
+    claims = await auth_service.verify_google_id_token(create_id_token())
+
+    assert claims["sub"] == USER_INFO["sub"]
+    assert claims["email"] == USER_INFO["email"]
+    assert server.counts == {DISCOVERY_URL: 1, JWKS_URL: 1}
+
+
+async def test_verify_google_id_token_caches_jwks(
+    auth_service: AuthService, server: GoogleServer
+):
+    for _ in range(5):
+        await auth_service.verify_google_id_token(create_id_token())
+
+    assert server.counts == {DISCOVERY_URL: 1, JWKS_URL: 1}
+
+
+async def test_verify_google_id_token_accepts_issuer_without_scheme(
+    auth_service: AuthService,
+):
+    claims = await auth_service.verify_google_id_token(
+        create_id_token(iss="accounts.google.com")
+    )
+
+    assert claims["iss"] == "accounts.google.com"
+
+
+async def test_verify_google_id_token_with_at_hash(auth_service: AuthService):
+    id_token = create_id_token(access_token="access")
+
+    claims = await auth_service.verify_google_id_token(id_token, "access")
+
+    assert "at_hash" in claims
+
+
+@pytest.mark.parametrize(
+    "id_token",
+    [
+        pytest.param(lambda: create_id_token(aud="other-client"), id="audience"),
+        pytest.param(lambda: create_id_token(iss="https://evil.com"), id="issuer"),
+        pytest.param(lambda: create_id_token(exp=int(time.time()) - 60), id="expired"),
+        pytest.param(
+            lambda: create_id_token(private_key=OTHER_PRIVATE_KEY), id="signature"
+        ),
+        pytest.param(lambda: "not-a-jwt", id="malformed"),
+    ],
+)
+async def test_verify_google_id_token_invalid(auth_service: AuthService, id_token):
+    with pytest.raises(LoginFailedException):
+        await auth_service.verify_google_id_token(id_token())
+
+
+async def test_verify_google_id_token_unknown_kid(
+    auth_service: AuthService, server: GoogleServer
+):
+    with pytest.raises(LoginFailedException):
+        await auth_service.verify_google_id_token(
+            create_id_token(private_key=OTHER_PRIVATE_KEY, kid="unknown")
+        )
+
+    # 最短の再取得間隔内は未知のkidでJWKSを再取得しない
+    with pytest.raises(LoginFailedException):
+        await auth_service.verify_google_id_token(
+            create_id_token(private_key=OTHER_PRIVATE_KEY, kid="unknown")
+        )
+
+    assert server.counts[JWKS_URL] == 1
+
+
+async def test_verify_google_id_token_at_hash_mismatch(auth_service: AuthService):
+    id_token = create_id_token(access_token="access")
+
+    with pytest.raises(LoginFailedException):
+        await auth_service.verify_google_id_token(id_token, "other-access")
+
+
+async def test_get_google_user_uses_id_token_claims(
+    auth_service: AuthService, server: GoogleServer
+):
+    user = await auth_service.get_google_user(
+        {"access_token": "access", "id_token": create_id_token(access_token="access")}
+    )
+
+    assert user["name"] == USER_INFO["name"]
+    assert GOOGLE_USER_INFO_URL not in server.counts
+
+
+async def test_get_google_user_falls_back_without_id_token(
+    auth_service: AuthService, server: GoogleServer
+):
+    user = await auth_service.get_google_user({"access_token": "access"})
+
+    assert user["name"] == "From UserInfo"
+    assert server.counts[GOOGLE_USER_INFO_URL] == 1
+
+
+async def test_get_google_user_falls_back_without_profile_claims(
+    auth_service: AuthService, server: GoogleServer
+):
+    # profileスコープが無くnameがid_tokenに含まれない場合
+    user = await auth_service.get_google_user(
+        {"access_token": "access", "id_token": create_id_token(name=None)}
+    )
+
+    assert user["name"] == "From UserInfo"
+    assert server.counts[GOOGLE_USER_INFO_URL] == 1
+
+
+async def test_get_google_user_falls_back_when_jwks_unavailable(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(
+        "src.services.auth.google_jwks_cache", JwksCache(DISCOVERY_URL, 3600, 60)
+    )
+    monkeypatch.setattr("src.utils.http.HTTP_RETRIES", 0)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == GOOGLE_USER_INFO_URL:
+            return httpx.Response(200, json=USER_INFO)
+
+        return httpx.Response(503)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    user = await AuthService(None, None, client).get_google_user(
+        {"access_token": "access", "id_token": create_id_token()}
+    )
+
+    assert user == USER_INFO
+
+
+async def test_get_google_user_invalid_id_token_does_not_fall_back(
+    auth_service: AuthService, server: GoogleServer
+):
+    with pytest.raises(LoginFailedException):
+        await auth_service.get_google_user(
+            {"access_token": "access", "id_token": create_id_token(aud="other")}
+        )
+
+    assert GOOGLE_USER_INFO_URL not in server.counts
+
+
+async def test_get_google_user_without_fallback(
+    auth_service: AuthService, server: GoogleServer, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr("src.services.auth.GOOGLE_USER_INFO_FALLBACK", False)
+
+    with pytest.raises(LoginFailedException):
+        await auth_service.get_google_user({"access_token": "access"})
+
+    assert GOOGLE_USER_INFO_URL not in server.counts
+
+
+async def test_get_google_user_falls_back_when_jwks_malformed(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(
+        "src.services.auth.google_jwks_cache", JwksCache(DISCOVERY_URL, 3600, 60)
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+
+        if url == DISCOVERY_URL:
+            return httpx.Response(200, json={"issuer": ISSUER})
+
+        if url == GOOGLE_USER_INFO_URL:
+            return httpx.Response(200, json=USER_INFO)
+
+        return httpx.Response(404)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    user = await AuthService(None, None, client).get_google_user(
+        {"access_token": "access", "id_token": create_id_token()}
+    )
+
+    assert user == USER_INFO
+
+
+class CallbackAuthService:
+    """
+    Google認証コールバックAPIが使用するAuthServiceのメソッドのモック
+    """
+
+    def __init__(self, google_user: dict, user: User | None):
+        self.google_user = google_user
+        self.user = user
+        self.linked: list[int] = []
+        self.created: list[str] = []
+
+    async def get_google_token(self, code: str) -> dict:
+        return {"access_token": "access"}
+
+    async def get_google_user(self, token: dict) -> dict:
+        return self.google_user
+
+    async def get_social_account(self, provider: str, provider_user_id: str) -> None:
+        return None
+
+    async def get_user_by_email(self, email: str, use_primary: bool = False):
+        return self.user
+
+    async def create_social_account(
+        self, user_id: int, provider: str, provider_user_id: str
+    ) -> None:
+        self.linked.append(user_id)
+
+    async def create_user_with_social_account(
+        self, user_data, provider: str, provider_user_id: str
+    ) -> int:
+        self.created.append(user_data.email)
+        return 2
+
+    def create_jwt_token(self, user_id: int) -> int:
+        return user_id
+
+
+async def test_google_auth_callback_links_verified_email():
+    service = CallbackAuthService(
+        {**USER_INFO, "email_verified": True},
+        User(id=1, name="User", email=USER_INFO["email"]),
+    )
+
+    assert await AuthController.google_auth_callback("code", service) == 1
+    assert service.linked == [1]
+
+
+@pytest.mark.parametrize("email_verified", [None, False, "true"])
+async def test_google_auth_callback_rejects_unverified_email_link(email_verified):
+    google_user = {**USER_INFO}
+    if email_verified is not None:
+        google_user["email_verified"] = email_verified
+
+    service = CallbackAuthService(
+        google_user, User(id=1, name="User", email=USER_INFO["email"])
+    )
+
+    with pytest.raises(LoginFailedException):
+        await AuthController.google_auth_callback("code", service)
+
+    assert service.linked == []
+    assert service.created == []
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.exceptions.service_unavailable_exception import (
+    ServiceUnavailableException,
+)
+from src.utils.hash import HashPool
+
+pytestmark = pytest.mark.anyio
+
+
+def blocking(event: threading.Event) -> str:
+    event.wait(5)
+    return "hashed"
+
+
+def failing() -> str:
+    raise ValueError("hash failed")
+
+
+async def wait_until(predicate, timeout: float = 5) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def pool():
+    pool = HashPool("thread", max_workers=1, max_queue=0)
+    yield pool
+    pool.shutdown()
+
+
+async def test_submit_records_successful_hash(pool: HashPool):
+    event = threading.Event()
+    event.set()
+
+    assert await pool.submit(blocking, event) == "hashed"
+    await wait_until(lambda: pool.in_flight == 0)
+
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["failed"] == 0
+    assert stats["max_seconds"] > 0
+
+
+async def test_cancelled_caller_keeps_slot_until_worker_finishes(pool: HashPool):
+    event = threading.Event()
+    task = asyncio.create_task(pool.submit(blocking, event))
+    await wait_until(lambda: pool.in_flight == 1)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # ワーカーは実行中のため枠は解放されず、新しい処理は拒否される
+    assert pool.in_flight == 1
+    with pytest.raises(ServiceUnavailableException):
+        await pool.submit(blocking, event)
+
+    event.set()
+    await wait_until(lambda: pool.in_flight == 0)
+    assert pool.completed == 1
+    assert pool.rejected == 1
+
+
+async def test_cancelled_queued_job_releases_slot():
+    pool = HashPool("thread", max_workers=1, max_queue=1)
+    event = threading.Event()
+
+    try:
+        running = asyncio.create_task(pool.submit(blocking, event))
+        queued = asyncio.create_task(pool.submit(blocking, event))
+        await wait_until(lambda: pool.in_flight == 2)
+
+        # 待機中の処理はワーカーで実行されずに取り消される
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        await wait_until(lambda: pool.in_flight == 1)
+
+        event.set()
+        assert await running == "hashed"
+        await wait_until(lambda: pool.in_flight == 0)
+        assert pool.completed == 1
+    finally:
+        event.set()
+        pool.shutdown()
+
+
+async def test_failed_hash_is_not_counted_as_completed(pool: HashPool):
+    with pytest.raises(ValueError):
+        await pool.submit(failing)
+    await wait_until(lambda: pool.in_flight == 0)
+
+    stats = pool.stats()
+    assert stats["completed"] == 0
+    assert stats["failed"] == 1
+    assert stats["avg_seconds"] == 0.0
+    assert stats["max_seconds"] == 0.0
@@ -0,0 +1,304 @@
+from typing import Callable
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.exceptions.login_failed_exception import LoginFailedException
+from src.services.auth import AuthService
+from src.settings.app import (
+    GOOGLE_CLIENT_ID,
+    GOOGLE_TOKEN_URL,
+    GOOGLE_USER_INFO_URL,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_RETRIES,
+)
+from src.utils.http import HttpUtil
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://example.com/resource"
+
+
+class MockServer:
+    """
+    受信したリクエストを記録し、順番にレスポンス(または例外)を返すモック
+    最後のレスポンスは以降のリクエストでも繰り返し返す
+    """
+
+    def __init__(self, *responses: httpx.Response | Exception):
+        self.responses = list(responses)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses[min(len(self.requests), len(self.responses)) - 1]
+
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    def client(self) -> httpx.AsyncClient:
+        return HttpUtil.create_client(transport=httpx.MockTransport(self))
+
+
+@pytest.fixture(autouse=True)
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    # バックオフの待機時間を記録し、実際には待機しない
+    recorded: list[float] = []
+
+    async def _sleep(seconds: float) -> None:
+        recorded.append(seconds)
+
+    monkeypatch.setattr("src.utils.http.asyncio.sleep", _sleep)
+
+    return recorded
+
+
+def connect_error() -> httpx.ConnectError:
+    return httpx.ConnectError("connection refused")
+
+
+def read_timeout() -> httpx.ReadTimeout:
+    return httpx.ReadTimeout("read timed out")
+
+
+async def test_request_returns_success_without_retry(sleeps: list[float]):
+    server = MockServer(httpx.Response(200, json={"ok": True}))
+
+    async with server.client() as client:
+        response = await HttpUtil.request_with_retry(client, "GET", URL)
+
+    assert response.json() == {"ok": True}
+    assert len(server.requests) == 1
+    assert sleeps == []
+
+
+@pytest.mark.parametrize("status_code", [502, 503, 504])
+async def test_idempotent_request_retries_gateway_errors(
+    status_code: int, sleeps: list[float]
+):
+    server = MockServer(httpx.Response(status_code), httpx.Response(200))
+
+    async with server.client() as client:
+        response = await HttpUtil.request_with_retry(client, "GET", URL)
+
+    assert response.status_code == 200
+    assert len(server.requests) == 2
+    assert len(sleeps) == 1
+
+
+async def test_idempotent_request_returns_last_error_response(sleeps: list[float]):
+    server = MockServer(httpx.Response(503))
+
+    async with server.client() as client:
+        response = await HttpUtil.request_with_retry(client, "GET", URL)
+
+    assert response.status_code == 503
+    assert len(server.requests) == HTTP_RETRIES + 1
+    assert len(sleeps) == HTTP_RETRIES
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 404, 500])
+async def test_request_does_not_retry_other_errors(
+    status_code: int, sleeps: list[float]
+):
+    server = MockServer(httpx.Response(status_code), httpx.Response(200))
+
+    async with server.client() as client:
+        response = await HttpUtil.request_with_retry(client, "GET", URL)
+
+    assert response.status_code == status_code
+    assert len(server.requests) == 1
+    assert sleeps == []
+
+
+@pytest.mark.parametrize("error", [connect_error, read_timeout])
+async def test_idempotent_request_retries_transport_errors(
+    error: Callable[[], httpx.TransportError], sleeps: list[float]
+):
+    server = MockServer(error(), httpx.Response(200))
+
+    async with server.client() as client:
+        response = await HttpUtil.request_with_retry(client, "GET", URL)
+
+    assert response.status_code == 200
+    assert len(server.requests) == 2
+
+
+async def test_idempotent_request_raises_after_retries(sleeps: list[float]):
+    server = MockServer(read_timeout())
+
+    async with server.client() as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await HttpUtil.request_with_retry(client, "GET", URL)
+
+    assert len(server.requests) == HTTP_RETRIES + 1
+    assert len(sleeps) == HTTP_RETRIES
+
+
+async def test_backoff_grows_exponentially(
+    sleeps: list[float], monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr("src.utils.http.random.uniform", lambda a, b: 1.0)
+    monkeypatch.setattr("src.utils.http.HTTP_RETRIES", 3)
+    monkeypatch.setattr("src.utils.http.HTTP_RETRY_BACKOFF", 0.1)
+    server = MockServer(httpx.Response(503))
+
+    async with server.client() as client:
+        await HttpUtil.request_with_retry(client, "GET", URL)
+
+    assert sleeps == pytest.approx([0.1, 0.2, 0.4])
+
+
+@pytest.mark.parametrize("status_code", [502, 503, 504])
+async def test_non_idempotent_request_does_not_retry_error_response(
+    status_code: int, sleeps: list[float]
+):
+    server = MockServer(httpx.Response(status_code), httpx.Response(200))
+
+    async with server.client() as client:
+        response = await HttpUtil.request_with_retry(
+            client, "POST", URL, idempotent=False
+        )
+
+    assert response.status_code == status_code
+    assert len(server.requests) == 1
+    assert sleeps == []
+
+
+async def test_non_idempotent_request_does_not_retry_after_sending():
+    server = MockServer(read_timeout(), httpx.Response(200))
+
+    async with server.client() as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await HttpUtil.request_with_retry(client, "POST", URL, idempotent=False)
+
+    assert len(server.requests) == 1
+
+
+async def test_non_idempotent_request_retries_connect_errors():
+    # 送信前の接続エラーはサーバーで処理されていないためリトライする
+    server = MockServer(connect_error(), httpx.Response(200))
+
+    async with server.client() as client:
+        response = await HttpUtil.request_with_retry(
+            client, "POST", URL, idempotent=False
+        )
+
+    assert response.status_code == 200
+    assert len(server.requests) == 2
+
+
+async def test_create_client_uses_pooled_http2_connections():
+    async with HttpUtil.create_client() as client:
+        pool = client._transport._pool  # type: ignore[attr-defined]
+
+        assert pool._http2
+        assert pool._max_connections == HTTP_MAX_CONNECTIONS
+        assert pool._max_keepalive_connections == HTTP_MAX_KEEPALIVE_CONNECTIONS
+        assert pool._keepalive_expiry == HTTP_KEEPALIVE_EXPIRY
+
+
+def test_get_client_returns_shared_client():
+    app = FastAPI()
+    app.state.http_client = MockServer(httpx.Response(200)).client()
+    clients = []
+
+    @app.get("/")
+    async def index(client: httpx.AsyncClient = Depends(HttpUtil.get_client)):
+        clients.append(client)
+        return {}
+
+    with TestClient(app) as test_client:
+        test_client.get("/")
+        test_client.get("/")
+
+    # リクエストごとに生成せず、lifespanで生成したクライアントを使用する
+    assert clients == [app.state.http_client, app.state.http_client]
+    assert clients[0] is clients[1]
+
+
+async def test_get_google_token():
+    token = {"access_token": "access", "id_token": "id", "token_type": "Bearer"}
+    server = MockServer(httpx.Response(200, json=token))
+
+    async with server.client() as client:
+        result = await AuthService(None, None, client).get_google_token("code")
+
+    assert result == token
+    assert len(server.requests) == 1
+
+    request = server.requests[0]
+    assert request.method == "POST"
+    assert request.url == GOOGLE_TOKEN_URL
+    assert b"code=code" in request.content
+    assert f"client_id={GOOGLE_CLIENT_ID}".encode() in request.content
+
+
+async def test_get_google_token_does_not_retry_gateway_errors():
+    # 認証コードは1回しか使用できないため、送信後のエラーはリトライしない
+    server = MockServer(
+        httpx.Response(503, json={"error": "unavailable"}), httpx.Response(200)
+    )
+
+    async with server.client() as client:
+        with pytest.raises(LoginFailedException):
+            await AuthService(None, None, client).get_google_token("code")
+
+    assert len(server.requests) == 1
+
+
+async def test_get_google_token_rejected():
+    server = MockServer(httpx.Response(400, json={"error": "invalid_grant"}))
+
+    async with server.client() as client:
+        with pytest.raises(LoginFailedException):
+            await AuthService(None, None, client).get_google_token("code")
+
+
+async def test_get_google_token_transport_error():
+    server = MockServer(read_timeout())
+
+    async with server.client() as client:
+        with pytest.raises(LoginFailedException):
+            await AuthService(None, None, client).get_google_token("code")
+
+    assert len(server.requests) == 1
+
+
+async def test_get_google_user_info():
+    user_info = {"sub": "1", "email": "user@example.com", "name": "User"}
+    server = MockServer(httpx.Response(503), httpx.Response(200, json=user_info))
+
+    async with server.client() as client:
+        result = await AuthService(None, None, client).get_google_user_info("access")
+
+    assert result == user_info
+    assert len(server.requests) == 2
+    assert server.requests[-1].url == GOOGLE_USER_INFO_URL
+    assert server.requests[-1].headers["Authorization"] == "Bearer access"
+
+
+async def test_get_google_user_info_rejected():
+    server = MockServer(httpx.Response(401, json={"error": "invalid_token"}))
+
+    async with server.client() as client:
+        with pytest.raises(LoginFailedException):
+            await AuthService(None, None, client).get_google_user_info("access")
+
+    assert len(server.requests) == 1
+
+
+async def test_get_google_user_info_transport_error():
+    server = MockServer(connect_error())
+
+    async with server.client() as client:
+        with pytest.raises(LoginFailedException):
+            await AuthService(None, None, client).get_google_user_info("access")
+
+    assert len(server.requests) == HTTP_RETRIES + 1
@@ -0,0 +1,198 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.utils.jwks import JwksCache, get_max_age
+
+pytestmark = pytest.mark.anyio
+
+DISCOVERY_URL = "https://accounts.example.com/.well-known/openid-configuration"
+JWKS_URL = "https://accounts.example.com/certs"
+DISCOVERY = {"issuer": "https://accounts.example.com", "jwks_uri": JWKS_URL}
+
+
+class JwksServer:
+    """
+    ディスカバリードキュメントとJWKSを返すモック(URLごとのリクエスト回数を記録する)
+    """
+
+    def __init__(self, kids: list[str], cache_control: str = "max-age=3600"):
+        self.kids = kids
+        self.cache_control = cache_control
+        self.counts: dict[str, int] = {DISCOVERY_URL: 0, JWKS_URL: 0}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.counts[url] += 1
+        headers = {"Cache-Control": self.cache_control}
+
+        if url == DISCOVERY_URL:
+            return httpx.Response(200, json=DISCOVERY, headers=headers)
+
+        keys = [{"kid": kid, "kty": "RSA", "alg": "RS256"} for kid in self.kids]
+
+        return httpx.Response(200, json={"keys": keys}, headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+@pytest.mark.parametrize(
+    ("cache_control", "expected"),
+    [
+        ("public, max-age=19845, must-revalidate, no-transform", 19845),
+        ("MAX-AGE=60", 60),
+        ("public", 100),
+        ("", 100),
+        ("no-store", 0),
+        ("no-cache, max-age=60", 0),
+        ("private, no-store, max-age=60", 0),
+    ],
+)
+def test_get_max_age(cache_control: str, expected: int):
+    response = httpx.Response(200, headers={"Cache-Control": cache_control})
+
+    assert get_max_age(response, 100) == expected
+
+
+def test_get_max_age_without_header():
+    assert get_max_age(httpx.Response(200), 100) == 100
+
+
+async def test_get_key_fetches_once_and_caches():
+    server = JwksServer(["key1", "key2"])
+    cache = JwksCache(DISCOVERY_URL, 3600, 60)
+
+    async with server.client() as client:
+        assert (await cache.get_key(client, "key1"))["kid"] == "key1"
+        assert (await cache.get_key(client, "key2"))["kid"] == "key2"
+        assert await cache.get_issuer(client) == DISCOVERY["issuer"]
+
+    assert server.counts == {DISCOVERY_URL: 1, JWKS_URL: 1}
+
+
+async def test_get_key_concurrent_requests_fetch_once():
+    server = JwksServer(["key1"])
+    cache = JwksCache(DISCOVERY_URL, 3600, 60)
+
+    async with server.client() as client:
+        keys = await asyncio.gather(*[cache.get_key(client, "key1") for _ in range(20)])
+
+    assert all(key["kid"] == "key1" for key in keys)
+    assert server.counts[JWKS_URL] == 1
+
+
+async def test_get_key_no_store_is_not_cached():
+    server = JwksServer(["key1"], cache_control="no-store")
+    cache = JwksCache(DISCOVERY_URL, 3600, 0)
+
+    async with server.client() as client:
+        await cache.get_key(client, "key1")
+        await cache.get_key(client, "key1")
+
+    assert server.counts == {DISCOVERY_URL: 2, JWKS_URL: 2}
+
+
+async def test_get_key_unknown_kid_refreshes_for_rotation():
+    server = JwksServer(["key1"])
+    cache = JwksCache(DISCOVERY_URL, 3600, 0)
+
+    async with server.client() as client:
+        await cache.get_key(client, "key1")
+
+        # 鍵がローテーションされた場合は有効期限内でも再取得する
+        server.kids = ["key1", "key2"]
+        assert (await cache.get_key(client, "key2"))["kid"] == "key2"
+
+    assert server.counts == {DISCOVERY_URL: 1, JWKS_URL: 2}
+
+
+async def test_get_key_unknown_kid_refresh_is_rate_limited():
+    server = JwksServer(["key1"])
+    cache = JwksCache(DISCOVERY_URL, 3600, 60)
+
+    async with server.client() as client:
+        await cache.get_key(client, "key1")
+
+        # 最短の再取得間隔を過ぎるまで未知のkidでは再取得しない
+        for _ in range(10):
+            assert await cache.get_key(client, "unknown") is None
+
+    assert server.counts[JWKS_URL] == 1
+
+
+async def test_get_key_unknown_kid_returns_none_after_refresh():
+    server = JwksServer(["key1"])
+    cache = JwksCache(DISCOVERY_URL, 3600, 0)
+
+    async with server.client() as client:
+        assert await cache.get_key(client, "unknown") is None
+
+    assert server.counts[JWKS_URL] == 1
+
+
+async def test_set_keys_skips_fetch():
+    server = JwksServer(["key1"])
+    cache = JwksCache(DISCOVERY_URL, 3600, 60)
+    cache.set_keys({"keys": [{"kid": "local", "kty": "RSA"}, {"kty": "RSA"}]}, 3600)
+
+    async with server.client() as client:
+        assert (await cache.get_key(client, "local"))["kid"] == "local"
+
+    assert server.counts[JWKS_URL] == 0
+
+
+async def test_get_key_raises_on_error_response():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == DISCOVERY_URL:
+            return httpx.Response(200, json=DISCOVERY)
+
+        return httpx.Response(404)
+
+    cache = JwksCache(DISCOVERY_URL, 3600, 60)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await cache.get_key(client, "key1")
+
+
+@pytest.mark.parametrize(
+    ("discovery", "jwks"),
+    [
+        (httpx.Response(200, text="<html></html>"), None),
+        (httpx.Response(200, json=["not", "object"]), None),
+        (httpx.Response(200, json={"issuer": DISCOVERY["issuer"]}), None),
+        (None, httpx.Response(200, text="not json")),
+        (None, httpx.Response(200, json={"jwks": []})),
+        (None, httpx.Response(200, json={"keys": "key1"})),
+    ],
+)
+async def test_get_key_raises_http_error_on_malformed_response(
+    discovery: httpx.Response | None, jwks: httpx.Response | None
+):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == DISCOVERY_URL:
+            return discovery or httpx.Response(200, json=DISCOVERY)
+
+        return jwks or httpx.Response(200, json={"keys": []})
+
+    cache = JwksCache(DISCOVERY_URL, 3600, 60)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(httpx.DecodingError):
+            await cache.get_key(client, "key1")
+
+
+async def test_get_key_skips_malformed_keys():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == DISCOVERY_URL:
+            return httpx.Response(200, json=DISCOVERY)
+
+        return httpx.Response(200, json={"keys": ["kid", {"kty": "RSA"}, {"kid": "a"}]})
+
+    cache = JwksCache(DISCOVERY_URL, 3600, 60)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await cache.get_key(client, "a") == {"kid": "a"}
+        assert await cache.get_key(client, "kid") is None
@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+from uvicorn.config import Config
+
+from src.settings.logger import configure_server_logger, logger, queue_handler
+
+
+@pytest.fixture
+def enqueued(monkeypatch: pytest.MonkeyPatch) -> list[logging.LogRecord]:
+    records: list[logging.LogRecord] = []
+    monkeypatch.setattr(queue_handler, "enqueue", records.append)
+
+    return records
+
+
+@pytest.fixture
+def server_logging():
+    # uvicornの起動時と同じロギングの設定(uvicornのロガーにStreamHandlerが設定される)
+    Config("src.main:app").configure_logging()
+    configure_server_logger()
+
+    yield
+
+    configure_server_logger()
+
+
+def get_stream_handlers(target: logging.Logger) -> list[logging.Handler]:
+    # pytestがログの取得に追加するハンドラー(StreamHandlerのサブクラス)は除く
+    return [
+        handler for handler in target.handlers if type(handler) is logging.StreamHandler
+    ]
+
+
+def test_app_logger_only_uses_queue(server_logging, enqueued):
+    logger.info("message")
+
+    assert queue_handler in logger.handlers
+    assert get_stream_handlers(logger) == []
+    assert not logger.propagate
+    assert len(enqueued) == 1
+
+
+def test_server_logger_handlers_are_replaced(server_logging, enqueued):
+    logging.getLogger("uvicorn.error").error("server error")
+
+    server_logger = logging.getLogger("uvicorn")
+
+    assert queue_handler in server_logger.handlers
+    assert get_stream_handlers(server_logger) == []
+    assert [record.getMessage() for record in enqueued] == ["server error"]
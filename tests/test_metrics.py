@@ -0,0 +1,141 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.controllers.metrics import MetricsController
+from src.exceptions.exception_handlers import APIExceptionHandler
+from src.metrics.registry import MetricsRegistry
+from src.middlewares.authenticate import AuthenticateMiddleware, PublicRouteRules
+from src.middlewares.metrics import (
+    OTHER_METHOD,
+    UNMATCHED_ROUTE,
+    HttpMetrics,
+    MetricsMiddleware,
+    get_method_label,
+    get_route_label,
+)
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def client(registry: MetricsRegistry) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/api/users/{user_id}")
+    async def show(user_id: int) -> dict:
+        return {"id": user_id}
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {}
+
+    # 認証ミドルウェアはルーティング前に401を返す
+    app.add_middleware(
+        AuthenticateMiddleware, public_rules=PublicRouteRules(frozenset(), [])
+    )
+    app.add_middleware(MetricsMiddleware, metrics=HttpMetrics(registry))
+
+    return TestClient(app)
+
+
+def test_route_label_uses_matched_route(client: TestClient, registry: MetricsRegistry):
+    client.get("/health")
+
+    assert (
+        'http_requests_total{method="GET",route="/health",status="2xx"} 1'
+        in registry.render()
+    )
+
+
+def test_route_label_for_request_rejected_before_routing(
+    client: TestClient, registry: MetricsRegistry
+):
+    response = client.get("/api/users/1")
+
+    assert response.status_code == 401
+    assert (
+        'http_requests_total{method="GET",route="/api/users/{user_id}",status="4xx"} 1'
+        in registry.render()
+    )
+
+
+def test_route_label_for_method_mismatch(client: TestClient, registry: MetricsRegistry):
+    client.post("/health")
+
+    assert 'route="/health",status="4xx"' in registry.render()
+
+
+def test_route_label_for_unknown_path(client: TestClient, registry: MetricsRegistry):
+    client.get("/api/unknown/path")
+    client.get("/unknown")
+
+    rendered = registry.render()
+    assert f'route="{UNMATCHED_ROUTE}",status="4xx"}} 2' in rendered
+    assert "/api/unknown/path" not in rendered
+
+
+def test_get_route_label_without_app():
+    assert get_route_label({"type": "http", "path": "/"}) == UNMATCHED_ROUTE
+
+
+@pytest.mark.parametrize(
+    ("method", "expected"),
+    [
+        ("GET", "GET"),
+        ("DELETE", "DELETE"),
+        ("PROPFIND", OTHER_METHOD),
+        ("get", OTHER_METHOD),
+    ],
+)
+def test_get_method_label(method: str, expected: str):
+    assert get_method_label({"type": "http", "method": method}) == expected
+
+
+def test_method_label_for_unknown_method(client: TestClient, registry: MetricsRegistry):
+    client.request("FOO", "/health")
+    client.request("BAR", "/health")
+
+    rendered = registry.render()
+    assert (
+        f'http_requests_total{{method="{OTHER_METHOD}",route="/health",status="4xx"}} 2'
+        in rendered
+    )
+    assert "FOO" not in rendered
+
+
+@pytest.fixture
+def metrics_client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setattr("src.controllers.metrics.METRICS_TOKEN", "metrics-token")
+
+    app = FastAPI(exception_handlers=APIExceptionHandler.handlers())
+    app.add_api_route("/metrics", MetricsController.index, methods=["GET"])
+
+    return TestClient(app)
+
+
+def test_metrics_requires_token(metrics_client: TestClient):
+    response = metrics_client.get(
+        "/metrics", headers={"Authorization": "Bearer metrics-token"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer other"}])
+def test_metrics_rejects_invalid_token(metrics_client: TestClient, headers: dict):
+    assert metrics_client.get("/metrics", headers=headers).status_code == 401
+
+
+def test_metrics_rejects_when_token_is_not_set(
+    metrics_client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr("src.controllers.metrics.METRICS_TOKEN", "")
+
+    response = metrics_client.get("/metrics", headers={"Authorization": "Bearer "})
+
+    assert response.status_code == 401
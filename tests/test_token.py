@@ -0,0 +1,206 @@
+import secrets
+import time
+from typing import Any, Callable
+
+import orjson
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from src.middlewares.authenticate import verify_token
+from src.utils.token import (
+    InvalidTokenError,
+    TokenCodec,
+    TokenKeySet,
+    base64url_encode,
+    create_token_codec,
+)
+
+CODECS = [
+    ("jose", "HS256"),
+    ("jose", "HS384"),
+    ("jose", "HS512"),
+    ("jose", "ES256"),
+    ("pyjwt", "HS256"),
+    ("pyjwt", "HS384"),
+    ("pyjwt", "HS512"),
+    ("pyjwt", "ES256"),
+    ("pyjwt", "EdDSA"),
+    ("hmac", "HS256"),
+    ("hmac", "HS384"),
+    ("hmac", "HS512"),
+]
+
+
+def generate_key(algorithm: str) -> Any:
+    """
+    署名鍵を生成する(HS*は64バイトの共通鍵)
+    """
+
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+
+    return secrets.token_bytes(64)
+
+
+def to_verification_key(signing_key: Any) -> Any:
+    return signing_key if isinstance(signing_key, bytes) else signing_key.public_key()
+
+
+def create_codec(
+    backend: str, algorithm: str, signing_key: Any, kid: str | None = "current"
+) -> TokenCodec:
+    return create_token_codec(
+        backend,
+        TokenKeySet(
+            algorithm, signing_key, {kid or "": to_verification_key(signing_key)}, kid
+        ),
+    )
+
+
+class Keys:
+    """
+    テスト対象のコーデックと、同じ鍵・別の鍵でトークンを生成するためのヘルパー
+    """
+
+    def __init__(self, backend: str, algorithm: str):
+        self.backend = backend
+        self.algorithm = algorithm
+        self.signing_key = generate_key(algorithm)
+        # ローテーション前の鍵
+        self.previous_key = generate_key(algorithm)
+
+        key_set = TokenKeySet(
+            algorithm,
+            self.signing_key,
+            {
+                "current": to_verification_key(self.signing_key),
+                "previous": to_verification_key(self.previous_key),
+            },
+            "current",
+        )
+        self.codec = create_token_codec(backend, key_set)
+
+    def encode(
+        self,
+        claims: dict[str, Any],
+        signing_key: Any = None,
+        kid: str | None = "current",
+        algorithm: str | None = None,
+    ) -> str:
+        # 他のアルゴリズムで署名する場合は全てのアルゴリズムに対応するPyJWTを使用する
+        backend = self.backend if algorithm is None else "pyjwt"
+        codec = create_codec(
+            backend,
+            algorithm or self.algorithm,
+            signing_key if signing_key is not None else self.signing_key,
+            kid,
+        )
+
+        return codec.encode(claims)
+
+
+@pytest.fixture(params=CODECS, ids=[f"{backend}-{alg}" for backend, alg in CODECS])
+def keys(request: pytest.FixtureRequest) -> Keys:
+    return Keys(*request.param)
+
+
+def create_claims(**overrides: Any) -> dict[str, Any]:
+    return {"sub": "1", "exp": int(time.time()) + 3600, **overrides}
+
+
+def encode_unsigned(header: Any, payload: Any, signature: bytes = b"sig") -> str:
+    return b".".join(
+        [
+            base64url_encode(orjson.dumps(header)),
+            base64url_encode(orjson.dumps(payload)),
+            base64url_encode(signature),
+        ]
+    ).decode()
+
+
+def test_round_trip(keys: Keys):
+    token = keys.codec.encode(create_claims())
+
+    assert keys.codec.decode(token)["sub"] == "1"
+
+
+def test_round_trip_without_kid(keys: Keys):
+    codec = create_codec(keys.backend, keys.algorithm, keys.signing_key, kid=None)
+
+    assert codec.decode(codec.encode(create_claims()))["sub"] == "1"
+
+
+def test_decode_rotated_key(keys: Keys):
+    # ローテーション前の鍵で署名されたトークンもkidで鍵を選んで検証できる
+    token = keys.encode(create_claims(), keys.previous_key, kid="previous")
+
+    assert keys.codec.decode(token)["sub"] == "1"
+
+
+def test_decode_wrong_algorithm(keys: Keys):
+    # 共通鍵のアルゴリズムに差し替えたトークン(アルゴリズムの混同)
+    algorithm = "HS512" if keys.algorithm != "HS512" else "HS256"
+    signing_key = (
+        keys.signing_key if keys.algorithm.startswith("HS") else generate_key("HS")
+    )
+    token = keys.encode(create_claims(), signing_key, algorithm=algorithm)
+
+    with pytest.raises(InvalidTokenError):
+        keys.codec.decode(token)
+
+
+def test_decode_none_algorithm(keys: Keys):
+    token = encode_unsigned({"alg": "none", "kid": "current"}, create_claims(), b"")
+
+    with pytest.raises(InvalidTokenError):
+        keys.codec.decode(token)
+
+
+def test_decode_wrong_signature(keys: Keys):
+    token = keys.encode(create_claims(), generate_key(keys.algorithm))
+
+    with pytest.raises(InvalidTokenError):
+        keys.codec.decode(token)
+
+
+def test_decode_unknown_kid(keys: Keys):
+    token = keys.encode(create_claims(), kid="unknown")
+
+    with pytest.raises(InvalidTokenError):
+        keys.codec.decode(token)
+
+
+def test_decode_expired(keys: Keys):
+    token = keys.codec.encode(create_claims(exp=int(time.time()) - 60))
+
+    with pytest.raises(InvalidTokenError):
+        keys.codec.decode(token)
+
+
+MALFORMED_TOKENS: dict[str, Callable[[str], str]] = {
+    "kid-list": lambda alg: encode_unsigned({"alg": alg, "kid": ["x"]}, {}),
+    "kid-dict": lambda alg: encode_unsigned({"alg": alg, "kid": {"a": 1}}, {}),
+    "kid-int": lambda alg: encode_unsigned({"alg": alg, "kid": 1}, {}),
+    "header-array": lambda alg: encode_unsigned([alg], {}),
+    "payload-array": lambda alg: encode_unsigned({"alg": alg}, [1]),
+    "missing-signature": lambda alg: "e30.e30",
+    "invalid-base64": lambda alg: "!!!.!!!.!!!",
+    "not-a-token": lambda alg: "not-a-token",
+    "empty": lambda alg: "",
+}
+
+
+@pytest.mark.parametrize("name", MALFORMED_TOKENS)
+def test_decode_malformed(keys: Keys, name: str):
+    with pytest.raises(InvalidTokenError):
+        keys.codec.decode(MALFORMED_TOKENS[name](keys.algorithm))
+
+
+def test_verify_token_rejects_non_string_kid():
+    # 認証ミドルウェアで500にせず、不正なトークン(401)として扱う
+    token = encode_unsigned({"alg": "HS256", "kid": ["x"]}, {"sub": "1"})
+
+    assert verify_token(token) is None
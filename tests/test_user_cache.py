@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.cache.cache import Cache
+from src.cache.memory import MemoryCacheBackend
+from src.exceptions.not_found_exception import NotFoundException
+from src.models.user import UserSnapshot
+from src.services.user import UserService, user_response_cache
+
+pytestmark = pytest.mark.anyio
+
+UPDATED_AT = datetime(2026, 1, 1, 12, 0, 0, 123456)
+
+
+class UserLoader:
+    """
+    DBの代わりにユーザー情報を返し、呼び出し回数を記録する
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.users = {
+            1: UserSnapshot(id=1, name="a", email="a@x", updated_at=UPDATED_AT)
+        }
+
+    async def __call__(self, user_id: int) -> UserSnapshot:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+
+        user = self.users.get(user_id)
+        if user is None:
+            raise NotFoundException()
+
+        return user
+
+
+@pytest.fixture
+def loader(monkeypatch: pytest.MonkeyPatch) -> UserLoader:
+    user_loader = UserLoader()
+
+    monkeypatch.setattr("src.services.user.cache", Cache(MemoryCacheBackend(100)))
+    monkeypatch.setattr(UserService, "load_user_snapshot", user_loader)
+    user_response_cache.invalidate(lambda key: True)
+
+    return user_loader
+
+
+def create_service() -> UserService:
+    # リクエストごとにDependsで生成されるサービス
+    return UserService(None, None)
+
+
+async def test_concurrent_detail_reads_load_once(loader: UserLoader):
+    versions = await asyncio.gather(
+        *[create_service().get_user_version(1) for _ in range(100)]
+    )
+
+    assert versions == [(1, UPDATED_AT)] * 100
+    assert loader.calls == 1
+
+
+async def test_get_user_json_uses_cached_user(loader: UserLoader):
+    service = create_service()
+    version = await service.get_user_version(1)
+
+    body = await create_service().get_user_json("etag", version)
+
+    assert body == b'{"name":"a","email":"a@x","id":1}'
+    assert loader.calls == 1
+
+
+async def test_get_user_public_shares_cache_with_detail(loader: UserLoader):
+    await create_service().get_user_version(1)
+
+    user = await create_service().get_user_public(1)
+
+    assert (user.id, user.name, user.email) == (1, "a", "a@x")
+    assert loader.calls == 1
+
+
+async def test_invalidate_reloads_updated_user(loader: UserLoader):
+    await create_service().get_user_version(1)
+
+    updated_at = datetime(2026, 1, 2)
+    loader.users[1] = UserSnapshot(id=1, name="b", email="a@x", updated_at=updated_at)
+    await create_service().invalidate_user_cache([1])
+
+    assert await create_service().get_user_version(1) == (1, updated_at)
+    assert loader.calls == 2
+
+
+async def test_concurrent_reads_of_missing_user_load_once(loader: UserLoader):
+    results = await asyncio.gather(
+        *[create_service().get_user_version(99) for _ in range(10)],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, NotFoundException) for result in results)
+    assert loader.calls == 1
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.models.user import User
+from src.models.user_social_account import UserSocialAccount  # noqa: F401
+from src.services.auth import AuthService
+from src.services.user import UserService
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add(User(name="user", email="User@Example.com"))
+        session.commit()
+
+        yield session
+
+
+def test_email_is_unique_ignoring_case(session: Session):
+    session.add(User(name="other", email="user@example.COM"))
+
+    with pytest.raises(IntegrityError):
+        session.commit()
+
+
+def test_email_lookups_ignore_case(session: Session):
+    user = session.exec(AuthService.select_user_by_email("USER@example.com")).one()
+    user_id = session.exec(
+        UserService.select_user_id_by_email("user@EXAMPLE.com")
+    ).one()
+
+    assert user.email == "User@Example.com"
+    assert user_id == user.id